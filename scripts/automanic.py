@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Automanic Command Line Interface
+
+Single entry point for the Automanic setup tooling. Commands import their
+modules lazily so that thin commands such as `generate` start quickly.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+def _cmd_setup(args):
+    """Run the complete setup pipeline"""
+    from pipeline import SetupPipeline
+    from profiler import TRACE_PATH, Profiler, print_report
+    
+    profiler = Profiler() if args.profile else None
+    pipeline = SetupPipeline(args.config_file, output_root=args.output_root, profiler=profiler)
+    pipeline.run(dry_run=args.dry_run, force=args.force)
+    if profiler is not None:
+        print_report(profiler, args.profile_output or pipeline.output_root / TRACE_PATH)
+
+def _cmd_fleet(args):
+    """Generate every project listed in a fleet manifest"""
+    import fleet
+    
+    report = fleet.run_fleet(args.manifest, workers=args.workers, git_branch=args.git_branch,
+                            blob_store=args.blob_store, link_mode=args.link_mode)
+    fleet.print_report(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if report['failed']:
+        sys.exit(1)
+
+def _cmd_generate(args):
+    """Generate the project structure, on a running daemon if there is one"""
+    import daemon
+    
+    daemon.generate({
+        'config_file': args.config_file,
+        'output_root': args.output_root,
+        'dry_run': args.dry_run,
+    }, socket_path=args.socket, use_daemon=not args.no_daemon)
+
+def _cmd_serve(args):
+    """Run the generation daemon"""
+    import daemon
+    
+    daemon.serve(args.socket, workers=args.workers)
+
+def _cmd_web(args):
+    """Run the HTTP backend for the setup form"""
+    import web_backend
+    
+    web_backend.run(args.host, args.port, workers=args.workers)
+
+def _cmd_archive(args):
+    """Write the output of every setup stage as a tar.gz or zip stream"""
+    import contextlib
+    from pathlib import Path
+    
+    import archive_stream
+    from pipeline import SetupPipeline
+    
+    archive_format = args.format or (archive_stream.ZIP if (args.output or '').endswith('.zip') else archive_stream.TAR_GZ)
+    output = sys.stdout.buffer
+    # Progress and errors go to stderr so that the archive can be written to stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            plan = SetupPipeline(args.config_file).build_plan()
+            plan.write('README.md', Path(args.config_file).read_bytes())
+            if args.output in (None, '-'):
+                stats = archive_stream.write_archive(plan, output, archive_format, prefix=args.prefix)
+                output.flush()
+            else:
+                with open(args.output, 'wb') as f:
+                    stats = archive_stream.write_archive(plan, f, archive_format, prefix=args.prefix)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        print(f"📦 {stats.written} files archived as {archive_format}")
+
+def _cmd_index_build(args):
+    """Build or incrementally update the config index"""
+    import config_index
+    
+    start = time.perf_counter()
+    index_path = args.index or config_index.INDEX_PATH
+    stats = config_index.build_index(args.roots, index_path=index_path, full=args.full, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"🗂️  Indexed {stats['repositories']} repositories in {elapsed:.2f}s "
+          f"({stats['parsed']} parsed, {stats['reused']} unchanged, {stats['removed']} removed)")
+    if stats['without_config']:
+        print(f"⚠️  {stats['without_config']} repositories have no Automanic config block")
+    print(f"💾 Index written to {index_path}")
+
+def _cmd_index_query(args):
+    """Filter and group the config index"""
+    import config_index
+    
+    start = time.perf_counter()
+    index = config_index.ConfigIndex.load(args.index or config_index.INDEX_PATH)
+    loaded = time.perf_counter()
+    result = config_index.query_index(index, config_index.parse_filters(args.where),
+                                      group_by=args.group_by, limit=args.limit)
+    elapsed = time.perf_counter() - loaded
+    
+    if args.json:
+        result['load_ms'] = round((loaded - start) * 1000, 3)
+        result['query_ms'] = round(elapsed * 1000, 3)
+        print(json.dumps(result, indent=2))
+        return
+        
+    print(f"🔎 {result['matched']} of {result['total']} repositories match "
+          f"(query {elapsed * 1000:.2f} ms, load {(loaded - start) * 1000:.2f} ms)")
+    if 'groups' in result:
+        for value, count in result['groups'].items():
+            print(f"   {value:<20} {count}")
+    else:
+        for path in result['repositories']:
+            print(f"   {path}")
+        if result['matched'] > len(result['repositories']):
+            print(f"   ... {result['matched'] - len(result['repositories'])} more")
+
+def main():
+    parser = argparse.ArgumentParser(prog='automanic', description='Automanic repository setup')
+    parser.add_argument('--version', action='store_true', help="show program's version number and exit")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    setup_parser = subparsers.add_parser('setup', help='Parse README configuration and run every setup stage')
+    setup_parser.add_argument('--config-file', default='README.md', help='Path to README.md file with configuration')
+    setup_parser.add_argument('--output-root', default=None, help='Directory to generate into (default: current directory)')
+    setup_parser.add_argument('--dry-run', action='store_true', help='Print the planned files and directories without writing them')
+    setup_parser.add_argument('--force', action='store_true', help='Regenerate even if the configuration fingerprint is unchanged')
+    setup_parser.add_argument('--profile', action='store_true', help='Record per-phase and per-file timings and print a summary table')
+    setup_parser.add_argument('--profile-output', default=None, help='Chrome trace file for --profile (default: <output root>/.automanic/trace.json)')
+    setup_parser.set_defaults(func=_cmd_setup)
+    
+    fleet_parser = subparsers.add_parser('fleet', help='Generate many projects from a JSONL or CSV manifest')
+    fleet_parser.add_argument('manifest', help='JSONL or CSV file with one configuration and output_dir per row')
+    fleet_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: number of CPU cores)')
+    fleet_parser.add_argument('--report', help='Write the fleet report as JSON to this path')
+    fleet_parser.add_argument('--git-branch', default=None, metavar='BRANCH',
+                              help='Treat each output_dir as a bare repository and commit the project to this branch')
+    fleet_parser.add_argument('--blob-store', default=None, metavar='DIR',
+                              help='Store each distinct file once in DIR and link it into every project')
+    fleet_parser.add_argument('--link-mode', choices=('auto', 'reflink', 'hardlink', 'copy'), default='auto',
+                              help='How --blob-store files are materialized (default: auto, reflink then copy; '
+                                   'hardlink shares one read-only inode across projects)')
+    fleet_parser.set_defaults(func=_cmd_fleet)
+    
+    generate_parser = subparsers.add_parser('generate', help='Generate the project structure, using the daemon when it is running')
+    generate_parser.add_argument('--config-file', default='README.md', help='Path to README.md file with configuration')
+    generate_parser.add_argument('--output-root', default=None, help='Directory to generate into (default: current directory)')
+    generate_parser.add_argument('--dry-run', action='store_true', help='Print the planned files and directories without writing them')
+    generate_parser.add_argument('--socket', default=None, help='Daemon socket (default: $AUTOMANIC_SOCKET or the user runtime directory)')
+    generate_parser.add_argument('--no-daemon', action='store_true', help='Always generate in this process')
+    generate_parser.set_defaults(func=_cmd_generate)
+    
+    serve_parser = subparsers.add_parser('serve', help='Run a warm generation daemon on a unix socket')
+    serve_parser.add_argument('--socket', default=None, help='Socket to listen on (default: $AUTOMANIC_SOCKET or the user runtime directory)')
+    serve_parser.add_argument('--workers', type=int, default=None, help='Requests generated concurrently (default: number of CPU cores)')
+    serve_parser.set_defaults(func=_cmd_serve)
+    
+    web_parser = subparsers.add_parser('web', help='Serve the HTTP backend for the React setup form on localhost')
+    web_parser.add_argument('--host', default='127.0.0.1', help='Loopback address to bind (default: 127.0.0.1)')
+    web_parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    web_parser.add_argument('--workers', type=int, default=None, help='Projects generated concurrently (default: number of CPU cores)')
+    web_parser.set_defaults(func=_cmd_web)
+    
+    archive_parser = subparsers.add_parser('archive', help='Write the generated project as a tar.gz or zip archive without a working directory')
+    archive_parser.add_argument('--config-file', default='README.md', help='Path to README.md file with configuration')
+    archive_parser.add_argument('--output', '-o', default=None, help='Archive file, or - for stdout (default: stdout)')
+    archive_parser.add_argument('--format', choices=('tar.gz', 'zip'), default=None,
+                                help='Archive format (default: zip for a .zip output, else tar.gz)')
+    archive_parser.add_argument('--prefix', default=None, help='Top-level directory to put every entry under')
+    archive_parser.set_defaults(func=_cmd_archive)
+    
+    index_parser = subparsers.add_parser('index', help='Index and query the configuration of many repositories')
+    index_subparsers = index_parser.add_subparsers(dest='index_command')
+    index_parser.set_defaults(func=lambda args: index_parser.print_help())
+    
+    build_parser = index_subparsers.add_parser('build', help='Scan repository roots and update the index')
+    build_parser.add_argument('roots', nargs='*', help='Directories to scan for repositories (default: roots of the existing index)')
+    build_parser.add_argument('--index', default=None, help='Index file (default: .automanic/config-index)')
+    build_parser.add_argument('--full', action='store_true', help='Re-parse every README instead of reusing unchanged rows')
+    build_parser.add_argument('--workers', type=int, default=None, help='Parallel README readers')
+    build_parser.set_defaults(func=_cmd_index_build)
+    
+    query_parser = index_subparsers.add_parser('query', help='Filter and group indexed repositories')
+    query_parser.add_argument('--where', action='append', default=[], metavar='FIELD=VALUE[,VALUE...]',
+                              help='Only repositories with one of these values (repeatable; all filters must match)')
+    query_parser.add_argument('--group-by', metavar='FIELD', help='Count matching repositories per value of a field')
+    query_parser.add_argument('--limit', type=int, default=50, help='Maximum repositories to list (default: 50)')
+    query_parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    query_parser.add_argument('--index', default=None, help='Index file (default: .automanic/config-index)')
+    query_parser.set_defaults(func=_cmd_index_query)
+    
+    args = parser.parse_args()
+    if args.version:
+        from pipeline import __version__
+        print(f"{parser.prog} {__version__}")
+        return
+    if args.command is None:
+        parser.print_help()
+        sys.exit(2)
+        
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
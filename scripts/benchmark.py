@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Automanic Benchmarks
+
+Times the README parser, the structure and workflow generators and the
+end-to-end setup.sh pipeline, appends the results to a JSON history and fails
+when a metric regresses past the configured threshold.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import readme_config
+from pipeline import SCRIPTS_DIR, load_script
+from plan_cache import plan_cache
+
+RESULTS_PATH = SCRIPTS_DIR.parent / 'benchmarks' / 'results.json'
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_HISTORY = 50
+# Differences below this are timer noise, whatever the relative change
+NOISE_FLOOR_SECONDS = 0.0005
+
+BASE_CONFIG = {
+    'PROJECT_TYPE': 'web-app',
+    'LANGUAGE': 'python',
+    'FRAMEWORK': 'fastapi',
+    'BUILD_SYSTEM': 'pip',
+    'DATABASE': 'postgresql',
+    'DEPLOYMENT': 'docker',
+    'CI_CD': 'github-actions',
+    'TESTING': 'pytest',
+    'LICENSE_TYPE': 'mit',
+    'VISIBILITY': 'public',
+}
+
+# Approximate README sizes in bytes
+README_SIZES = {
+    'small': 0,
+    'typical': 16 * 1024,
+    'very-large': 32 * 1024 * 1024,
+}
+
+def _write_readme(path: Path, body_size: int):
+    """Write a README with the config block after body_size bytes of prose"""
+    paragraph = ("Automanic keeps repository structure, workflows and tooling in sync with "
+                 "the configuration declared in this README.\n\n")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# Benchmark Project\n\n")
+        written = 0
+        while written < body_size:
+            f.write(paragraph)
+            written += len(paragraph)
+        f.write(readme_config.format_config_block(BASE_CONFIG))
+        f.write("\n## License\n\nMIT\n")
+
+def _measure(fn: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """Run fn repeat times and summarize the wall times"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'runs': repeat,
+    }
+
+class BenchmarkSuite:
+    """Collects named benchmark results"""
+    
+    def __init__(self, work_dir: Path, repeat: int = 5, pattern: Optional[str] = None):
+        self.work_dir = work_dir
+        self.repeat = repeat
+        self.pattern = re.compile(pattern) if pattern else None
+        self.results: Dict[str, Dict[str, float]] = {}
+        
+    def wanted(self, name: str) -> bool:
+        return self.pattern is None or bool(self.pattern.search(name))
+        
+    def bench(self, name: str, fn: Callable[[], None], repeat: Optional[int] = None,
+              setup: Optional[Callable[[], None]] = None):
+        """Time one benchmark if it matches the filter"""
+        if not self.wanted(name):
+            return
+        result = _measure(fn, repeat or self.repeat, setup)
+        self.results[name] = result
+        print(f"   {name:<55} {result['median'] * 1000:10.3f} ms")
+        
+    def run(self):
+        """Run every benchmark"""
+        self.bench_parse_readme()
+        self.bench_generate_structure()
+        self.bench_generate_workflows()
+        self.bench_setup_pipeline()
+        
+    def bench_parse_readme(self):
+        """AutomanicConfig.parse_readme on small, typical and very large READMEs"""
+        config_parser = load_script('generate-structure.py').AutomanicConfig()
+        for label, size in README_SIZES.items():
+            name = f"parse_readme/{label}"
+            if not self.wanted(name):
+                continue
+            readme = self.work_dir / f"README-{label}.md"
+            _write_readme(readme, size)
+            self.bench(name, lambda: config_parser.parse_readme(str(readme)))
+            
+    def bench_generate_structure(self):
+        """StructureGenerator.generate_structure for every PROJECT_TYPE/LANGUAGE pair"""
+        generate_structure = load_script('generate-structure.py')
+        valid_values = generate_structure.AutomanicConfig.VALID_VALUES
+        for project_type in valid_values['PROJECT_TYPE']:
+            for language in valid_values['LANGUAGE']:
+                name = f"generate_structure/{project_type}/{language}"
+                if not self.wanted(name):
+                    continue
+                config = dict(BASE_CONFIG, PROJECT_TYPE=project_type, LANGUAGE=language)
+                output_root = self.work_dir / 'structure' / project_type / language
+                
+                def fresh_output(root=output_root):
+                    # Every run generates into an empty tree with a cold plan cache
+                    shutil.rmtree(root, ignore_errors=True)
+                    plan_cache.clear()
+                    
+                def generate(config=config, root=output_root):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        generate_structure.StructureGenerator(config, output_root=root).generate_structure()
+                        
+                self.bench(name, generate, setup=fresh_output)
+                
+    def bench_generate_workflows(self):
+        """WorkflowGenerator.generate_workflows"""
+        name = 'generate_workflows'
+        if not self.wanted(name):
+            return
+        setup_workflows = load_script('setup-workflows.py')
+        output_root = self.work_dir / 'workflows'
+        
+        def fresh_output():
+            shutil.rmtree(output_root, ignore_errors=True)
+            plan_cache.clear()
+            
+        def generate():
+            with contextlib.redirect_stdout(io.StringIO()):
+                setup_workflows.WorkflowGenerator(config=BASE_CONFIG, output_root=output_root).generate_workflows()
+                
+        self.bench(name, generate, setup=fresh_output)
+        
+    def bench_setup_pipeline(self):
+        """The end-to-end setup.sh pipeline in a fresh repository"""
+        name = 'setup_pipeline/end-to-end'
+        if not self.wanted(name):
+            return
+        project = self.work_dir / 'pipeline'
+        
+        def fresh_project():
+            shutil.rmtree(project, ignore_errors=True)
+            shutil.copytree(SCRIPTS_DIR, project / 'scripts', ignore=shutil.ignore_patterns('__pycache__'))
+            _write_readme(project / 'README.md', README_SIZES['typical'])
+            
+        def run_setup():
+            subprocess.run(['bash', 'scripts/setup.sh'], cwd=project, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                           
+        self.bench(name, run_setup, repeat=max(1, min(self.repeat, 3)), setup=fresh_project)
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path: Path) -> List[Dict]:
+    """Previous benchmark runs, oldest first"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if data.get('version') != RESULTS_VERSION:
+        return []
+    return data.get('runs', [])
+
+def save_history(path: Path, runs: List[Dict], keep: int):
+    """Store the most recent runs"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': RESULTS_VERSION, 'runs': runs[-keep:]}, f, indent=1, sort_keys=True)
+
+def find_regressions(results: Dict[str, Dict[str, float]], history: List[Dict], threshold: float,
+                     baseline_runs: int = 5) -> List[Dict]:
+    """Metrics whose median exceeds the median of their recent history by more than the threshold"""
+    regressions = []
+    for name, result in results.items():
+        previous = [run['results'][name]['median'] for run in history if name in run.get('results', {})]
+        if not previous:
+            continue
+        baseline = statistics.median(previous[-baseline_runs:])
+        current = result['median']
+        if current > baseline * (1 + threshold) and current - baseline > NOISE_FLOOR_SECONDS:
+            regressions.append({
+                'metric': name,
+                'baseline': baseline,
+                'current': current,
+                'change': current / baseline - 1 if baseline else float('inf'),
+            })
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Automanic parser, generators and setup pipeline')
+    parser.add_argument('--results', default=str(RESULTS_PATH), help='JSON file holding the benchmark history')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Fail when a metric is slower than its baseline by more than this fraction (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark (the median is recorded)')
+    parser.add_argument('--filter', default=None, help='Only run benchmarks whose name matches this regular expression')
+    parser.add_argument('--history', type=int, default=DEFAULT_HISTORY, help='Number of runs to keep in the results file')
+    parser.add_argument('--no-save', action='store_true', help='Compare against the history without recording this run')
+    args = parser.parse_args()
+    
+    results_path = Path(args.results)
+    history = load_history(results_path)
+    
+    print(f"⏱️  Running benchmarks ({args.repeat} runs each)...")
+    with tempfile.TemporaryDirectory(prefix='automanic-bench-') as work_dir:
+        suite = BenchmarkSuite(Path(work_dir), repeat=args.repeat, pattern=args.filter)
+        suite.run()
+        
+    regressions = find_regressions(suite.results, history, args.threshold)
+    
+    if not args.no_save:
+        history.append({
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': suite.results,
+        })
+        save_history(results_path, history, args.history)
+        print(f"💾 Results recorded in {results_path}")
+        
+    if regressions:
+        print(f"❌ {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"   • {regression['metric']}: {regression['baseline'] * 1000:.3f} ms -> "
+                  f"{regression['current'] * 1000:.3f} ms (+{regression['change']:.0%})")
+        sys.exit(1)
+        
+    print(f"✅ {len(suite.results)} benchmarks, no regressions beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
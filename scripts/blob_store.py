@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Blob Store
+
+Keeps one copy of every distinct generated file under a store directory,
+keyed by its SHA-256 and mode, and materializes output trees from it: with
+reflinks (copy-on-write clones) where the filesystem supports them, else with
+plain copies. Fleet runs generating thousands of projects on one volume then
+store each shared file (.editorconfig, .gitignore, Dockerfile, ...) once.
+
+Hardlinks are only used when asked for explicitly: a hardlinked file shares
+one inode with the store and with every other project. Blobs are therefore
+written read-only, and a stored blob is checked against its digest before it
+is first reused.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+from generation_plan import COPY, PlanOp, copy_file, hash_file
+
+AUTO = 'auto'
+REFLINK = 'reflink'
+HARDLINK = 'hardlink'
+PLAIN_COPY = 'copy'
+LINK_MODES = (AUTO, REFLINK, HARDLINK, PLAIN_COPY)
+
+DEFAULT_MODE = 0o644
+# Write permission bits removed from every stored blob
+WRITE_BITS = 0o222
+# Linux ioctl cloning one file's extents into another (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+# Errors meaning a link method is unavailable here, rather than that the write failed
+_UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EPERM, errno.EMLINK, errno.ENOSYS}
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class BlobStore:
+    """Distinct file contents stored once and linked into output trees"""
+    
+    def __init__(self, root: Union[str, Path], link_mode: str = AUTO):
+        if link_mode not in LINK_MODES:
+            raise Exception(f"Unknown link mode '{link_mode}' (expected one of {', '.join(LINK_MODES)})")
+        self.root = Path(root)
+        self.link_mode = link_mode
+        self.stored: Set[str] = set()
+        # Files materialized with each method
+        self.counts: Dict[str, int] = {REFLINK: 0, HARDLINK: 0, PLAIN_COPY: 0}
+        # Methods found not to work on this volume are not tried again
+        self._unsupported: Set[str] = set()
+        self._lock = threading.Lock()
+        
+    def blob_path(self, op: PlanOp) -> Path:
+        """Store location of a planned file's content and mode"""
+        mode = DEFAULT_MODE if op.mode is None else op.mode
+        return self.root / op.digest[:2] / f"{op.digest[2:]}.{mode:o}"
+        
+    def put(self, op: PlanOp) -> Path:
+        """Store a planned file's content unless an intact copy of it is already stored"""
+        path = self.blob_path(op)
+        key = path.name
+        if key in self.stored or self._intact(path, op):
+            self.stored.add(key)
+            return path
+            
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        if op.kind == COPY:
+            copy_file(op.source, tmp_path)
+        else:
+            with open(tmp_path, 'wb') as f:
+                f.write(op.data)
+        os.chmod(tmp_path, (DEFAULT_MODE if op.mode is None else op.mode) & ~WRITE_BITS)
+        # Concurrent writers of the same blob store identical bytes, so the last rename wins harmlessly
+        os.replace(tmp_path, path)
+        self.stored.add(key)
+        return path
+        
+    def _intact(self, path: Path, op: PlanOp) -> bool:
+        """Whether a stored blob still holds the planned content, unwritable, so it may be reused"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if st.st_size != op.size or st.st_mode & WRITE_BITS:
+            return False
+        # Checked once per blob and run; a blob edited through a hardlink is stored again
+        return hash_file(path, hashlib.sha256()).hexdigest() == op.digest
+        
+    def materialize(self, op: PlanOp, target: Path, exists: bool = True) -> str:
+        """Create or replace target with the stored content of a planned file, returning the method used"""
+        blob = self.put(op)
+        if not exists:
+            method = self._link(blob, target, op.mode)
+        else:
+            # Existing files are swapped atomically; they may be links to another blob
+            tmp_path = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                method = self._link(blob, tmp_path, op.mode)
+                os.replace(tmp_path, target)
+            except BaseException:
+                _remove(tmp_path)
+                raise
+        with self._lock:
+            self.counts[method] += 1
+        return method
+        
+    def _methods(self):
+        if self.link_mode != AUTO:
+            return (self.link_mode,)
+        # Hardlinks share one inode across projects, so auto never falls back to them
+        return tuple(method for method in (REFLINK,) if method not in self._unsupported) + (PLAIN_COPY,)
+        
+    def _link(self, blob: Path, target: Path, mode: Optional[int]) -> str:
+        """Create target from a blob with the first method that works on this volume"""
+        for method in self._methods():
+            try:
+                if method == REFLINK:
+                    _reflink(blob, target, mode)
+                elif method == HARDLINK:
+                    os.link(blob, target)
+                else:
+                    shutil.copyfile(blob, target)
+                    os.chmod(target, DEFAULT_MODE if mode is None else mode)
+                return method
+            except OSError as e:
+                _remove(target)
+                if self.link_mode != AUTO or e.errno not in _UNSUPPORTED:
+                    raise
+                # A full link count only rules out hardlinks to this one blob
+                if e.errno != errno.EMLINK:
+                    self._unsupported.add(method)
+        raise Exception(f"Could not materialize {blob}")
+        
+def _reflink(blob: Path, target: Path, mode: Optional[int]):
+    """Clone a blob's extents into a new file (copy-on-write)"""
+    if fcntl is None:
+        raise OSError(errno.ENOSYS, 'Reflinks are not supported on this platform')
+    with open(blob, 'rb') as source, open(target, 'wb') as destination:
+        fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+    os.chmod(target, DEFAULT_MODE if mode is None else mode)
+
+def _remove(path: Path):
+    """Remove a file if it exists"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def store_usage(root: Union[str, Path]) -> Dict[str, int]:
+    """Number and total size of the blobs in a store"""
+    blobs = 0
+    size = 0
+    for directory in Path(root).iterdir() if Path(root).is_dir() else ():
+        for entry in os.scandir(directory):
+            if not entry.name.endswith('.tmp'):
+                blobs += 1
+                size += entry.stat().st_size
+    return {'blobs': blobs, 'bytes': size}
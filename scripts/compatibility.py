@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Config Compatibility Index
+
+Which values of different fields can be combined in one project. Every
+(field, value) pair gets a bit position, and every pair has a precomputed
+bitset of the pairs it is compatible with, so a whole configuration is checked
+with one AND per field and the options still possible after some answers are
+a single mask.
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import readme_config
+
+# Values that only work with some languages; values not listed work with any language
+LANGUAGE_RULES = {
+    'FRAMEWORK': {
+        'react': ('javascript', 'typescript'),
+        'vue': ('javascript', 'typescript'),
+        'angular': ('typescript',),
+        'express': ('javascript', 'typescript'),
+        'fastapi': ('python',),
+        'django': ('python',),
+        'spring': ('java', 'kotlin', 'scala'),
+        'gin': ('go',),
+        'actix': ('rust',),
+        'electron': ('javascript', 'typescript'),
+        'pytorch': ('python',),
+        'tensorflow': ('python',),
+    },
+    'BUILD_SYSTEM': {
+        'npm': ('javascript', 'typescript'),
+        'yarn': ('javascript', 'typescript'),
+        'pip': ('python',),
+        'cargo': ('rust',),
+        'maven': ('java', 'kotlin', 'scala'),
+        'gradle': ('java', 'kotlin', 'scala'),
+        'cmake': ('c', 'cpp'),
+    },
+    'TESTING': {
+        'jest': ('javascript', 'typescript'),
+        'pytest': ('python',),
+        'cargo-test': ('rust',),
+        'junit': ('java', 'kotlin', 'scala'),
+        'go-test': ('go',),
+        'rspec': ('ruby',),
+    },
+}
+
+# (field, value) -> bit position
+BITS: Dict[Tuple[str, str], int] = {}
+for _field in readme_config.REQUIRED_FIELDS:
+    for _value in readme_config.VALID_VALUES[_field]:
+        BITS[(_field, _value)] = len(BITS)
+
+ALL_BITS = (1 << len(BITS)) - 1
+
+def _build_compatible() -> Dict[Tuple[str, str], int]:
+    """Bitset of compatible (field, value) pairs for every pair, from the language rules"""
+    compatible = {pair: ALL_BITS for pair in BITS}
+    for field, rules in LANGUAGE_RULES.items():
+        for value, languages in rules.items():
+            if (field, value) not in BITS:
+                raise Exception(f"Compatibility rule for unknown value '{value}' of field '{field}'")
+            for language in readme_config.VALID_VALUES['LANGUAGE']:
+                if language in languages:
+                    continue
+                # Incompatibility is symmetric: each side excludes the other
+                compatible[(field, value)] &= ~(1 << BITS[('LANGUAGE', language)])
+                compatible[('LANGUAGE', language)] &= ~(1 << BITS[(field, value)])
+    return compatible
+
+COMPATIBLE = _build_compatible()
+
+def selection_mask(config: Mapping[str, str]) -> Optional[Tuple[int, int]]:
+    """Bits of the chosen values and the AND of their compatibility sets; None if a value is unknown"""
+    chosen = 0
+    allowed = ALL_BITS
+    for field, value in config.items():
+        pair = (field, value)
+        if pair not in BITS:
+            if field in readme_config.VALID_VALUE_SETS:
+                return None
+            continue
+        chosen |= 1 << BITS[pair]
+        allowed &= COMPATIBLE[pair]
+    return chosen, allowed
+
+def is_compatible(config: Mapping[str, str]) -> bool:
+    """Whether every chosen value is compatible with every other one"""
+    masks = selection_mask(config)
+    if masks is None:
+        return False
+    chosen, allowed = masks
+    return chosen & allowed == chosen
+
+def allowed_values(field: str, config: Mapping[str, str]) -> List[str]:
+    """Values of a field that are still possible given the answers so far"""
+    masks = selection_mask({key: value for key, value in config.items() if key != field})
+    allowed = masks[1] if masks is not None else ALL_BITS
+    return [value for value in readme_config.VALID_VALUES[field] if allowed >> BITS[(field, value)] & 1]
+
+def conflicts(config: Mapping[str, str]) -> List[str]:
+    """Human-readable description of every incompatible pair of values"""
+    messages = []
+    items = [(field, value) for field, value in config.items() if (field, value) in BITS]
+    for position, pair in enumerate(items):
+        for other in items[position + 1:]:
+            if not COMPATIBLE[pair] >> BITS[other] & 1:
+                messages.append(f"{pair[0]} '{pair[1]}' is not compatible with {other[0]} '{other[1]}'")
+    return messages
+
+def check_compatibility(config: Mapping[str, str]):
+    """Raise if the configuration combines incompatible values"""
+    if not is_compatible(config):
+        raise Exception(f"Incompatible configuration: {'; '.join(conflicts(config))}")
+
+def rules_signature() -> List:
+    """The rule tables, for cache keys that must change when the rules do"""
+    return sorted((field, sorted(rules.items())) for field, rules in LANGUAGE_RULES.items())
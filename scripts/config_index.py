@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Automanic Config Index
+
+Columnar index of the README configuration of many repositories. Every field
+is dictionary-encoded against VALID_VALUES into one byte per repository, so
+filters and group-bys run as byte translations and integer bit operations
+over whole columns instead of re-parsing READMEs.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import readme_config
+
+INDEX_PATH = '.automanic/config-index'
+INDEX_MAGIC = b'AMCIDX\x00\x01'
+README_NAMES = ('README.md', 'readme.md', 'Readme.md')
+SKIP_DIRS = frozenset({'.git', 'node_modules', '.venv', 'venv', '__pycache__', '.automanic'})
+
+# Code 0 marks a field that is missing or holds a value outside VALID_VALUES
+UNKNOWN = 0
+# Row status column
+HAS_CONFIG = 1
+NO_CONFIG = 0
+
+def field_dictionary(field: str) -> List[str]:
+    """Values of a field in code order; code 0 is reserved for unknown values"""
+    return [''] + list(readme_config.VALID_VALUES[field])
+
+def _find_readme(directory: str, names: Sequence[str]) -> Optional[str]:
+    for name in README_NAMES:
+        if name in names:
+            return os.path.join(directory, name)
+    return None
+
+def discover_readmes(roots: Sequence[Union[str, Path]]) -> List[str]:
+    """Root READMEs of every repository (a directory with a .git directory or file) under the given roots"""
+    readmes = []
+    for root in roots:
+        for directory, dirnames, filenames in os.walk(root):
+            # Worktrees and submodules have a .git file, other checkouts a .git directory
+            if '.git' in dirnames or '.git' in filenames:
+                readme = _find_readme(directory, filenames)
+                if readme is not None:
+                    readmes.append(os.path.abspath(readme))
+            # Nested repositories, such as submodules or vendored checkouts, are indexed too
+            dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS and not name.startswith('.'))
+    return sorted(set(readmes))
+
+def _encode_readme(readme_path: str) -> Tuple[str, int, int, int, bytes]:
+    """Stat a README and encode its config block into one code per field"""
+    codes = bytearray(len(readme_config.REQUIRED_FIELDS))
+    st = None
+    try:
+        with open(readme_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            config_block = readme_config.scan_config_block(f)
+    except (OSError, ValueError):
+        # An unreadable README is retried on the next build, one that fails to decode only once it changes
+        if st is None:
+            return readme_path, 0, 0, NO_CONFIG, bytes(codes)
+        return readme_path, st.st_size, st.st_mtime_ns, NO_CONFIG, bytes(codes)
+    if config_block is None:
+        return readme_path, st.st_size, st.st_mtime_ns, NO_CONFIG, bytes(codes)
+        
+    config = readme_config.parse_config_block(config_block, readme_config.REQUIRED_FIELDS)
+    for position, field in enumerate(readme_config.REQUIRED_FIELDS):
+        values = readme_config.VALID_VALUES[field]
+        value = config.get(field)
+        if value in readme_config.VALID_VALUE_SETS[field]:
+            codes[position] = values.index(value) + 1
+    return readme_path, st.st_size, st.st_mtime_ns, HAS_CONFIG, bytes(codes)
+
+class ConfigIndex:
+    """Column store of repository configurations"""
+    
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        self.fields = list(fields or readme_config.REQUIRED_FIELDS)
+        self.dictionaries = {field: field_dictionary(field) for field in self.fields}
+        self.roots: List[str] = []
+        self.paths: List[str] = []
+        self.sizes = array('q')
+        self.mtimes = array('q')
+        self.status = bytearray()
+        self.columns: Dict[str, bytearray] = {field: bytearray() for field in self.fields}
+        
+    def __len__(self) -> int:
+        return len(self.paths)
+        
+    def append(self, path: str, size: int, mtime_ns: int, status: int, codes: bytes):
+        """Append one encoded repository row"""
+        self.paths.append(path)
+        self.sizes.append(size)
+        self.mtimes.append(mtime_ns)
+        self.status.append(status)
+        for position, field in enumerate(self.fields):
+            self.columns[field].append(codes[position])
+            
+    def row_codes(self, row: int) -> bytes:
+        return bytes(self.columns[field][row] for field in self.fields)
+        
+    # Building
+    
+    @classmethod
+    def build(cls, roots: Sequence[Union[str, Path]], previous: Optional['ConfigIndex'] = None,
+              workers: Optional[int] = None) -> Tuple['ConfigIndex', Dict[str, int]]:
+        """Index every repository under the roots, reusing rows of READMEs whose size and mtime are unchanged"""
+        index = cls()
+        index.roots = [os.path.abspath(root) for root in roots]
+        readmes = discover_readmes(index.roots)
+        
+        reusable: Dict[str, int] = {}
+        if previous is not None and previous.fields == index.fields and previous.dictionaries == index.dictionaries:
+            reusable = {path: row for row, path in enumerate(previous.paths)}
+            
+        rows: Dict[str, Tuple[str, int, int, int, bytes]] = {}
+        stale = []
+        for readme in readmes:
+            row = reusable.get(readme)
+            if row is not None:
+                try:
+                    st = os.stat(readme)
+                except OSError:
+                    st = None
+                if st is not None and st.st_size == previous.sizes[row] and st.st_mtime_ns == previous.mtimes[row]:
+                    rows[readme] = (readme, previous.sizes[row], previous.mtimes[row],
+                                    previous.status[row], previous.row_codes(row))
+                    continue
+            stale.append(readme)
+            
+        if stale:
+            with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as executor:
+                for encoded in executor.map(_encode_readme, stale, chunksize=64):
+                    rows[encoded[0]] = encoded
+                    
+        for readme in readmes:
+            index.append(*rows[readme])
+            
+        stats = {
+            'repositories': len(readmes),
+            'parsed': len(stale),
+            'reused': len(readmes) - len(stale),
+            'removed': len(set(reusable) - set(readmes)),
+            'without_config': index.status.count(NO_CONFIG),
+        }
+        return index, stats
+        
+    # Storage
+    
+    def save(self, path: Union[str, Path]):
+        """Write the index atomically"""
+        header = json.dumps({
+            'fields': self.fields,
+            'dictionaries': self.dictionaries,
+            'roots': self.roots,
+            'rows': len(self),
+        }).encode('utf-8')
+        blobs = [
+            '\0'.join(self.paths).encode('utf-8'),
+            self.sizes.tobytes(),
+            self.mtimes.tobytes(),
+            bytes(self.status),
+        ] + [bytes(self.columns[field]) for field in self.fields]
+        
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(struct.pack('<Q', len(blob)))
+                f.write(blob)
+        os.replace(tmp_path, path)
+        
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ConfigIndex':
+        """Read an index written by save()"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(INDEX_MAGIC):
+            raise Exception(f"{path} is not an Automanic config index")
+        offset = len(INDEX_MAGIC)
+        (header_length,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+        
+        blobs = []
+        for _ in range(4 + len(header['fields'])):
+            (length,) = struct.unpack_from('<Q', data, offset)
+            offset += 8
+            blobs.append(data[offset:offset + length])
+            offset += length
+            
+        index = cls(header['fields'])
+        index.dictionaries = header['dictionaries']
+        index.roots = header['roots']
+        index.paths = blobs[0].decode('utf-8').split('\0') if header['rows'] else []
+        index.sizes = array('q', blobs[1])
+        index.mtimes = array('q', blobs[2])
+        index.status = bytearray(blobs[3])
+        for field, blob in zip(index.fields, blobs[4:]):
+            index.columns[field] = bytearray(blob)
+        if sys.byteorder != 'little':
+            index.sizes.byteswap()
+            index.mtimes.byteswap()
+        return index
+        
+    # Queries
+    
+    def _code(self, field: str, value: str) -> int:
+        if field not in self.columns:
+            raise Exception(f"Unknown field '{field}'. Fields: {', '.join(self.fields)}")
+        try:
+            return self.dictionaries[field].index(value, 1)
+        except ValueError:
+            raise Exception(f"Invalid value '{value}' for field '{field}'. Valid values: {', '.join(self.dictionaries[field][1:])}")
+            
+    def _mask(self, column: bytes, codes: Sequence[int]) -> int:
+        """Bitmask (one 0/1 byte per row) of rows whose code is one of the given codes"""
+        table = bytearray(256)
+        for code in codes:
+            table[code] = 1
+        return int.from_bytes(bytes(column).translate(table), 'little')
+        
+    def match(self, filters: Dict[str, Sequence[str]]) -> int:
+        """Row mask of repositories whose config matches every filter (any of the listed values)"""
+        mask = self._mask(self.status, [HAS_CONFIG])
+        for field, values in filters.items():
+            mask &= self._mask(self.columns.get(field, b''), [self._code(field, value) for value in values])
+        return mask
+        
+    def count(self, mask: int) -> int:
+        return bin(mask).count('1')
+        
+    def rows(self, mask: int) -> Iterator[int]:
+        """Row numbers selected by a mask"""
+        selected = mask.to_bytes(len(self), 'little')
+        row = selected.find(1)
+        while row >= 0:
+            yield row
+            row = selected.find(1, row + 1)
+            
+    def group_by(self, field: str, mask: int) -> 'OrderedDict[str, int]':
+        """Number of selected repositories per value of a field, most common first"""
+        if field not in self.columns:
+            raise Exception(f"Unknown field '{field}'. Fields: {', '.join(self.fields)}")
+        column = self.columns[field]
+        counts = []
+        for code, value in enumerate(self.dictionaries[field]):
+            count = self.count(mask & self._mask(column, [code]))
+            if count:
+                counts.append((value or '(unknown)', count))
+        return OrderedDict(sorted(counts, key=lambda item: -item[1]))
+        
+    def config(self, row: int) -> Dict[str, str]:
+        """Decoded configuration of one row; unknown fields are omitted"""
+        return {field: self.dictionaries[field][self.columns[field][row]]
+                for field in self.fields if self.columns[field][row] != UNKNOWN}
+
+def parse_filters(expressions: Sequence[str]) -> Dict[str, List[str]]:
+    """Parse FIELD=value[,value...] filter expressions"""
+    filters: Dict[str, List[str]] = {}
+    for expression in expressions:
+        if '=' not in expression:
+            raise Exception(f"Filters must look like FIELD=value[,value...]: {expression}")
+        field, values = expression.split('=', 1)
+        filters.setdefault(field.strip().upper(), []).extend(value.strip() for value in values.split(',') if value.strip())
+    return filters
+
+def load_index(index_path: Union[str, Path]) -> Optional[ConfigIndex]:
+    """Existing index, or None if there is none or it cannot be read"""
+    try:
+        return ConfigIndex.load(index_path)
+    except Exception:
+        # A missing or unreadable index is rebuilt from scratch
+        return None
+
+def build_index(roots: Sequence[Union[str, Path]], index_path: Union[str, Path] = INDEX_PATH,
+                full: bool = False, workers: Optional[int] = None) -> Dict[str, int]:
+    """Build or incrementally update the index file; without roots, the roots of the existing index are rescanned"""
+    previous = None if full else load_index(index_path)
+    if not roots:
+        if previous is None:
+            raise Exception(f"No roots given and no existing index at {index_path}")
+        roots = previous.roots
+    index, stats = ConfigIndex.build(roots, previous=previous, workers=workers)
+    index.save(index_path)
+    return stats
+
+def query_index(index: ConfigIndex, filters: Dict[str, Sequence[str]],
+                group_by: Optional[str] = None, limit: Optional[int] = None) -> Dict:
+    """Run a filter and optional group-by, returning matches and counts"""
+    mask = index.match(filters)
+    result: Dict = {'total': len(index), 'matched': index.count(mask)}
+    if group_by:
+        result['groups'] = index.group_by(group_by.upper(), mask)
+    else:
+        paths = []
+        for row in index.rows(mask):
+            if limit is not None and len(paths) >= limit:
+                break
+            paths.append(os.path.dirname(index.paths[row]))
+        result['repositories'] = paths
+    return result
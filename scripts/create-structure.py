@@ -5,20 +5,29 @@ Project Structure Creator
 Creates the complete project structure based on parsed configuration.
 """
 
-import os
-import json
+import argparse
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 
-class ProjectStructureCreator:
+from generation_plan import FlushStats, GenerationPlan
+from plan_cache import PlanGenerator
+from template_registry import register, render
+
+class ProjectStructureCreator(PlanGenerator):
     """Creates project structure based on configuration"""
     
-    def __init__(self):
-        self.base_path = Path.cwd()
-        
-    def create_structure(self):
+    STAGE = 'project'
+    # The project skeleton does not depend on any config field, so every config shares one plan
+    OUTPUT_FIELDS: Dict[str, tuple] = {}
+    
+    def create_structure(self, dry_run: bool = False) -> FlushStats:
         """Create the complete project structure"""
         print("🏗️  Creating project structure...")
+        return self.write_plan(dry_run, "✅ Project structure created successfully!")
+        
+    def build_plan(self) -> GenerationPlan:
+        """Build the generation plan without touching the filesystem"""
+        self.plan = GenerationPlan()
         
         # Create source files
         self._create_source_files()
@@ -32,13 +41,71 @@ class ProjectStructureCreator:
         # Create configuration files
         self._create_config_files()
         
-        print("✅ Project structure created successfully!")
+        return self.plan
         
     def _create_source_files(self):
         """Create basic source files"""
         
+        src_dir = Path('src')
+        self.plan.mkdir(src_dir)
+        
         # Create main Python file
-        main_py = '''#!/usr/bin/env python3
+        self.plan.write(src_dir / 'main.py', render('project/src/main.py'))
+        
+        # Create __init__.py
+        self.plan.write(src_dir / '__init__.py', '"""Your project package"""\n__version__ = "0.1.0"\n')
+        
+        print("📄 Created source files")
+        
+    def _create_test_files(self):
+        """Create basic test files"""
+        
+        tests_dir = Path('tests')
+        self.plan.mkdir(tests_dir)
+        
+        self.plan.write(tests_dir / 'test_main.py', render('project/tests/test_main.py'))
+        
+        self.plan.write(tests_dir / '__init__.py', '')
+        
+        # Create pytest configuration
+        self.plan.write('pytest.ini', render('project/pytest.ini'))
+        
+        print("🧪 Created test files")
+        
+    def _create_documentation(self):
+        """Create documentation structure"""
+        
+        docs_dir = Path('docs')
+        self.plan.mkdir(docs_dir)
+        
+        # Create API documentation
+        self.plan.write(docs_dir / 'api.md', render('project/docs/api.md'))
+        
+        # Create setup guide
+        self.plan.write(docs_dir / 'setup.md', render('project/docs/setup.md'))
+        
+        # Create contributing guide
+        self.plan.write('CONTRIBUTING.md', render('project/CONTRIBUTING.md'))
+        
+        print("📚 Created documentation")
+        
+    def _create_config_files(self):
+        """Create configuration files"""
+        
+        # Create .env.example
+        self.plan.write('.env.example', render('project/.env.example'))
+        
+        # Create .editorconfig
+        self.plan.write('.editorconfig', render('project/.editorconfig'))
+        
+        # Create .gitignore
+        self.plan.write('.gitignore', render('project/.gitignore'))
+        
+        print("⚙️  Created configuration files")
+
+# File templates rendered by ProjectStructureCreator
+
+register('project/src/main.py', '''#!/usr/bin/env python3
 """
 Main application entry point
 """
@@ -49,24 +116,9 @@ def main():
 
 if __name__ == "__main__":
     main()
-'''
-        
-        src_dir = Path('src')
-        src_dir.mkdir(exist_ok=True)
-        
-        with open(src_dir / 'main.py', 'w') as f:
-            f.write(main_py)
-            
-        # Create __init__.py
-        with open(src_dir / '__init__.py', 'w') as f:
-            f.write('"""Your project package"""\n__version__ = "0.1.0"\n')
-            
-        print("📄 Created source files")
-        
-    def _create_test_files(self):
-        """Create basic test files"""
-        
-        test_main = '''#!/usr/bin/env python3
+''')
+
+register('project/tests/test_main.py', '''#!/usr/bin/env python3
 """
 Test main module
 """
@@ -87,19 +139,9 @@ class TestMain(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
-'''
-        
-        tests_dir = Path('tests')
-        tests_dir.mkdir(exist_ok=True)
-        
-        with open(tests_dir / 'test_main.py', 'w') as f:
-            f.write(test_main)
-            
-        with open(tests_dir / '__init__.py', 'w') as f:
-            f.write('')
-            
-        # Create pytest configuration
-        pytest_ini = '''[tool:pytest]
+''')
+
+register('project/pytest.ini', '''[tool:pytest]
 testpaths = tests
 python_files = test_*.py
 python_functions = test_*
@@ -109,21 +151,9 @@ markers =
     slow: marks tests as slow
     integration: marks tests as integration tests
     unit: marks tests as unit tests
-'''
-        
-        with open('pytest.ini', 'w') as f:
-            f.write(pytest_ini)
-            
-        print("🧪 Created test files")
-        
-    def _create_documentation(self):
-        """Create documentation structure"""
-        
-        docs_dir = Path('docs')
-        docs_dir.mkdir(exist_ok=True)
-        
-        # Create API documentation
-        api_md = '''# API Reference
+''')
+
+register('project/docs/api.md', '''# API Reference
 
 ## Main Module
 
@@ -146,13 +176,9 @@ Configuration options and environment variables.
 ## Error Handling
 
 Error codes and handling strategies.
-'''
-        
-        with open(docs_dir / 'api.md', 'w') as f:
-            f.write(api_md)
-            
-        # Create setup guide
-        setup_md = '''# Setup Guide
+''')
+
+register('project/docs/setup.md', '''# Setup Guide
 
 ## Requirements
 
@@ -210,13 +236,9 @@ LOG_LEVEL=info
 ## Troubleshooting
 
 Common issues and solutions.
-'''
-        
-        with open(docs_dir / 'setup.md', 'w') as f:
-            f.write(setup_md)
-            
-        # Create contributing guide
-        contributing_md = '''# Contributing Guide
+''')
+
+register('project/CONTRIBUTING.md', '''# Contributing Guide
 
 Thank you for considering contributing to this project!
 
@@ -264,18 +286,9 @@ Please use GitHub Issues to report bugs. Include:
 - Steps to reproduce
 - Expected vs actual behavior
 - Environment details
-'''
-        
-        with open('CONTRIBUTING.md', 'w') as f:
-            f.write(contributing_md)
-            
-        print("📚 Created documentation")
-        
-    def _create_config_files(self):
-        """Create configuration files"""
-        
-        # Create .env.example
-        env_example = '''# Environment Configuration Example
+''')
+
+register('project/.env.example', '''# Environment Configuration Example
 # Copy this file to .env and fill in your values
 
 # Application Settings
@@ -290,13 +303,9 @@ API_KEY=your-api-key-here
 
 # External Services (if applicable)
 REDIS_URL=redis://localhost:6379/0
-'''
-        
-        with open('.env.example', 'w') as f:
-            f.write(env_example)
-            
-        # Create .editorconfig
-        editorconfig = '''root = true
+''')
+
+register('project/.editorconfig', '''root = true
 
 [*]
 charset = utf-8
@@ -317,13 +326,9 @@ trim_trailing_whitespace = false
 
 [Makefile]
 indent_style = tab
-'''
-        
-        with open('.editorconfig', 'w') as f:
-            f.write(editorconfig)
-            
-        # Create .gitignore
-        gitignore = '''# Byte-compiled / optimized / DLL files
+''')
+
+register('project/.gitignore', '''# Byte-compiled / optimized / DLL files
 __pycache__/
 *.py[cod]
 *$py.class
@@ -479,16 +484,16 @@ Thumbs.db
 logs/
 data/
 *.db
-'''
-        
-        with open('.gitignore', 'w') as f:
-            f.write(gitignore)
-            
-        print("⚙️  Created configuration files")
+''')
 
 def main():
-    creator = ProjectStructureCreator()
-    creator.create_structure()
+    parser = argparse.ArgumentParser(description='Create project source, test, documentation and configuration files')
+    parser.add_argument('--output-root', default=None, help='Directory to generate into (default: current directory)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the planned files and directories without writing them')
+    args = parser.parse_args()
+    
+    creator = ProjectStructureCreator(output_root=args.output_root)
+    creator.create_structure(dry_run=args.dry_run)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Automanic Generation Daemon
+
+`automanic serve` keeps a process running with the generator scripts, their
+templates and the config tables already imported, and accepts generation
+requests on a unix socket. Requests and replies are JSON lines: the client
+sends one request and receives the run's output line by line, followed by a
+final event. Clients fall back to generating in-process when no daemon is
+listening.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from typing import Callable, Dict, Optional, TextIO
+
+SOCKET_ENV = 'AUTOMANIC_SOCKET'
+CONNECT_TIMEOUT = 0.5
+
+def _fallback_socket_dir() -> str:
+    """Per-user directory in the temp directory, for systems without a user runtime directory"""
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"automanic-{os.getuid()}")
+    
+def default_socket_path() -> str:
+    """Socket location: AUTOMANIC_SOCKET, else the user runtime directory, else a private temp directory"""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or _fallback_socket_dir()
+    return os.path.join(runtime_dir, f"automanic-{os.getuid()}.sock")
+
+def run_generation(request: Dict) -> Dict:
+    """Parse (or validate) a config and generate its structure, printing progress like generate-structure.py"""
+    from parse_cache import ParseCache
+    from pipeline import load_script
+    
+    generate_structure = load_script('generate-structure.py')
+    config_parser = generate_structure.AutomanicConfig(cache=ParseCache.from_environment())
+    if request.get('config') is not None:
+        config = {str(key): str(value) for key, value in request['config'].items()}
+        config_parser._validate_config(config)
+    else:
+        config = config_parser.parse_readme(request.get('config_file') or 'README.md')
+        
+    print("✅ Configuration parsed successfully:")
+    for key, value in config.items():
+        print(f"   {key}: {value}")
+    print()
+    
+    generator = generate_structure.StructureGenerator(config, output_root=request.get('output_root'))
+    stats = generator.generate_structure(dry_run=bool(request.get('dry_run')))
+    return {'written': stats.written, 'changed': stats.changed, 'skipped': stats.skipped}
+
+def preload():
+    """Import the generator scripts so their templates and tables are ready before the first request"""
+    from pipeline import load_script
+    
+    for script in ('generate-structure.py', 'setup-workflows.py', 'create-structure.py', 'setup-dev-env.py'):
+        load_script(script)
+
+class LineSink(io.TextIOBase):
+    """Text stream that hands every complete line to a callback"""
+    
+    def __init__(self, emit: Callable[[str], None]):
+        self.emit = emit
+        self.buffer = ''
+        
+    def writable(self) -> bool:
+        return True
+        
+    def write(self, text: str) -> int:
+        self.buffer += text
+        while '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            self.emit(line)
+        return len(text)
+        
+    def flush(self):
+        if self.buffer:
+            self.emit(self.buffer)
+            self.buffer = ''
+
+class ThreadLocalStdout(io.TextIOBase):
+    """sys.stdout replacement that routes each request thread's prints to its own client"""
+    
+    def __init__(self, default: TextIO):
+        self.default = default
+        self.local = threading.local()
+        
+    def writable(self) -> bool:
+        return True
+        
+    def write(self, text: str) -> int:
+        return (getattr(self.local, 'sink', None) or self.default).write(text)
+        
+    def flush(self):
+        (getattr(self.local, 'sink', None) or self.default).flush()
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one JSON-line request per connection"""
+    
+    def _send(self, event: Dict):
+        self.wfile.write(json.dumps(event).encode('utf-8') + b'\n')
+        self.wfile.flush()
+        
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self._send({'event': 'error', 'message': 'Invalid request'})
+            return
+            
+        command = request.get('command')
+        if command == 'ping':
+            self._send({'event': 'done', 'ok': True, 'pid': os.getpid()})
+            return
+        if command != 'generate':
+            self._send({'event': 'error', 'message': f"Unknown command: {command}"})
+            return
+            
+        sink = LineSink(lambda text: self._send({'event': 'output', 'line': text}))
+        stdout = self.server.stdout
+        with self.server.slots:
+            stdout.local.sink = sink
+            try:
+                stats = run_generation(request)
+                sink.flush()
+                self._send({'event': 'done', 'ok': True, 'stats': stats})
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            except Exception as e:
+                sink.flush()
+                self._send({'event': 'error', 'message': str(e)})
+            finally:
+                stdout.local.sink = None
+
+class GenerationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server running generation requests on a bounded number of threads"""
+    
+    daemon_threads = True
+    
+    def __init__(self, socket_path: str, workers: Optional[int] = None):
+        self.socket_path = socket_path
+        self.slots = threading.BoundedSemaphore(workers or os.cpu_count() or 1)
+        self.stdout = ThreadLocalStdout(sys.stdout)
+        _prepare_socket_dir(socket_path)
+        _remove_stale_socket(socket_path)
+        # Only the owning user may connect
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+            
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+def _prepare_socket_dir(socket_path: str):
+    """Create the socket's directory, refusing a shared temp directory that is not private to this user"""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if directory != _fallback_socket_dir():
+        return
+    # Anyone can create this path in the temp directory before the daemon first starts
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise Exception(f"{directory} must be a directory owned by and only accessible to the current user")
+        
+def _remove_stale_socket(socket_path: str):
+    """Remove a socket file left behind by a daemon that is no longer running"""
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    # Never delete a file that a mistyped --socket path points at
+    if not stat.S_ISSOCK(mode):
+        raise Exception(f"{socket_path} exists and is not a socket")
+    if ping(socket_path):
+        raise Exception(f"An Automanic daemon is already listening on {socket_path}")
+    os.unlink(socket_path)
+
+def serve(socket_path: Optional[str] = None, workers: Optional[int] = None):
+    """Preload the generators and serve requests until interrupted"""
+    socket_path = socket_path or default_socket_path()
+    preload()
+    server = GenerationServer(socket_path, workers=workers)
+    sys.stdout = server.stdout
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"🛰️  Automanic daemon listening on {socket_path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        sys.stdout = server.stdout.default
+        print("👋 Automanic daemon stopped")
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    # A socket another user bound at this path would receive our configs and could answer with anything
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CONNECT_TIMEOUT)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+    client.settimeout(None)
+    return client
+
+def ping(socket_path: Optional[str] = None) -> bool:
+    """Whether a daemon is answering on the socket"""
+    client = _connect(socket_path or default_socket_path())
+    if client is None:
+        return False
+    with client:
+        try:
+            client.sendall(b'{"command": "ping"}\n')
+            return json.loads(client.makefile('rb').readline()).get('ok', False)
+        except (OSError, ValueError):
+            return False
+
+def generate(request: Dict, socket_path: Optional[str] = None, use_daemon: bool = True) -> Dict:
+    """Run a generation request on the daemon, streaming its output, or in-process if none is running"""
+    # Paths are resolved here because the daemon runs in a different working directory
+    request = dict(request, command='generate')
+    request['output_root'] = os.path.abspath(request.get('output_root') or os.getcwd())
+    if request.get('config') is None:
+        request['config_file'] = os.path.abspath(request.get('config_file') or 'README.md')
+        
+    client = _connect(socket_path or default_socket_path()) if use_daemon else None
+    if client is None:
+        return run_generation(request)
+        
+    with client:
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        for line in client.makefile('rb'):
+            event = json.loads(line)
+            if event['event'] == 'output':
+                print(event['line'], flush=True)
+            elif event['event'] == 'done':
+                return event.get('stats', {})
+            else:
+                raise Exception(event.get('message', 'Daemon request failed'))
+    raise Exception("Daemon closed the connection before the request finished")
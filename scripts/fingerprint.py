@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Pipeline Fingerprint
+
+Fingerprint of the parsed config block, tool version and template set, stored
+after a successful setup run so unchanged reruns can skip every stage.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from generation_plan import hash_file
+from manifest import Manifest
+
+FINGERPRINT_PATH = '.automanic/fingerprint'
+
+def compute_fingerprint(config: Dict[str, str], tool_version: str, template_files: Iterable[Union[str, Path]],
+                        assets: Iterable[Tuple[str, Path]] = ()) -> str:
+    """Hash the config values, tool version and the content of every template source and (output path, file) asset"""
+    digest = hashlib.sha256()
+    digest.update(f"version={tool_version}\n".encode('utf-8'))
+    for key in sorted(config):
+        digest.update(f"{key}={config[key]}\n".encode('utf-8'))
+    for template_file in template_files:
+        path = Path(template_file)
+        digest.update(f"template={path.name}\n".encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    for path, source in assets:
+        digest.update(f"asset={path}\n".encode('utf-8'))
+        digest.update(hash_file(source, hashlib.sha256()).digest())
+    return digest.hexdigest()
+
+def read_fingerprint(root: Union[str, Path]) -> Optional[str]:
+    """Return the fingerprint stored by the last successful run, if any"""
+    try:
+        with open(Path(root) / FINGERPRINT_PATH, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def write_fingerprint(root: Union[str, Path], fingerprint: str):
+    """Store the fingerprint of a successful run"""
+    path = Path(root) / FINGERPRINT_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(fingerprint + '\n')
+    os.replace(tmp_path, path)
+
+def is_up_to_date(root: Union[str, Path], fingerprint: str) -> bool:
+    """Whether the stored fingerprint matches and every generated file is still present"""
+    if read_fingerprint(root) != fingerprint:
+        return False
+    manifest = Manifest.load(root)
+    if not manifest.entries:
+        return False
+    return all(os.path.exists(manifest.root / path) for path in manifest.entries)
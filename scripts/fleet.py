@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Automanic Fleet Generation
+
+Generates many projects from a JSONL or CSV manifest across a process pool.
+"""
+
+import contextlib
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import readme_config
+from blob_store import AUTO, HARDLINK, PLAIN_COPY, REFLINK, BlobStore, store_usage
+from generation_plan import GenerationPlan
+from git_import import BareRepository
+from pipeline import load_script
+from plan_cache import plan_cache
+
+OUTPUT_KEYS = ('output_dir', 'output')
+
+class FleetRow:
+    """One manifest row: a configuration and the directory to generate it into"""
+    
+    __slots__ = ('number', 'config', 'output_dir', 'error', 'stats')
+    
+    def __init__(self, number: int, config: Dict[str, str], output_dir: Optional[str], error: Optional[str] = None):
+        self.number = number
+        self.config = config
+        self.output_dir = output_dir
+        self.error = error
+        self.stats: Optional[Tuple[int, int, int]] = None
+
+def _row_from_record(number: int, record: Dict) -> FleetRow:
+    """Split a manifest record into its configuration and output directory"""
+    record = dict(record)
+    output_dir = None
+    for key in OUTPUT_KEYS:
+        if record.get(key):
+            output_dir = str(record.pop(key))
+    config = record.get('config') if isinstance(record.get('config'), dict) else record
+    config = {str(key).strip(): str(value).strip() for key, value in config.items() if key is not None}
+    if not output_dir:
+        return FleetRow(number, config, None, f"Missing output directory ({' or '.join(OUTPUT_KEYS)})")
+    return FleetRow(number, config, output_dir)
+
+def load_rows(manifest_path: str) -> List[FleetRow]:
+    """Read a JSONL or CSV fleet manifest; unreadable rows are kept with an error"""
+    rows = []
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        if Path(manifest_path).suffix.lower() == '.csv':
+            for number, record in enumerate(csv.DictReader(f), 2):
+                rows.append(_row_from_record(number, record))
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    rows.append(FleetRow(number, {}, None, f"Invalid JSON: {e}"))
+                    continue
+                if not isinstance(record, dict):
+                    rows.append(FleetRow(number, {}, None, "Row is not a JSON object"))
+                    continue
+                rows.append(_row_from_record(number, record))
+    return rows
+
+def validate_rows(rows: List[FleetRow]):
+    """Validate every row's configuration, including value compatibility, before any generation starts"""
+    config_parser = load_script('generate-structure.py').AutomanicConfig()
+    for row in rows:
+        if row.error:
+            continue
+        try:
+            config_parser._validate_config(row.config)
+        except Exception as e:
+            row.error = str(e)
+
+def _class_key(row: FleetRow, fields: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Values of the fields the generated plan depends on"""
+    return tuple(row.config.get(field) or '' for field in fields)
+
+# Blob store of the current pool worker, created on its first row
+_worker_store: Optional[BlobStore] = None
+
+def _generate_project(config: Dict[str, str], output_dir: str, git_branch: Optional[str] = None,
+                      store_root: Optional[str] = None,
+                      link_mode: str = AUTO) -> Tuple[Optional[Tuple[int, int, int]], bool, Dict[str, int], Optional[str]]:
+    """Generate one project inside a pool worker, into a directory or a bare repository; errors are returned, not raised"""
+    store = _blob_store(store_root, link_mode)
+    linked = dict(store.counts) if store is not None else {}
+    try:
+        generate_structure = load_script('generate-structure.py')
+        hits = plan_cache.hits
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = generate_structure.StructureGenerator(config, output_root=output_dir)
+            # The cached plan is shared by every row of the same class, so extra files go into a copy
+            plan = GenerationPlan()
+            plan.extend(generator.cached_plan())
+            repository = BareRepository(output_dir, git_branch) if git_branch else None
+            if repository is not None:
+                has_readme = 'README.md' in repository.files()
+            else:
+                has_readme = (generator.base_path / 'README.md').exists()
+            if not has_readme:
+                title = generator.base_path.resolve().name
+                if title.endswith('.git'):
+                    title = title[:-len('.git')]
+                plan.write('README.md', f"# {title}\n\n{readme_config.format_config_block(config)}")
+            if repository is not None:
+                stats = repository.commit(plan, f"Generate {config['PROJECT_TYPE']} project with Automanic")
+            else:
+                stats = plan.flush(generator.base_path, store=store)
+        # Files this row materialized with each link method
+        if store is not None:
+            linked = {method: count - linked[method] for method, count in store.counts.items()}
+        return (stats.written, stats.changed, stats.skipped), plan_cache.hits > hits, linked, None
+    except Exception as e:
+        return None, False, {}, f"{type(e).__name__}: {e}"
+
+def _blob_store(store_root: Optional[str], link_mode: str) -> Optional[BlobStore]:
+    """This worker's blob store, kept across rows so it remembers stored blobs and unsupported link methods"""
+    global _worker_store
+    if store_root is None:
+        return None
+    if _worker_store is None or _worker_store.root != Path(store_root) or _worker_store.link_mode != link_mode:
+        _worker_store = BlobStore(store_root, link_mode)
+    return _worker_store
+
+def run_fleet(manifest_path: str, workers: Optional[int] = None, git_branch: Optional[str] = None,
+              blob_store: Optional[str] = None, link_mode: str = AUTO) -> Dict:
+    """Validate and generate every manifest row, returning a report; with git_branch each output_dir is a bare repository"""
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    
+    rows = load_rows(manifest_path)
+    validate_rows(rows)
+    valid_rows = [row for row in rows if not row.error]
+    
+    # Rows of the same equivalence class are dispatched together so each worker reuses their plan
+    structure_fields = load_script('generate-structure.py').StructureGenerator.PLAN_FIELDS
+    valid_rows.sort(key=lambda row: _class_key(row, structure_fields))
+    plan_hits = 0
+    linked = {REFLINK: 0, HARDLINK: 0, PLAIN_COPY: 0}
+    
+    if valid_rows:
+        chunksize = max(1, len(valid_rows) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _generate_project,
+                [row.config for row in valid_rows],
+                [row.output_dir for row in valid_rows],
+                [git_branch] * len(valid_rows),
+                [blob_store] * len(valid_rows),
+                [link_mode] * len(valid_rows),
+                chunksize=chunksize,
+            )
+            for row, (stats, cache_hit, row_linked, error) in zip(valid_rows, results):
+                row.stats = stats
+                row.error = error
+                plan_hits += cache_hit
+                for method, count in row_linked.items():
+                    linked[method] += count
+                
+    elapsed = time.perf_counter() - start
+    generated = [row for row in rows if not row.error]
+    failures = [row for row in rows if row.error]
+    report = {
+        'rows': len(rows),
+        'generated': len(generated),
+        'failed': len(failures),
+        'workers': workers,
+        'seconds': round(elapsed, 4),
+        'projects_per_second': round(len(generated) / elapsed, 2) if elapsed > 0 else 0.0,
+        'files': {
+            'written': sum(row.stats[0] for row in generated),
+            'changed': sum(row.stats[1] for row in generated),
+            'skipped': sum(row.stats[2] for row in generated),
+        },
+        'plan_cache': {
+            'classes': len({_class_key(row, structure_fields) for row in valid_rows}),
+            'hits': plan_hits,
+            'misses': len(valid_rows) - plan_hits,
+            'hit_rate': round(plan_hits / len(valid_rows), 4) if valid_rows else 0.0,
+        },
+        'failures': [
+            {'row': row.number, 'output_dir': row.output_dir, 'error': row.error}
+            for row in failures
+        ],
+    }
+    if blob_store is not None:
+        report['blob_store'] = dict(store_usage(blob_store), path=blob_store, link_mode=link_mode,
+                                    reflinked=linked[REFLINK], hardlinked=linked[HARDLINK], copied=linked[PLAIN_COPY])
+    return report
+
+def print_report(report: Dict):
+    """Print a human readable fleet summary"""
+    print(f"🚢 Fleet: {report['generated']}/{report['rows']} projects generated in {report['seconds']:.2f}s "
+          f"({report['projects_per_second']:.1f} projects/sec, {report['workers']} workers)")
+    files = report['files']
+    print(f"📝 {files['written']} files written ({files['changed']} changed), {files['skipped']} unchanged skipped")
+    cache = report['plan_cache']
+    print(f"🧠 Plan cache: {cache['classes']} distinct configs, {cache['hits']} hits, {cache['misses']} misses "
+          f"({cache['hit_rate'] * 100:.1f}% hit rate)")
+    if 'blob_store' in report:
+        store = report['blob_store']
+        print(f"🔗 Blob store {store['path']}: {store['blobs']} distinct files, {store['bytes']} bytes "
+              f"({store['reflinked']} reflinked, {store['hardlinked']} hardlinked, {store['copied']} copied)")
+    if report['failures']:
+        print(f"❌ {report['failed']} row(s) failed:")
+        for failure in report['failures']:
+            print(f"   • row {failure['row']} ({failure['output_dir'] or '-'}): {failure['error']}")
@@ -5,117 +5,154 @@ Automanic Structure Generator
 Parses README.md configuration and generates appropriate project structure.
 """
 
-import os
-import re
 import sys
 import json
 import argparse
+import contextlib
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Union
+
+import compatibility
+import readme_config
+from generation_plan import FlushStats, GenerationPlan
+from git_import import DEFAULT_BRANCH, BareRepository
+from parse_cache import ParseCache
+from plan_cache import PlanGenerator
+from profiler import TRACE_PATH, Profiler, print_report
+from template_registry import asset_files, has_template, register, render, template
 
 class AutomanicConfig:
     """Handles parsing and validation of Automanic configuration from README.md"""
     
-    REQUIRED_FIELDS = [
-        'PROJECT_TYPE', 'LANGUAGE', 'FRAMEWORK', 'BUILD_SYSTEM',
-        'DATABASE', 'DEPLOYMENT', 'CI_CD', 'TESTING', 'LICENSE_TYPE', 'VISIBILITY'
-    ]
+    REQUIRED_FIELDS = readme_config.REQUIRED_FIELDS
     
-    VALID_VALUES = {
-        'PROJECT_TYPE': ['web-app', 'cli-tool', 'library', 'api', 'mobile-app', 'desktop-app', 'data-science', 'documentation'],
-        'LANGUAGE': ['python', 'javascript', 'typescript', 'go', 'rust', 'java', 'cpp', 'c', 'php', 'ruby', 'swift', 'kotlin', 'scala', 'r'],
-        'FRAMEWORK': ['react', 'vue', 'angular', 'express', 'fastapi', 'django', 'spring', 'gin', 'actix', 'electron', 'flutter', 'pytorch', 'tensorflow', 'none'],
-        'BUILD_SYSTEM': ['npm', 'yarn', 'pip', 'cargo', 'maven', 'gradle', 'make', 'cmake', 'none'],
-        'DATABASE': ['postgresql', 'mysql', 'mongodb', 'redis', 'sqlite', 'none'],
-        'DEPLOYMENT': ['docker', 'kubernetes', 'aws', 'gcp', 'azure', 'vercel', 'netlify', 'heroku', 'none'],
-        'CI_CD': ['github-actions', 'jenkins', 'gitlab-ci', 'circleci', 'travis-ci', 'none'],
-        'TESTING': ['jest', 'pytest', 'cargo-test', 'junit', 'go-test', 'rspec', 'none'],
-        'LICENSE_TYPE': ['mit', 'apache-2.0', 'gpl-v3', 'bsd-3-clause', 'unlicense', 'proprietary'],
-        'VISIBILITY': ['public', 'private']
-    }
+    VALID_VALUES = readme_config.VALID_VALUES
     
-    def __init__(self):
+    def __init__(self, cache: Optional[ParseCache] = None):
         self.config = {}
+        self.cache = cache
         
     def parse_readme(self, readme_path: str) -> Dict[str, str]:
         """Parse configuration from README.md file"""
         try:
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Unchanged READMEs are answered from the parse cache without being read
+            if self.cache is not None:
+                self.config = self.cache.get_or_parse(readme_path, self._parse_config_block)
+                return self.config
+                
+            # Extract configuration block, reading only up to its end marker
+            config_block = readme_config.read_config_block(readme_path)
         except FileNotFoundError:
             raise Exception(f"README.md not found at {readme_path}")
             
-        # Extract configuration block
-        config_pattern = r'<!-- AUTOMANIC-CONFIG-START -->(.*?)<!-- AUTOMANIC-CONFIG-END -->'
-        match = re.search(config_pattern, content, re.DOTALL)
+        return self._parse_config_block(config_block)
+        
+    def parse_text(self, content: str) -> Dict[str, str]:
+        """Parse configuration from README text already in memory"""
+        return self._parse_config_block(readme_config.extract_config_block(content))
+        
+    def parse_bytes(self, data: bytes) -> Dict[str, str]:
+        """Parse configuration from raw README bytes"""
+        return self._parse_config_block(readme_config.extract_config_block_bytes(data))
         
-        if not match:
+    def _parse_config_block(self, config_block: Optional[str]) -> Dict[str, str]:
+        """Parse and validate an extracted configuration block"""
+        if config_block is None:
             raise Exception("Automanic configuration block not found in README.md")
             
-        config_block = match.group(1)
-        
         # Parse key-value pairs
-        config = {}
-        for line in config_block.split('\n'):
-            line = line.strip()
-            if ':' in line and not line.startswith('<!--'):
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip(' []')
-                if key in self.REQUIRED_FIELDS:
-                    config[key] = value
-                    
+        config = readme_config.parse_config_block(config_block, self.REQUIRED_FIELDS)
+        
         # Validate configuration
         self._validate_config(config)
         self.config = config
         return config
         
     def _validate_config(self, config: Dict[str, str]):
-        """Validate configuration values"""
-        missing_fields = [field for field in self.REQUIRED_FIELDS if field not in config]
-        if missing_fields:
-            raise Exception(f"Missing required fields: {', '.join(missing_fields)}")
-            
-        for key, value in config.items():
-            if key in self.VALID_VALUES and value not in self.VALID_VALUES[key]:
-                raise Exception(f"Invalid value '{value}' for field '{key}'. Valid values: {', '.join(self.VALID_VALUES[key])}")
+        """Validate configuration values and their combination"""
+        readme_config.validate_config(config)
+        compatibility.check_compatibility(config)
 
-class StructureGenerator:
+class StructureGenerator(PlanGenerator):
     """Generates project structure based on configuration"""
     
-    def __init__(self, config: Dict[str, str]):
-        self.config = config
-        self.base_path = Path.cwd()
-        
-    def generate_structure(self):
+    STAGE = 'structure'
+    # Config fields each output depends on; plans are cached per distinct combination
+    OUTPUT_FIELDS = {
+        'directories': ('PROJECT_TYPE', 'LANGUAGE'),
+        'language files': ('LANGUAGE', 'FRAMEWORK', 'BUILD_SYSTEM'),
+        'Dockerfile': ('DEPLOYMENT', 'LANGUAGE'),
+        '.gitignore': ('LANGUAGE',),
+        '.editorconfig': (),
+        'template assets': ('PROJECT_TYPE',),
+    }
+    
+    def generate_structure(self, dry_run: bool = False) -> FlushStats:
         """Generate complete project structure"""
         print(f"🏗️  Generating structure for {self.config['PROJECT_TYPE']} using {self.config['LANGUAGE']}")
+        return self.write_plan(dry_run, "✅ Project structure generated successfully!")
         
-        # Create base directories
-        self._create_base_directories()
+    def commit_structure(self, git_dir: Union[str, Path], branch: str = DEFAULT_BRANCH) -> FlushStats:
+        """Commit the project structure to a branch of a bare repository instead of writing files"""
+        print(f"🏗️  Generating structure for {self.config['PROJECT_TYPE']} using {self.config['LANGUAGE']}")
+        self.current_plan()
         
-        # Generate language-specific files
-        self._generate_language_files()
+        repository = BareRepository(git_dir, branch)
+        stats = repository.commit(self.plan, f"Generate {self.config['PROJECT_TYPE']} project structure with Automanic")
+        print(stats.summary())
+        if stats.written:
+            print(f"✅ Project structure committed to {repository.ref} in {git_dir}")
+        else:
+            print(f"✅ {repository.ref} in {git_dir} already holds the project structure")
+        return stats
         
-        # Generate framework-specific files
-        self._generate_framework_files()
+    def build_plan(self) -> GenerationPlan:
+        """Build the generation plan without touching the filesystem"""
+        self.plan = GenerationPlan()
         
+        # Create base directories
+        with self._phase('_create_base_directories'):
+            self._create_base_directories()
+            
+        # Generate language-specific files
+        with self._phase('_generate_language_files'):
+            self._generate_language_files()
+            
+        # Generate framework-specific files
+        with self._phase('_generate_framework_files'):
+            self._generate_framework_files()
+            
         # Generate build system files
-        self._generate_build_files()
-        
+        with self._phase('_generate_build_files'):
+            self._generate_build_files()
+            
         # Generate testing files
-        self._generate_testing_files()
-        
+        with self._phase('_generate_testing_files'):
+            self._generate_testing_files()
+            
         # Generate deployment files
-        self._generate_deployment_files()
-        
+        with self._phase('_generate_deployment_files'):
+            self._generate_deployment_files()
+            
         # Generate documentation
-        self._generate_documentation()
-        
+        with self._phase('_generate_documentation'):
+            self._generate_documentation()
+            
         # Generate configuration files
-        self._generate_config_files()
+        with self._phase('_generate_config_files'):
+            self._generate_config_files()
+            
+        # Copy binary template assets
+        with self._phase('_copy_template_assets'):
+            self._copy_template_assets()
+            
+        return self.plan
         
-        print("✅ Project structure generated successfully!")
+    def _phase(self, name: str):
+        """Profile a build phase when a profiler is attached"""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.phase(name, self.plan)
         
     def _create_base_directories(self):
         """Create base directory structure"""
@@ -150,7 +187,7 @@ class StructureGenerator:
             dirs.extend(['src/main/java', 'src/test/java', 'src/main/resources'])
             
         for dir_path in dirs:
-            os.makedirs(dir_path, exist_ok=True)
+            self.plan.mkdir(dir_path)
             
         print(f"📁 Created {len(dirs)} directories")
         
@@ -172,29 +209,92 @@ class StructureGenerator:
     def _create_python_files(self):
         """Create Python-specific files"""
         # requirements.txt
-        requirements = [
-            "# Production dependencies",
-            "requests>=2.28.0",
-            "click>=8.0.0",
-            "",
-            "# Development dependencies",
-            "pytest>=7.0.0",
-            "black>=22.0.0",
-            "flake8>=5.0.0",
-            "mypy>=0.991"
-        ]
-        
-        if self.config['FRAMEWORK'] == 'fastapi':
-            requirements.insert(1, "fastapi>=0.100.0")
-            requirements.insert(2, "uvicorn[standard]>=0.20.0")
-        elif self.config['FRAMEWORK'] == 'django':
-            requirements.insert(1, "django>=4.2.0")
+        self.plan.write('requirements.txt', render('structure/requirements.txt', self.config))
+        
+        # setup.py
+        self.plan.write('setup.py', render('structure/setup.py'))
+        
+        # pyproject.toml
+        self.plan.write('pyproject.toml', render('structure/pyproject.toml'))
+        
+    def _create_js_files(self):
+        """Create JavaScript/TypeScript files"""
+        self.plan.write('package.json', render('structure/package.json', self.config))
+        
+    def _create_go_files(self):
+        """Create Go-specific files"""
+        self.plan.write('go.mod', render('structure/go.mod'))
+        
+    def _create_rust_files(self):
+        """Create Rust-specific files"""
+        self.plan.write('Cargo.toml', render('structure/Cargo.toml'))
+        
+    def _create_java_files(self):
+        """Create Java-specific files"""
+        if self.config['BUILD_SYSTEM'] == 'maven':
+            self.plan.write('pom.xml', render('structure/pom.xml'))
             
-        with open('requirements.txt', 'w') as f:
-            f.write('\n'.join(requirements))
+    def _generate_framework_files(self):
+        """Generate framework-specific files"""
+        # Implementation for framework-specific files would go here
+        pass
+        
+    def _generate_build_files(self):
+        """Generate build system files"""
+        # Implementation for build-specific files would go here
+        pass
+        
+    def _generate_testing_files(self):
+        """Generate testing configuration files"""
+        # Implementation for testing files would go here
+        pass
+        
+    def _generate_deployment_files(self):
+        """Generate deployment configuration files"""
+        if self.config['DEPLOYMENT'] == 'docker':
+            self._create_dockerfile()
             
-        # setup.py
-        setup_py = '''from setuptools import setup, find_packages
+    def _create_dockerfile(self):
+        """Create Dockerfile based on language"""
+        language = self.config['LANGUAGE']
+        
+        name = f'structure/Dockerfile/{language}'
+        if has_template(name):
+            self.plan.write('Dockerfile', render(name))
+            
+    def _generate_documentation(self):
+        """Generate documentation structure"""
+        # Implementation for documentation files would go here
+        pass
+        
+    def _generate_config_files(self):
+        """Generate configuration files like .gitignore, .editorconfig"""
+        self._create_gitignore()
+        self._create_editorconfig()
+        
+    def _create_gitignore(self):
+        """Create .gitignore based on language and framework"""
+        language = self.config['LANGUAGE']
+        
+        name = f'structure/.gitignore/{language}'
+        if has_template(name):
+            self.plan.write('.gitignore', render(name))
+            
+    def _create_editorconfig(self):
+        """Create .editorconfig"""
+        self.plan.write('.editorconfig', render('structure/.editorconfig'))
+        
+    def _copy_template_assets(self):
+        """Copy the project type's asset directory from templates/assets"""
+        assets = asset_files(self.config['PROJECT_TYPE'])
+        for path, source, mode in assets:
+            self.plan.copy(path, source, mode=mode)
+        if assets:
+            print(f"🖼️  Copying {len(assets)} template assets")
+
+# File templates rendered by StructureGenerator
+
+register('structure/setup.py', '''from setuptools import setup, find_packages
 
 setup(
     name="your-project",
@@ -216,12 +316,9 @@ setup(
         "Operating System :: OS Independent",
     ],
 )
-'''
-        with open('setup.py', 'w') as f:
-            f.write(setup_py)
-            
-        # pyproject.toml
-        pyproject = '''[build-system]
+''')
+
+register('structure/pyproject.toml', '''[build-system]
 requires = ["setuptools>=61.0", "wheel"]
 build-backend = "setuptools.build_meta"
 
@@ -243,50 +340,9 @@ target-version = ['py38']
 python_version = "3.8"
 warn_return_any = true
 warn_unused_configs = true
-'''
-        with open('pyproject.toml', 'w') as f:
-            f.write(pyproject)
-            
-    def _create_js_files(self):
-        """Create JavaScript/TypeScript files"""
-        package_json = {
-            "name": "your-project",
-            "version": "1.0.0",
-            "description": "A brief description of your project",
-            "main": "src/index.js",
-            "scripts": {
-                "start": "node src/index.js",
-                "dev": "nodemon src/index.js",
-                "test": "jest",
-                "build": "webpack --mode=production",
-                "lint": "eslint src/"
-            },
-            "dependencies": {},
-            "devDependencies": {
-                "jest": "^29.0.0",
-                "eslint": "^8.0.0",
-                "nodemon": "^3.0.0"
-            }
-        }
-        
-        if self.config['LANGUAGE'] == 'typescript':
-            package_json["main"] = "dist/index.js"
-            package_json["scripts"]["build"] = "tsc"
-            package_json["scripts"]["dev"] = "ts-node src/index.ts"
-            package_json["devDependencies"]["typescript"] = "^5.0.0"
-            package_json["devDependencies"]["ts-node"] = "^10.0.0"
-            package_json["devDependencies"]["@types/node"] = "^20.0.0"
-            
-        if self.config['FRAMEWORK'] == 'react':
-            package_json["dependencies"]["react"] = "^18.0.0"
-            package_json["dependencies"]["react-dom"] = "^18.0.0"
-            
-        with open('package.json', 'w') as f:
-            json.dump(package_json, f, indent=2)
-            
-    def _create_go_files(self):
-        """Create Go-specific files"""
-        go_mod = f'''module your-project
+''')
+
+register('structure/go.mod', '''module your-project
 
 go 1.21
 
@@ -294,13 +350,9 @@ require (
     github.com/gorilla/mux v1.8.0
     github.com/spf13/cobra v1.7.0
 )
-'''
-        with open('go.mod', 'w') as f:
-            f.write(go_mod)
-            
-    def _create_rust_files(self):
-        """Create Rust-specific files"""
-        cargo_toml = '''[package]
+''')
+
+register('structure/Cargo.toml', '''[package]
 name = "your-project"
 version = "0.1.0"
 edition = "2021"
@@ -313,14 +365,9 @@ serde_json = "1.0"
 
 [dev-dependencies]
 criterion = "0.5"
-'''
-        with open('Cargo.toml', 'w') as f:
-            f.write(cargo_toml)
-            
-    def _create_java_files(self):
-        """Create Java-specific files"""
-        if self.config['BUILD_SYSTEM'] == 'maven':
-            pom_xml = '''<?xml version="1.0" encoding="UTF-8"?>
+''')
+
+register('structure/pom.xml', '''<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0"
          xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
          xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 
@@ -347,36 +394,69 @@ criterion = "0.5"
         </dependency>
     </dependencies>
 </project>
-'''
-            with open('pom.xml', 'w') as f:
-                f.write(pom_xml)
-                
-    def _generate_framework_files(self):
-        """Generate framework-specific files"""
-        # Implementation for framework-specific files would go here
-        pass
-        
-    def _generate_build_files(self):
-        """Generate build system files"""
-        # Implementation for build-specific files would go here
-        pass
-        
-    def _generate_testing_files(self):
-        """Generate testing configuration files"""
-        # Implementation for testing files would go here
-        pass
+''')
+
+@template('structure/requirements.txt', fields=('FRAMEWORK',))
+def _render_requirements(config: Dict[str, str]) -> str:
+    """Render requirements.txt for the configured framework"""
+    requirements = [
+        "# Production dependencies",
+        "requests>=2.28.0",
+        "click>=8.0.0",
+        "",
+        "# Development dependencies",
+        "pytest>=7.0.0",
+        "black>=22.0.0",
+        "flake8>=5.0.0",
+        "mypy>=0.991"
+    ]
+    
+    if config['FRAMEWORK'] == 'fastapi':
+        requirements.insert(1, "fastapi>=0.100.0")
+        requirements.insert(2, "uvicorn[standard]>=0.20.0")
+    elif config['FRAMEWORK'] == 'django':
+        requirements.insert(1, "django>=4.2.0")
+        
+    return '\n'.join(requirements)
+
+@template('structure/package.json', fields=('LANGUAGE', 'FRAMEWORK'))
+def _render_package_json(config: Dict[str, str]) -> str:
+    """Render package.json for the configured language and framework"""
+    package_json = {
+        "name": "your-project",
+        "version": "1.0.0",
+        "description": "A brief description of your project",
+        "main": "src/index.js",
+        "scripts": {
+            "start": "node src/index.js",
+            "dev": "nodemon src/index.js",
+            "test": "jest",
+            "build": "webpack --mode=production",
+            "lint": "eslint src/"
+        },
+        "dependencies": {},
+        "devDependencies": {
+            "jest": "^29.0.0",
+            "eslint": "^8.0.0",
+            "nodemon": "^3.0.0"
+        }
+    }
+    
+    if config['LANGUAGE'] == 'typescript':
+        package_json["main"] = "dist/index.js"
+        package_json["scripts"]["build"] = "tsc"
+        package_json["scripts"]["dev"] = "ts-node src/index.ts"
+        package_json["devDependencies"]["typescript"] = "^5.0.0"
+        package_json["devDependencies"]["ts-node"] = "^10.0.0"
+        package_json["devDependencies"]["@types/node"] = "^20.0.0"
         
-    def _generate_deployment_files(self):
-        """Generate deployment configuration files"""
-        if self.config['DEPLOYMENT'] == 'docker':
-            self._create_dockerfile()
-            
-    def _create_dockerfile(self):
-        """Create Dockerfile based on language"""
-        language = self.config['LANGUAGE']
+    if config['FRAMEWORK'] == 'react':
+        package_json["dependencies"]["react"] = "^18.0.0"
+        package_json["dependencies"]["react-dom"] = "^18.0.0"
         
-        dockerfiles = {
-            'python': '''FROM python:3.11-slim
+    return json.dumps(package_json, indent=2)
+
+register('structure/Dockerfile/python', '''FROM python:3.11-slim
 
 WORKDIR /app
 
@@ -388,8 +468,9 @@ COPY . .
 EXPOSE 8000
 
 CMD ["python", "src/main.py"]
-''',
-            'javascript': '''FROM node:18-alpine
+''')
+
+register('structure/Dockerfile/javascript', '''FROM node:18-alpine
 
 WORKDIR /app
 
@@ -401,8 +482,9 @@ COPY . .
 EXPOSE 3000
 
 CMD ["npm", "start"]
-''',
-            'go': '''FROM golang:1.21-alpine AS builder
+''')
+
+register('structure/Dockerfile/go', '''FROM golang:1.21-alpine AS builder
 
 WORKDIR /app
 COPY go.mod go.sum ./
@@ -418,29 +500,9 @@ WORKDIR /root/
 COPY --from=builder /app/main .
 
 CMD ["./main"]
-'''
-        }
-        
-        if language in dockerfiles:
-            with open('Dockerfile', 'w') as f:
-                f.write(dockerfiles[language])
-                
-    def _generate_documentation(self):
-        """Generate documentation structure"""
-        # Implementation for documentation files would go here
-        pass
-        
-    def _generate_config_files(self):
-        """Generate configuration files like .gitignore, .editorconfig"""
-        self._create_gitignore()
-        self._create_editorconfig()
-        
-    def _create_gitignore(self):
-        """Create .gitignore based on language and framework"""
-        language = self.config['LANGUAGE']
-        
-        gitignore_templates = {
-            'python': '''# Byte-compiled / optimized / DLL files
+''')
+
+register('structure/.gitignore/python', '''# Byte-compiled / optimized / DLL files
 __pycache__/
 *.py[cod]
 *$py.class
@@ -502,8 +564,9 @@ venv.bak/
 # OS
 .DS_Store
 Thumbs.db
-''',
-            'javascript': '''# Dependencies
+''')
+
+register('structure/.gitignore/javascript', '''# Dependencies
 node_modules/
 npm-debug.log*
 yarn-debug.log*
@@ -536,8 +599,9 @@ build/
 # OS
 .DS_Store
 Thumbs.db
-''',
-            'go': '''# Binaries for programs and plugins
+''')
+
+register('structure/.gitignore/go', '''# Binaries for programs and plugins
 *.exe
 *.exe~
 *.dll
@@ -563,8 +627,9 @@ go.work
 # OS
 .DS_Store
 Thumbs.db
-''',
-            'rust': '''# Generated by Cargo
+''')
+
+register('structure/.gitignore/rust', '''# Generated by Cargo
 /target/
 
 # Remove Cargo.lock from gitignore if creating an executable
@@ -580,16 +645,9 @@ Cargo.lock
 # OS
 .DS_Store
 Thumbs.db
-'''
-        }
-        
-        if language in gitignore_templates:
-            with open('.gitignore', 'w') as f:
-                f.write(gitignore_templates[language])
-                
-    def _create_editorconfig(self):
-        """Create .editorconfig"""
-        editorconfig = '''root = true
+''')
+
+register('structure/.editorconfig', '''root = true
 
 [*]
 charset = utf-8
@@ -607,18 +665,22 @@ indent_style = tab
 
 [*.md]
 trim_trailing_whitespace = false
-'''
-        with open('.editorconfig', 'w') as f:
-            f.write(editorconfig)
+''')
 
 def main():
     parser = argparse.ArgumentParser(description='Generate project structure from README configuration')
     parser.add_argument('--config-file', default='README.md', help='Path to README.md file with configuration')
+    parser.add_argument('--output-root', default=None, help='Directory to generate into (default: current directory)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the planned files and directories without writing them')
+    parser.add_argument('--profile', action='store_true', help='Record per-phase and per-file timings and print a summary table')
+    parser.add_argument('--profile-output', default=None, help=f'Chrome trace file for --profile (default: <output root>/{TRACE_PATH})')
+    parser.add_argument('--git-dir', default=None, help='Commit the structure to this bare repository (created if missing) instead of writing files')
+    parser.add_argument('--branch', default=DEFAULT_BRANCH, help=f'Branch to commit to with --git-dir (default: {DEFAULT_BRANCH})')
     args = parser.parse_args()
     
     try:
         # Parse configuration
-        config_parser = AutomanicConfig()
+        config_parser = AutomanicConfig(cache=ParseCache.from_environment())
         config = config_parser.parse_readme(args.config_file)
         
         print(f"✅ Configuration parsed successfully:")
@@ -627,9 +689,15 @@ def main():
         print()
         
         # Generate structure
-        generator = StructureGenerator(config)
-        generator.generate_structure()
-        
+        profiler = Profiler() if args.profile else None
+        generator = StructureGenerator(config, output_root=args.output_root, profiler=profiler)
+        if args.git_dir and not args.dry_run:
+            generator.commit_structure(args.git_dir, args.branch)
+        else:
+            generator.generate_structure(dry_run=args.dry_run)
+        if profiler is not None:
+            print_report(profiler, args.profile_output or generator.base_path / TRACE_PATH)
+            
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Generation Plan
+
+In-memory plan of the directory and file operations a generator performs,
+flushed to an output directory in a single batched pass. Files are either
+planned content or copies of asset files, which are copied in the kernel and
+never read into memory.
+"""
+
+import errno
+import filecmp
+import hashlib
+import io
+import os
+import shutil
+import sys
+import time
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+from manifest import Manifest
+
+MKDIR = 'mkdir'
+WRITE = 'write'
+COPY = 'copy'
+FILE_KINDS = (WRITE, COPY)
+
+# Bytes per copy_file_range/sendfile call and per read when hashing asset files
+COPY_CHUNK = 1024 * 1024
+
+# Outcomes of flushing a single file
+WRITTEN = 'written'
+CHANGED = 'changed'
+SKIPPED = 'skipped'
+
+def _normalize(path: Union[str, Path]) -> str:
+    """Normalize a plan path to a relative POSIX path"""
+    normalized = PurePosixPath(Path(path).as_posix())
+    if normalized.is_absolute() or '..' in normalized.parts:
+        raise ValueError(f"Plan paths must be relative to the output root: {path}")
+    return str(normalized)
+
+class PlanOp:
+    """A single planned directory or file operation"""
+    
+    __slots__ = ('kind', 'path', 'data', 'mode', 'source', '_digest')
+    
+    def __init__(self, kind: str, path: str, data: Optional[bytes] = None, mode: Optional[int] = None,
+                 source: Optional[Path] = None):
+        self.kind = kind
+        self.path = path
+        self.data = data
+        self.mode = mode
+        self.source = source
+        self._digest: Optional[str] = None
+        
+    @property
+    def size(self) -> int:
+        """Length of the file content"""
+        return len(self.data) if self.data is not None else os.stat(self.source).st_size
+        
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the file content, computed once per op"""
+        if self._digest is None:
+            if self.data is not None:
+                self._digest = hashlib.sha256(self.data).hexdigest()
+            else:
+                self._digest = hash_file(self.source, hashlib.sha256()).hexdigest()
+        return self._digest
+        
+    def source_signature(self) -> List[Union[str, int]]:
+        """Path, size, mtime and inode of a copied asset file, which change whenever its content can have"""
+        st = os.stat(self.source)
+        return [str(self.source), st.st_size, st.st_mtime_ns, st.st_ino]
+        
+    def open(self) -> BinaryIO:
+        """Readable file object over the content"""
+        return io.BytesIO(self.data) if self.data is not None else open(self.source, 'rb')
+        
+    def __repr__(self) -> str:
+        if self.kind == MKDIR:
+            return f"PlanOp(mkdir, {self.path!r})"
+        if self.kind == COPY:
+            return f"PlanOp(copy, {self.path!r}, from {str(self.source)!r})"
+        return f"PlanOp(write, {self.path!r}, {len(self.data)} bytes)"
+
+class FlushStats:
+    """Counts of files written, changed and skipped while flushing plans"""
+    
+    __slots__ = ('written', 'changed', 'skipped')
+    
+    def __init__(self, written: int = 0, changed: int = 0, skipped: int = 0):
+        self.written = written
+        self.changed = changed
+        self.skipped = skipped
+        
+    def __add__(self, other: 'FlushStats') -> 'FlushStats':
+        return FlushStats(self.written + other.written, self.changed + other.changed, self.skipped + other.skipped)
+        
+    def __repr__(self) -> str:
+        return f"FlushStats(written={self.written}, changed={self.changed}, skipped={self.skipped})"
+        
+    def summary(self) -> str:
+        """One-line report of the flush"""
+        return f"📝 {self.written} files written ({self.changed} changed), {self.skipped} unchanged skipped"
+
+class GenerationPlan:
+    """Ordered directory and file operations, independent of any output directory"""
+    
+    def __init__(self):
+        self.ops: List[PlanOp] = []
+        
+    def mkdir(self, path: Union[str, Path]):
+        """Plan a directory (parents are implied)"""
+        self.ops.append(PlanOp(MKDIR, _normalize(path)))
+        
+    def write(self, path: Union[str, Path], content: Union[str, bytes], mode: Optional[int] = None):
+        """Plan a file write; text is stored UTF-8 encoded"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        self.ops.append(PlanOp(WRITE, _normalize(path), data, mode))
+        
+    def copy(self, path: Union[str, Path], source: Union[str, Path], mode: Optional[int] = None):
+        """Plan a copy of an asset file; its content is only read when the plan is flushed"""
+        self.ops.append(PlanOp(COPY, _normalize(path), mode=mode, source=Path(source)))
+        
+    def extend(self, other: 'GenerationPlan'):
+        """Append all operations of another plan"""
+        self.ops.extend(other.ops)
+        
+    def directories(self) -> List[str]:
+        """All directories the plan creates, parents first"""
+        dirs = set()
+        for op in self.ops:
+            parts = PurePosixPath(op.path).parts
+            if op.kind in FILE_KINDS:
+                parts = parts[:-1]
+            for i in range(1, len(parts) + 1):
+                dirs.add('/'.join(parts[:i]))
+        return sorted(dirs)
+        
+    def files(self) -> Dict[str, PlanOp]:
+        """Final write operation for every planned file, in plan order"""
+        files: Dict[str, PlanOp] = {}
+        for op in self.ops:
+            if op.kind in FILE_KINDS:
+                files.pop(op.path, None)
+                files[op.path] = op
+        return files
+        
+    def total_bytes(self) -> int:
+        """Number of bytes the plan writes"""
+        return sum(op.size for op in self.files().values())
+        
+    def describe(self) -> List[str]:
+        """Human readable listing of the planned operations"""
+        lines = [f"mkdir  {path}/" for path in self.directories()]
+        for path, op in self.files().items():
+            mode = f" mode {op.mode:o}" if op.mode is not None else ""
+            source = f" from {op.source}" if op.kind == COPY else ""
+            lines.append(f"{op.kind:<6} {path} ({op.size} bytes{source}{mode})")
+        return lines
+        
+    def foreign_files(self, root: Union[str, Path], manifest: Manifest) -> List[str]:
+        """Planned files already under root with other content that no previous flush wrote"""
+        foreign = []
+        for path, op in self.files().items():
+            if path in manifest.entries:
+                continue
+            try:
+                st = os.stat(Path(root) / path)
+            except FileNotFoundError:
+                continue
+            if not _same_content(Path(root) / path, st, op):
+                foreign.append(path)
+        return foreign
+        
+    def print_dry_run(self):
+        """Print the plan without touching the filesystem"""
+        files = self.files()
+        print(f"📝 Dry run: {len(self.directories())} directories, {len(files)} files, {self.total_bytes()} bytes")
+        for line in self.describe():
+            print(f"   {line}")
+            
+    def flush(self, root: Union[str, Path] = '.', manifest: Optional[Manifest] = None, profiler=None,
+              store=None) -> FlushStats:
+        """Create all directories, then write (or link from a BlobStore) every file whose content differs from disk"""
+        root = Path(root)
+        owns_manifest = manifest is None
+        if owns_manifest:
+            manifest = Manifest.load(root)
+            
+        for directory in self.directories():
+            os.makedirs(root / directory, exist_ok=True)
+            
+        stats = FlushStats()
+        for path, op in self.files().items():
+            started = time.perf_counter()
+            status = _flush_file(root / path, path, op, manifest, store)
+            if status == SKIPPED:
+                stats.skipped += 1
+            else:
+                stats.written += 1
+                stats.changed += status == CHANGED
+            if profiler is not None:
+                profiler.record_file(path, started, time.perf_counter() - started,
+                                     0 if status == SKIPPED else op.size, status)
+                                     
+        if owns_manifest:
+            manifest.save()
+        return stats
+
+class Collision:
+    """A file planned by more than one stage, and the stage whose content is written"""
+    
+    __slots__ = ('path', 'stages', 'winner', 'identical')
+    
+    def __init__(self, path: str, stages: Tuple[str, ...], winner: str, identical: bool):
+        self.path = path
+        self.stages = stages
+        self.winner = winner
+        self.identical = identical
+        
+    def describe(self) -> str:
+        losers = ', '.join(stage for stage in self.stages if stage != self.winner)
+        return f"{self.path}: {self.winner} over {losers}{' (identical content)' if self.identical else ''}"
+
+def merge_plans(stage_plans: Sequence[Tuple[str, GenerationPlan]],
+                precedence: Sequence[str]) -> Tuple[GenerationPlan, List[Collision]]:
+    """One plan with every stage's directories and each file once, from the first stage in precedence that plans it"""
+    rank = {stage: position for position, stage in enumerate(precedence)}
+    merged = GenerationPlan()
+    candidates: Dict[str, List[Tuple[str, PlanOp]]] = {}
+    for stage, plan in stage_plans:
+        if stage not in rank:
+            raise Exception(f"No precedence defined for stage '{stage}'")
+        merged.ops.extend(op for op in plan.ops if op.kind == MKDIR)
+        for path, op in plan.files().items():
+            candidates.setdefault(path, []).append((stage, op))
+            
+    collisions = []
+    for path, planned in candidates.items():
+        winner, op = min(planned, key=lambda candidate: rank[candidate[0]])
+        merged.ops.append(op)
+        if len(planned) > 1:
+            identical = all(other.digest == op.digest for _, other in planned)
+            collisions.append(Collision(path, tuple(stage for stage, _ in planned), winner, identical))
+    return merged, collisions
+
+def _flush_file(target: Path, path: str, op: PlanOp, manifest: Manifest, store=None) -> str:
+    """Write one planned file unless its content is already on disk"""
+    try:
+        st = os.stat(target)
+    except FileNotFoundError:
+        st = None
+        
+    # An asset copy is only hashed when it or its source changed since the last flush
+    source = op.source_signature() if op.kind == COPY else None
+    if st is not None and source is not None and manifest.copied(path, source, st):
+        _restore_mode(target, st, op)
+        return SKIPPED
+    if st is not None and (manifest.matches(path, op.digest, st) or _same_content(target, st, op)):
+        _restore_mode(target, st, op)
+        manifest.record(path, op.digest, st, source)
+        return SKIPPED
+        
+    if store is not None:
+        store.materialize(op, target, exists=st is not None)
+    else:
+        # A hardlinked file shares its inode with a blob store, so it is replaced, never rewritten
+        if st is not None and st.st_nlink > 1:
+            os.unlink(target)
+        if op.kind == COPY:
+            copy_file(op.source, target)
+        else:
+            with open(target, 'wb') as f:
+                f.write(op.data)
+        if op.mode is not None:
+            os.chmod(target, op.mode)
+    manifest.record(path, op.digest, os.stat(target), source)
+    return WRITTEN if st is None else CHANGED
+
+def _restore_mode(target: Path, st: os.stat_result, op: PlanOp):
+    """Reset the planned mode of a skipped file"""
+    # A hardlinked file keeps the read-only mode of its blob store inode
+    if op.mode is not None and st.st_nlink == 1 and st.st_mode & 0o777 != op.mode:
+        os.chmod(target, op.mode)
+
+def _same_content(target: Path, st: os.stat_result, op: PlanOp) -> bool:
+    """Compare a file on disk with planned content, reading it only if the sizes match"""
+    if st.st_size != op.size:
+        return False
+    if op.kind == COPY:
+        return filecmp.cmp(op.source, target, shallow=False)
+    with open(target, 'rb') as f:
+        return f.read() == op.data
+
+def hash_file(path: Union[str, Path], digest):
+    """Feed a file into a hash object in bounded chunks"""
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b''):
+            digest.update(chunk)
+    return digest
+
+# Errors meaning a kernel copy method is not available for these files, so the next one is tried
+_COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+def _kernel_copy_methods():
+    """copy_file_range and sendfile, where the platform has them"""
+    methods = []
+    if hasattr(os, 'copy_file_range'):
+        methods.append(lambda src, dst, count: os.copy_file_range(src, dst, count))
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        # On Linux a None offset reads from, and advances, the source position
+        methods.append(lambda src, dst, count: os.sendfile(dst, src, None, count))
+    return methods
+
+_KERNEL_COPY_METHODS = _kernel_copy_methods()
+
+def copy_file(source: Union[str, Path], target: Union[str, Path]):
+    """Copy a file's content with copy_file_range or sendfile, falling back to a chunked copy"""
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        for method in _KERNEL_COPY_METHODS:
+            try:
+                while remaining > 0:
+                    copied = method(src.fileno(), dst.fileno(), min(remaining, COPY_CHUNK))
+                    # Some filesystems (overlay, FUSE, ...) copy nothing rather than failing
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError as e:
+                if e.errno not in _COPY_UNSUPPORTED:
+                    raise
+            if remaining == 0:
+                return
+        # Continue from wherever a kernel method stopped, reading to the end of the source
+        shutil.copyfileobj(src, dst, COPY_CHUNK)
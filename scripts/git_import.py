@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Git Fast-Import Backend
+
+Commits a generation plan straight into a bare git repository by streaming
+it to `git fast-import`, without writing a working tree or hashing the files
+a second time through `git add`. The first import creates the branch with an
+initial commit; later imports add a commit on top of it that only carries the
+files whose content or mode changed.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from generation_plan import COPY_CHUNK, FlushStats, GenerationPlan, PlanOp, hash_file
+
+DEFAULT_BRANCH = 'main'
+DEFAULT_MESSAGE = 'Generate project structure with Automanic'
+DEFAULT_IDENTITY = ('Automanic', 'automanic@localhost')
+
+FILE_MODE = '100644'
+EXECUTABLE_MODE = '100755'
+
+def _git_mode(op: PlanOp) -> str:
+    return EXECUTABLE_MODE if op.mode is not None and op.mode & 0o111 else FILE_MODE
+
+def _blob_id(op: PlanOp) -> str:
+    """Object id git assigns to a blob with a planned file's content"""
+    digest = hashlib.sha1(b'blob %d\0' % op.size)
+    if op.data is not None:
+        digest.update(op.data)
+        return digest.hexdigest()
+    return hash_file(op.source, digest).hexdigest()
+
+def _quote_path(path: str) -> bytes:
+    """Path as fast-import expects it, C-style quoted when it contains special characters"""
+    if not any(char in path for char in '"\\\n') and not path.startswith(' '):
+        return path.encode('utf-8')
+    escaped = path.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return b'"' + escaped.encode('utf-8') + b'"'
+
+def _identity() -> bytes:
+    """Author/committer line: GIT_AUTHOR_NAME/EMAIL or Automanic, at SOURCE_DATE_EPOCH or now"""
+    name = os.environ.get('GIT_AUTHOR_NAME') or DEFAULT_IDENTITY[0]
+    email = os.environ.get('GIT_AUTHOR_EMAIL') or DEFAULT_IDENTITY[1]
+    timestamp = int(os.environ.get('SOURCE_DATE_EPOCH') or time.time())
+    return f"{name} <{email}> {timestamp} +0000".encode('utf-8')
+
+class BareRepository:
+    """A branch of a bare repository that generation plans are committed to"""
+    
+    def __init__(self, git_dir: Union[str, Path], branch: str = DEFAULT_BRANCH):
+        self.git_dir = Path(git_dir)
+        self.ref = branch if branch.startswith('refs/') else f"refs/heads/{branch}"
+        self._head: Optional[str] = None
+        self._files: Optional[Dict[str, Tuple[str, str]]] = None
+        
+    def _git(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        result = subprocess.run(['git', '--git-dir', str(self.git_dir), *args], capture_output=True)
+        if check and result.returncode != 0:
+            raise Exception(f"git {' '.join(args)} failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result
+        
+    def init(self):
+        """Create the bare repository, with HEAD on this branch, if it does not exist yet"""
+        if (self.git_dir / 'HEAD').exists():
+            return
+        self.git_dir.mkdir(parents=True, exist_ok=True)
+        self._git('init', '--bare', '--quiet')
+        self._git('symbolic-ref', 'HEAD', self.ref)
+        
+    def head(self) -> Optional[str]:
+        """Commit the branch points to, or None if it does not exist yet"""
+        if self._head is None and (self.git_dir / 'HEAD').exists():
+            result = self._git('rev-parse', '--verify', '--quiet', f"{self.ref}^{{commit}}", check=False)
+            self._head = result.stdout.decode('ascii').strip() or None
+        return self._head
+        
+    def files(self) -> Dict[str, Tuple[str, str]]:
+        """Mode and blob id of every file on the branch"""
+        if self._files is None:
+            self._files = {}
+            head = self.head()
+            if head is not None:
+                listing = self._git('ls-tree', '-r', '-z', '--full-tree', head).stdout
+                for entry in listing.split(b'\0'):
+                    if not entry:
+                        continue
+                    info, path = entry.split(b'\t', 1)
+                    mode, kind, object_id = info.decode('ascii').split()
+                    if kind == 'blob':
+                        self._files[path.decode('utf-8')] = (mode, object_id)
+        return self._files
+        
+    def commit(self, plan: GenerationPlan, message: str = DEFAULT_MESSAGE) -> FlushStats:
+        """Commit every planned file whose content or mode differs from the branch; no commit if none does"""
+        self.init()
+        head = self.head()
+        existing = self.files()
+        
+        stats = FlushStats()
+        changes: List[Tuple[str, PlanOp, str]] = []
+        for path, op in plan.files().items():
+            mode = _git_mode(op)
+            current = existing.get(path)
+            if current is not None and current == (mode, _blob_id(op)):
+                stats.skipped += 1
+                continue
+            stats.written += 1
+            stats.changed += current is not None
+            changes.append((path, op, mode))
+            
+        # Git does not track directories, so the plan's empty directories are not committed
+        if changes:
+            self._fast_import(head, changes, message)
+            self._head = None
+            self._files = None
+        return stats
+        
+    def _fast_import(self, parent: Optional[str], changes: List[Tuple[str, PlanOp, str]], message: str):
+        """Stream one commit to git fast-import"""
+        process = subprocess.Popen(
+            ['git', '--git-dir', str(self.git_dir), 'fast-import', '--quiet', '--done'],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        identity = _identity()
+        message_bytes = message.encode('utf-8')
+        stream = process.stdin
+        try:
+            stream.write(b'commit %s\nauthor %s\ncommitter %s\ndata %d\n%s\n'
+                         % (self.ref.encode('utf-8'), identity, identity, len(message_bytes), message_bytes))
+            if parent is not None:
+                # An explicit parent makes fast-import refuse to move a branch that changed meanwhile
+                stream.write(b'from %s\n' % parent.encode('ascii'))
+            for path, op, mode in changes:
+                stream.write(b'M %s inline %s\ndata %d\n' % (mode.encode('ascii'), _quote_path(path), op.size))
+                with op.open() as content:
+                    shutil.copyfileobj(content, stream, COPY_CHUNK)
+                stream.write(b'\n')
+            stream.write(b'\ndone\n')
+            stream.close()
+        except BrokenPipeError:
+            pass
+        error = process.stderr.read().decode('utf-8', 'replace').strip()
+        if process.wait() != 0:
+            raise Exception(f"git fast-import failed for {self.git_dir}: {error}")
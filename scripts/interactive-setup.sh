@@ -9,6 +9,8 @@ import os
 import sys
 from typing import Dict, List, Tuple
 
+import compatibility
+
 class InteractiveSetup:
     """Interactive setup wizard for Automanic"""
     
@@ -172,7 +174,7 @@ class InteractiveSetup:
         try:
             # Collect configuration
             for key, question, options in self.questions:
-                self.config[key] = self._ask_question(key, question, options)
+                self.config[key] = self._ask_question(key, question, self._possible_options(key, options))
                 
             # Show summary
             self._show_summary()
@@ -189,6 +191,16 @@ class InteractiveSetup:
             print(f"\n❌ Error during setup: {e}")
             sys.exit(1)
             
+    def _possible_options(self, key: str, options: List[str]) -> List[str]:
+        """Options that are compatible with the answers given so far"""
+        allowed = set(compatibility.allowed_values(key, self.config))
+        possible = [option for option in options if option.split(' - ')[0] in allowed]
+        if not possible:
+            return options
+        if len(possible) < len(options):
+            print(f"\nℹ️  {len(options) - len(possible)} option(s) hidden as incompatible with earlier answers")
+        return possible
+        
     def _ask_question(self, key: str, question: str, options: List[str]) -> str:
         """Ask a single configuration question"""
         print(f"\n📋 {question}")
@@ -294,7 +306,7 @@ Please read [CONTRIBUTING.md](CONTRIBUTING.md) for details on our code of conduc
 
 This project is licensed under the {self.config["LICENSE_TYPE"]} License - see the [LICENSE](LICENSE) file for details.
 '''
-
+        
         with open('README.md', 'w') as f:
             f.write(readme_content)
             
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Generation Manifest
+
+Records the content hash of every generated file in .automanic/manifest so
+regeneration can skip files whose bytes are already on disk. Copied asset
+files also record the stat signature of their source, so an unchanged copy
+is skipped without hashing the asset.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+MANIFEST_PATH = '.automanic/manifest'
+MANIFEST_VERSION = 1
+
+class Manifest:
+    """Content hashes and stat signatures of generated files under an output root"""
+    
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.path = self.root / MANIFEST_PATH
+        self.entries: Dict[str, Dict[str, Union[str, int, list]]] = {}
+        self.dirty = False
+        
+    @classmethod
+    def load(cls, root: Union[str, Path]) -> 'Manifest':
+        """Load the manifest of an output root; a missing or unreadable manifest is empty"""
+        manifest = cls(root)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                manifest.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return manifest
+        
+    def matches(self, path: str, digest: str, st: os.stat_result) -> bool:
+        """Whether the file on disk is known to hold exactly the given content"""
+        entry = self.entries.get(path)
+        return (
+            entry is not None
+            and entry['sha256'] == digest
+            and entry['size'] == st.st_size
+            and entry['mtime_ns'] == st.st_mtime_ns
+        )
+        
+    def copied(self, path: str, source: List[Union[str, int]], st: os.stat_result) -> bool:
+        """Whether the file on disk is known to be an unmodified copy of a source with the given signature"""
+        entry = self.entries.get(path)
+        return (
+            entry is not None
+            and entry.get('source') == source
+            and entry['size'] == st.st_size
+            and entry['mtime_ns'] == st.st_mtime_ns
+        )
+        
+    def record(self, path: str, digest: str, st: os.stat_result, source: Optional[List[Union[str, int]]] = None):
+        """Record the hash and stat signature of a file that now holds the given content"""
+        entry = {'sha256': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        if source is not None:
+            entry['source'] = source
+        if self.entries.get(path) != entry:
+            self.entries[path] = entry
+            self.dirty = True
+            
+    def save(self):
+        """Atomically write the manifest if it changed"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+README Parse Cache
+
+Optional on-disk cache of validated README configurations, keyed by path,
+size, mtime and content hash. An unchanged README is answered from a stat()
+call without reading the file. The cache is a SQLite database in WAL mode, so
+many processes can read it concurrently; it is capped in entries and evicts
+the least recently used ones.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Optional, Tuple, Union
+
+import compatibility
+import readme_config
+
+CACHE_ENV = 'AUTOMANIC_PARSE_CACHE'
+DEFAULT_MAX_ENTRIES = 10000
+# Files modified this close to the moment they were cached may change again within the
+# same mtime tick, so their content hash is re-checked (as git does for "racily clean" files)
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+# Cached configs are only valid for the field tables and compatibility rules that validated them
+SCHEMA = hashlib.sha256(json.dumps([readme_config.REQUIRED_FIELDS, readme_config.VALID_VALUES,
+                                    compatibility.rules_signature()], sort_keys=True).encode('utf-8')).hexdigest()
+
+def default_cache_path() -> Path:
+    """Cache database location under the user cache directory"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / 'automanic' / 'parse-cache.sqlite'
+
+class _HashingReader:
+    """Binary stream wrapper that hashes everything read through it"""
+    
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+        
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.digest.update(data)
+        return data
+        
+    def drain(self, chunk_size: int = readme_config.CHUNK_SIZE):
+        """Hash the rest of the stream"""
+        while self.read(chunk_size):
+            pass
+
+def hash_and_extract(readme_path: Union[str, Path]) -> Tuple[str, Optional[str], os.stat_result]:
+    """Content hash and config block of a README in a single streaming pass"""
+    with open(readme_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        reader = _HashingReader(f)
+        config_block = readme_config.scan_config_block(reader)
+        reader.drain()
+    return reader.digest.hexdigest(), config_block, st
+
+class ParseCache:
+    """Persistent cache of validated configs, shared between processes"""
+    
+    def __init__(self, path: Optional[Union[str, Path]] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        
+    @classmethod
+    def from_environment(cls) -> Optional['ParseCache']:
+        """Cache configured through AUTOMANIC_PARSE_CACHE ('1' for the default location, or a path)"""
+        value = os.environ.get(CACHE_ENV, '').strip()
+        if not value or value == '0':
+            return None
+        return cls(None if value == '1' else value)
+        
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.path), timeout=5, isolation_level=None, check_same_thread=False)
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute('PRAGMA synchronous=NORMAL')
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS entries ('
+                    ' path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, cached_ns INTEGER,'
+                    ' sha256 TEXT, schema TEXT, config TEXT, last_used REAL)'
+                )
+                connection.execute('CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)')
+                self._connection = connection
+            except (OSError, sqlite3.Error):
+                return None
+        return self._connection
+        
+    def _entry(self, key: str) -> Optional[Tuple]:
+        connection = self._connect()
+        if connection is None:
+            return None
+        try:
+            return connection.execute(
+                'SELECT size, mtime_ns, cached_ns, sha256, schema, config FROM entries WHERE path = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+            
+    def _touch(self, key: str):
+        try:
+            self._connection.execute('UPDATE entries SET last_used = ? WHERE path = ?', (time.time(), key))
+        except sqlite3.Error:
+            pass
+            
+    def _store(self, key: str, st: os.stat_result, digest: str, config: Dict[str, str]):
+        """Record a validated config, evicting the least recently used entries over the cap"""
+        connection = self._connect()
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, st.st_size, st.st_mtime_ns, time.time_ns(), digest, SCHEMA, json.dumps(config), time.time()),
+            )
+            excess = connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0] - self.max_entries
+            if excess > 0:
+                connection.execute(
+                    'DELETE FROM entries WHERE path IN (SELECT path FROM entries ORDER BY last_used LIMIT ?)', (excess,)
+                )
+        except sqlite3.Error:
+            pass
+            
+    def lookup(self, readme_path: Union[str, Path], st: os.stat_result) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+        """Config cached for an unchanged file, judged by stat alone, plus the cached content hash"""
+        key = os.path.abspath(readme_path)
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                return None, None
+            size, mtime_ns, cached_ns, digest, schema, config = entry
+            if schema != SCHEMA:
+                return None, None
+            racy = mtime_ns >= cached_ns - RACY_WINDOW_NS
+            if size == st.st_size and mtime_ns == st.st_mtime_ns and not racy:
+                self._touch(key)
+                self.hits += 1
+                return json.loads(config), digest
+            return None, digest
+            
+    def get_or_parse(self, readme_path: Union[str, Path],
+                     parse_block: Callable[[Optional[str]], Dict[str, str]]) -> Dict[str, str]:
+        """Return the validated config of a README, parsing it with parse_block only if it changed"""
+        st = os.stat(readme_path)
+        config, cached_digest = self.lookup(readme_path, st)
+        if config is not None:
+            return config
+            
+        digest, config_block, st = hash_and_extract(readme_path)
+        key = os.path.abspath(readme_path)
+        with self._lock:
+            if cached_digest == digest:
+                # Touched but unchanged: refresh the stat signature and reuse the config
+                entry = self._entry(key)
+                if entry is not None:
+                    config = json.loads(entry[5])
+                    self._store(key, st, digest, config)
+                    self.hits += 1
+                    return config
+            self.misses += 1
+            
+        config = parse_block(config_block)
+        with self._lock:
+            self._store(key, st, digest, config)
+        return config
+        
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Automanic Setup Pipeline
+
+Runs every setup stage inside one interpreter, sharing a single parsed configuration.
+"""
+
+import contextlib
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Union
+
+import fingerprint
+import readme_config
+from generation_plan import Collision, FlushStats, GenerationPlan, merge_plans
+from manifest import Manifest
+from parse_cache import ParseCache
+from plan_cache import plan_cache
+from profiler import Profiler
+from template_registry import asset_files
+
+__version__ = '0.1.0'
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+_load_lock = threading.RLock()
+
+# Every file whose content shapes the generated output: the generators and templates,
+# the config parsing and compatibility rules, the stage order and precedence, and how
+# plans are cached, merged and written
+TEMPLATE_SOURCES = (
+    'generate-structure.py',
+    'setup-workflows.py',
+    'create-structure.py',
+    'setup-dev-env.py',
+    'template_registry.py',
+    'readme_config.py',
+    'compatibility.py',
+    'generation_plan.py',
+    'plan_cache.py',
+    'pipeline.py',
+)
+
+# Setup stages in run order: name, script, generator class and progress message
+STAGES = (
+    ('structure', 'generate-structure.py', 'StructureGenerator', "🏗️  Generating project structure..."),
+    ('workflows', 'setup-workflows.py', 'WorkflowGenerator', "🏗️  Setting up GitHub workflows..."),
+    ('project', 'create-structure.py', 'ProjectStructureCreator', "📁 Creating project structure..."),
+    ('dev-env', 'setup-dev-env.py', 'DevEnvironmentSetup', "🔧 Configuring development environment..."),
+)
+
+# When stages plan the same file, the stage listed first wins. This keeps the content
+# each file had when every stage wrote its own files and later stages overwrote earlier ones.
+PRECEDENCE = ('dev-env', 'project', 'workflows', 'structure')
+
+# Stages whose failure is reported without aborting the run (the next run then reruns every stage)
+OPTIONAL_STAGES = ('workflows',)
+
+def load_script(filename: str) -> ModuleType:
+    """Import a (hyphenated) script from the scripts directory as a module"""
+    module_name = Path(filename).stem.replace('-', '_')
+    with _load_lock:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
+            
+        spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        return module
+
+class SetupPipeline:
+    """Parses the README configuration once and runs all setup stages with it"""
+    
+    def __init__(self, config_file: str = 'README.md', output_root: Optional[Union[str, Path]] = None,
+                 profiler: Optional[Profiler] = None):
+        self.config_file = config_file
+        self.config: Dict[str, str] = {}
+        self.output_root = Path(output_root) if output_root is not None else Path.cwd()
+        self.profiler = profiler
+        self.collisions: List[Collision] = []
+        self.failed_stages: List[str] = []
+        
+    def compute_fingerprint(self) -> Optional[str]:
+        """Fingerprint the config block, tool version and template set without importing any generator"""
+        try:
+            config_block = readme_config.read_config_block(self.config_file)
+        except OSError:
+            return None
+        if config_block is None:
+            return None
+        config = readme_config.parse_config_block(config_block)
+        assets = [(path, source) for path, source, _ in asset_files(config.get('PROJECT_TYPE', ''))]
+        return fingerprint.compute_fingerprint(config, __version__, [SCRIPTS_DIR / name for name in TEMPLATE_SOURCES], assets)
+        
+    def parse_config(self) -> Dict[str, str]:
+        """Parse and validate the README configuration block"""
+        generate_structure = load_script('generate-structure.py')
+        self.config = generate_structure.AutomanicConfig(cache=ParseCache.from_environment()).parse_readme(self.config_file)
+        return self.config
+        
+    def run(self, dry_run: bool = False, force: bool = False) -> FlushStats:
+        """Plan the structure, workflow, project and dev-env stages, then write their merged plan once"""
+        # A profiled run always executes the stages it is asked to measure
+        run_fingerprint = None if dry_run or self.profiler is not None else self.compute_fingerprint()
+        if run_fingerprint and not force and fingerprint.is_up_to_date(self.output_root, run_fingerprint):
+            print("⚡ Configuration, tool version and templates unchanged - all stages are up to date")
+            return FlushStats()
+            
+        print(f"📋 Parsing {self.config_file} configuration...")
+        with self._stage('parse'):
+            config = self.parse_config()
+            
+        print("✅ Configuration parsed successfully:")
+        for key, value in config.items():
+            print(f"   {key}: {value}")
+        print()
+        
+        plan = self.build_plan(config)
+        if self.collisions:
+            print(f"🔀 {len(self.collisions)} file(s) planned by more than one stage (precedence: {' > '.join(PRECEDENCE)}):")
+            for collision in self.collisions:
+                print(f"   • {collision.describe()}")
+                
+        if dry_run:
+            plan.print_dry_run()
+            return FlushStats()
+            
+        manifest = Manifest.load(self.output_root)
+        foreign = plan.foreign_files(self.output_root, manifest)
+        if foreign:
+            print(f"⚠️  Replacing {len(foreign)} existing file(s) Automanic did not generate: {', '.join(foreign)}")
+        with self._stage('write'):
+            stats = plan.flush(self.output_root, manifest=manifest, profiler=self.profiler)
+        manifest.save()
+        
+        print(f"📊 Run summary: {stats.written} written, {stats.changed} changed, {stats.skipped} skipped")
+        print(plan_cache.summary())
+        
+        # Only a complete run may short-circuit the next one
+        if run_fingerprint and not self.failed_stages:
+            fingerprint.write_fingerprint(self.output_root, run_fingerprint)
+        return stats
+        
+    def build_plan(self, config: Optional[Dict[str, str]] = None) -> GenerationPlan:
+        """Merge every stage's plan without touching the filesystem; the README config is parsed unless given"""
+        if config is None:
+            with self._stage('parse'):
+                config = self.parse_config()
+        else:
+            self.config = config
+            
+        stage_plans = []
+        self.failed_stages = []
+        for name, script, class_name, message in STAGES:
+            print(message)
+            try:
+                with self._stage(name):
+                    generator = getattr(load_script(script), class_name)(config=config, profiler=self.profiler)
+                    stage_plans.append((name, generator.current_plan()))
+            except Exception as e:
+                if name not in OPTIONAL_STAGES:
+                    raise
+                print(f"❌ Error in {name} stage: {e}")
+                self.failed_stages.append(name)
+                
+        plan, self.collisions = merge_plans(stage_plans, PRECEDENCE)
+        if self.profiler is not None:
+            file_stages = {}
+            for name, stage_plan in stage_plans:
+                for path in stage_plan.files():
+                    file_stages.setdefault(path, name)
+            file_stages.update((collision.path, collision.winner) for collision in self.collisions)
+            self.profiler.assign_files(file_stages)
+        return plan
+        
+    def _stage(self, name: str):
+        """Profile a setup stage when a profiler is attached"""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(name)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Generation Plan Cache
+
+Generators declare which config fields each of their outputs depends on. Two
+configs that agree on those fields produce the same plan, so whole plans are
+memoized per equivalence class and reused instead of being rebuilt.
+PlanGenerator is the base of the setup generators, which only declare their
+stage name, OUTPUT_FIELDS and build_plan.
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+from generation_plan import FlushStats, GenerationPlan
+from profiler import Profiler
+
+DEFAULT_CACHE_SIZE = 256
+
+def plan_fields(output_fields: Dict[str, Iterable[str]]) -> Tuple[str, ...]:
+    """All fields a plan depends on, given the fields declared for each output"""
+    return tuple(sorted({field for fields in output_fields.values() for field in fields}))
+
+def equivalence_key(generator: str, fields: Iterable[str], config: Dict[str, str]) -> Tuple[Optional[str], ...]:
+    """Key shared by every config that yields the same plan for a generator"""
+    return (generator,) + tuple(config.get(field) for field in fields)
+
+class PlanCache:
+    """LRU cache of generation plans keyed by equivalence class"""
+    
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: 'OrderedDict[Tuple[Optional[str], ...], GenerationPlan]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get_or_build(self, generator: str, fields: Tuple[str, ...], config: Dict[str, str],
+                     build: Callable[[Dict[str, str]], GenerationPlan]) -> GenerationPlan:
+        """Return the (shared, read-only) plan for the config's class, building it on a miss"""
+        key = equivalence_key(generator, fields, config)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+            
+        # Build from the declared fields only, so an undeclared dependency cannot leak into a shared plan
+        plan = build({field: config[field] for field in fields if field in config})
+        with self._lock:
+            self._plans[key] = plan
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+        
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters of the cache"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._plans)}
+            
+    def summary(self) -> str:
+        """One line hit rate summary"""
+        stats = self.stats()
+        lookups = stats['hits'] + stats['misses']
+        rate = 100.0 * stats['hits'] / lookups if lookups else 0.0
+        return f"🧠 Plan cache: {stats['hits']} hits, {stats['misses']} misses ({rate:.1f}% hit rate)"
+        
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+plan_cache = PlanCache()
+
+class PlanGenerator:
+    """Base of the setup generators: plans are cached per config class and written in one flush"""
+    
+    # Name the generator's plans are cached under
+    STAGE = ''
+    # Config fields each output depends on; plans are cached per distinct combination
+    OUTPUT_FIELDS: Dict[str, Tuple[str, ...]] = {}
+    PLAN_FIELDS: Tuple[str, ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.PLAN_FIELDS = plan_fields(cls.OUTPUT_FIELDS)
+        
+    def __init__(self, config: Optional[Dict[str, str]] = None, output_root: Optional[Union[str, Path]] = None,
+                 profiler: Optional[Profiler] = None):
+        self.config = config if config is not None else {}
+        self.base_path = Path(output_root) if output_root is not None else Path.cwd()
+        self.plan = GenerationPlan()
+        self.profiler = profiler
+        
+    def build_plan(self) -> GenerationPlan:
+        """Build the generation plan without touching the filesystem"""
+        raise NotImplementedError
+        
+    def cached_plan(self) -> GenerationPlan:
+        """Reuse the plan of an equivalent config, building it only once per class"""
+        self.plan = plan_cache.get_or_build(self.STAGE, self.PLAN_FIELDS, self.config,
+                                            lambda config: type(self)(config=config).build_plan())
+        return self.plan
+        
+    def current_plan(self) -> GenerationPlan:
+        """The plan for this config; profiled runs always build it so that phase timings are real"""
+        return self.build_plan() if self.profiler is not None else self.cached_plan()
+        
+    def write_plan(self, dry_run: bool = False, done_message: str = '') -> FlushStats:
+        """Write the planned files under the output root, or only print them on a dry run"""
+        self.current_plan()
+        
+        if dry_run:
+            self.plan.print_dry_run()
+            return FlushStats()
+            
+        stats = self.plan.flush(self.base_path, profiler=self.profiler)
+        print(stats.summary())
+        if done_message:
+            print(done_message)
+        return stats
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Generation Profiler
+
+Records wall time, file count and bytes for every generation phase and every
+flushed file. When several stages plan the same file, its write is charged to
+the stage whose content is written. Results can be written as a Chrome trace-event file (viewable in
+chrome://tracing or Perfetto) or printed as a plain-text summary table, and
+callbacks receive each event as it completes.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from generation_plan import MKDIR
+
+TRACE_PATH = '.automanic/trace.json'
+
+PHASE = 'phase'
+STAGE = 'stage'
+FILE = 'file'
+
+class ProfileEvent:
+    """A completed phase, stage or file write"""
+    
+    __slots__ = ('kind', 'name', 'start', 'duration', 'files', 'bytes', 'status', 'paths', 'stage', 'thread')
+    
+    def __init__(self, kind: str, name: str, start: float, duration: float, files: int = 0, bytes: int = 0,
+                 status: Optional[str] = None, paths: Tuple[str, ...] = (), stage: Optional[str] = None):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.files = files
+        self.bytes = bytes
+        self.status = status
+        self.paths = paths
+        # Enclosing stage of a phase, or the stage whose content a flushed file holds
+        self.stage = stage
+        self.thread = threading.get_ident()
+        
+    def __repr__(self) -> str:
+        return f"ProfileEvent({self.kind}, {self.name!r}, {self.duration * 1000:.3f} ms, {self.files} files, {self.bytes} bytes)"
+
+class Profiler:
+    """Collects profile events and hands each one to the registered callbacks"""
+    
+    def __init__(self, callback: Optional[Callable[[ProfileEvent], None]] = None):
+        self.origin = time.perf_counter()
+        self.events: List[ProfileEvent] = []
+        self.callbacks: List[Callable[[ProfileEvent], None]] = [callback] if callback else []
+        # Stage that wins each planned file, once the stage plans are merged
+        self.file_stages: Dict[str, str] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        
+    def add_callback(self, callback: Callable[[ProfileEvent], None]):
+        """Call the given function with every event recorded from now on"""
+        self.callbacks.append(callback)
+        
+    def _emit(self, event: ProfileEvent):
+        with self._lock:
+            self.events.append(event)
+        for callback in self.callbacks:
+            callback(event)
+            
+    @contextlib.contextmanager
+    def phase(self, name: str, plan=None, kind: str = PHASE):
+        """Time a block; files planned into the given plan meanwhile are attributed to it"""
+        first_op = len(plan.ops) if plan is not None else 0
+        stage = getattr(self._local, 'stage', None)
+        if kind == STAGE:
+            self._local.stage = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if kind == STAGE:
+                self._local.stage = stage
+            ops = [op for op in plan.ops[first_op:] if op.kind != MKDIR] if plan is not None else []
+            self._emit(ProfileEvent(kind, name, start, duration, len(ops), sum(op.size for op in ops),
+                                    paths=tuple(op.path for op in ops), stage=name if kind == STAGE else stage))
+                                    
+    def stage(self, name: str):
+        """Time a whole setup stage"""
+        return self.phase(name, kind=STAGE)
+        
+    def assign_files(self, file_stages: Dict[str, str]):
+        """Charge the writes of these files to the given stages, which won them in the merged plan"""
+        self.file_stages.update(file_stages)
+        
+    def record_file(self, path: str, start: float, duration: float, bytes_written: int, status: str):
+        """Record the flush of a single file"""
+        self._emit(ProfileEvent(FILE, path, start, duration, 1, bytes_written, status, stage=self.file_stages.get(path)))
+        
+    def chrome_trace(self) -> Dict:
+        """Events in the Chrome trace-event format"""
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            args = {'files': event.files, 'bytes': event.bytes}
+            if event.status:
+                args['status'] = event.status
+            if event.kind == FILE and event.stage:
+                args['stage'] = event.stage
+            trace_events.append({
+                'name': event.name,
+                'cat': event.kind,
+                'ph': 'X',
+                'ts': round((event.start - self.origin) * 1e6, 3),
+                'dur': round(event.duration * 1e6, 3),
+                'pid': pid,
+                'tid': event.thread,
+                'args': args,
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+        
+    def write_chrome_trace(self, path: Union[str, Path]):
+        """Write the Chrome trace-event JSON file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+            
+    def summary_table(self, slowest_files: int = 5) -> str:
+        """Plain-text table of phase timings, planned files and flushed bytes"""
+        file_events = [event for event in self.events if event.kind == FILE]
+        flushed = {event.name: event for event in file_events}
+        
+        rows = [('Phase', 'Wall ms', 'Files', 'Bytes', 'Write ms', 'Written')]
+        for event in sorted(self.events, key=lambda e: e.start):
+            if event.kind == FILE:
+                continue
+            if event.kind == STAGE:
+                writes = [write for write in file_events if write.stage == event.name]
+            else:
+                # A file another stage won is written with that stage's content, not this phase's
+                writes = [flushed[path] for path in event.paths
+                          if path in flushed and flushed[path].stage in (None, event.stage)]
+            name = event.name if event.kind == PHASE else f"[{event.name}]"
+            rows.append((
+                name,
+                f"{event.duration * 1000:.2f}",
+                str(event.files),
+                str(event.bytes),
+                f"{sum(write.duration for write in writes) * 1000:.2f}",
+                str(sum(write.bytes for write in writes)),
+            ))
+        rows.append((
+            'flush (all files)',
+            '',
+            str(len(file_events)),
+            '',
+            f"{sum(event.duration for event in file_events) * 1000:.2f}",
+            str(sum(event.bytes for event in file_events)),
+        ))
+        
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = []
+        for index, row in enumerate(rows):
+            cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+            lines.append('  '.join(cells))
+            if index == 0:
+                lines.append('  '.join('-' * width for width in widths))
+                
+        if file_events and slowest_files:
+            lines.append('')
+            lines.append("Slowest files:")
+            for event in sorted(file_events, key=lambda e: e.duration, reverse=True)[:slowest_files]:
+                lines.append(f"  {event.duration * 1000:8.3f} ms  {event.bytes:>8} bytes  {event.status:<8} {event.name}")
+        return '\n'.join(lines)
+
+def print_report(profiler: Profiler, trace_path: Union[str, Path]):
+    """Write the Chrome trace and print the summary table"""
+    profiler.write_chrome_trace(trace_path)
+    print()
+    print("⏱️  Profile:")
+    print(profiler.summary_table())
+    print(f"⏱️  Chrome trace written to {trace_path}")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+README Configuration Block
+
+Extraction, tokenizing and validation of the AUTOMANIC-CONFIG block from
+README.md, kept free of generator imports so it can be used by lightweight callers. Files are scanned
+in fixed-size chunks (or through mmap when large) and reading stops at the end
+marker, or once the block outgrows MAX_BLOCK_SIZE, so memory use does not grow
+with the size of the README.
+"""
+
+import mmap
+import os
+import re
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+CONFIG_START = '<!-- AUTOMANIC-CONFIG-START -->'
+CONFIG_END = '<!-- AUTOMANIC-CONFIG-END -->'
+
+_CONFIG_PATTERN = re.compile(re.escape(CONFIG_START) + r'(.*?)' + re.escape(CONFIG_END), re.DOTALL)
+
+_START_BYTES = CONFIG_START.encode('ascii')
+_END_BYTES = CONFIG_END.encode('ascii')
+
+REQUIRED_FIELDS = [
+    'PROJECT_TYPE', 'LANGUAGE', 'FRAMEWORK', 'BUILD_SYSTEM',
+    'DATABASE', 'DEPLOYMENT', 'CI_CD', 'TESTING', 'LICENSE_TYPE', 'VISIBILITY'
+]
+
+VALID_VALUES = {
+    'PROJECT_TYPE': ['web-app', 'cli-tool', 'library', 'api', 'mobile-app', 'desktop-app', 'data-science', 'documentation'],
+    'LANGUAGE': ['python', 'javascript', 'typescript', 'go', 'rust', 'java', 'cpp', 'c', 'php', 'ruby', 'swift', 'kotlin', 'scala', 'r'],
+    'FRAMEWORK': ['react', 'vue', 'angular', 'express', 'fastapi', 'django', 'spring', 'gin', 'actix', 'electron', 'flutter', 'pytorch', 'tensorflow', 'none'],
+    'BUILD_SYSTEM': ['npm', 'yarn', 'pip', 'cargo', 'maven', 'gradle', 'make', 'cmake', 'none'],
+    'DATABASE': ['postgresql', 'mysql', 'mongodb', 'redis', 'sqlite', 'none'],
+    'DEPLOYMENT': ['docker', 'kubernetes', 'aws', 'gcp', 'azure', 'vercel', 'netlify', 'heroku', 'none'],
+    'CI_CD': ['github-actions', 'jenkins', 'gitlab-ci', 'circleci', 'travis-ci', 'none'],
+    'TESTING': ['jest', 'pytest', 'cargo-test', 'junit', 'go-test', 'rspec', 'none'],
+    'LICENSE_TYPE': ['mit', 'apache-2.0', 'gpl-v3', 'bsd-3-clause', 'unlicense', 'proprietary'],
+    'VISIBILITY': ['public', 'private']
+}
+
+# Constant-time membership tables for validation
+VALID_VALUE_SETS = {field: frozenset(values) for field, values in VALID_VALUES.items()}
+
+CHUNK_SIZE = 64 * 1024
+# Files at least this large are searched through mmap instead of chunked reads
+MMAP_THRESHOLD = 1024 * 1024
+# Longest config block accepted; a start marker without an end marker then stops reading here
+MAX_BLOCK_SIZE = 4 * 1024 * 1024
+
+def extract_config_block(content: str) -> Optional[str]:
+    """Return the text between the config markers, or None if there is no block"""
+    match = _CONFIG_PATTERN.search(content)
+    return match.group(1) if match else None
+
+def tokenize_config_block(config_block: str) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+    """Yield (key, alternatives) for `KEY: value` and `KEY: [a|b|c]` lines in one pass"""
+    for line in config_block.split('\n'):
+        line = line.strip()
+        if ':' not in line or line.startswith('<!--'):
+            continue
+        key, value = line.split(':', 1)
+        value = value.strip(' []')
+        if '|' in value:
+            yield key.strip(), tuple(option.strip() for option in value.split('|'))
+        else:
+            yield key.strip(), (value,)
+
+def parse_config_block(config_block: str, fields: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Parse KEY: value lines of a config block, optionally keeping only the given fields"""
+    wanted = frozenset(fields) if fields is not None else None
+    config = {}
+    for key, alternatives in tokenize_config_block(config_block):
+        if wanted is None or key in wanted:
+            config[key] = '|'.join(alternatives)
+    return config
+
+def parse_config_options(config_block: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Tuple[str, ...]]:
+    """Parse a config block keeping every alternative of `KEY: [a|b|c]` entries"""
+    wanted = frozenset(fields) if fields is not None else None
+    return {key: alternatives for key, alternatives in tokenize_config_block(config_block)
+            if wanted is None or key in wanted}
+
+def validate_config(config: Dict[str, str]):
+    """Check that every required field is present and every known field has a valid value"""
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in config]
+    if missing_fields:
+        raise Exception(f"Missing required fields: {', '.join(missing_fields)}")
+        
+    for key, value in config.items():
+        allowed = VALID_VALUE_SETS.get(key)
+        if allowed is not None and value not in allowed:
+            raise Exception(f"Invalid value '{value}' for field '{key}'. Valid values: {', '.join(VALID_VALUES[key])}")
+
+def _decode_block(block: bytes) -> str:
+    """Decode a raw block with the newline handling of text-mode reads"""
+    return block.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+def extract_config_block_bytes(data: Union[bytes, mmap.mmap]) -> Optional[str]:
+    """Return the config block of raw README bytes, or None if there is no block"""
+    start = data.find(_START_BYTES)
+    if start < 0:
+        return None
+    start += len(_START_BYTES)
+    end = data.find(_END_BYTES, start, start + MAX_BLOCK_SIZE + len(_END_BYTES))
+    if end < 0:
+        return None
+    return _decode_block(data[start:end])
+
+def scan_config_block(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Optional[str]:
+    """Read a binary stream chunk by chunk until the config block is complete"""
+    # Find the start marker, keeping just enough tail to catch a marker split across chunks
+    buffer = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return None
+        buffer += chunk
+        start = buffer.find(_START_BYTES)
+        if start >= 0:
+            buffer = buffer[start + len(_START_BYTES):]
+            break
+        buffer = buffer[-(len(_START_BYTES) - 1):]
+        
+    # Collect the block until the end marker; nothing after it is read
+    parts = []
+    collected = 0
+    keep = len(_END_BYTES) - 1
+    while True:
+        end = buffer.find(_END_BYTES)
+        if end >= 0:
+            if collected + end > MAX_BLOCK_SIZE:
+                return None
+            parts.append(buffer[:end])
+            return _decode_block(b''.join(parts))
+        if len(buffer) > keep:
+            parts.append(buffer[:-keep])
+            collected += len(buffer) - keep
+            buffer = buffer[-keep:]
+        if collected > MAX_BLOCK_SIZE:
+            return None
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return None
+        buffer += chunk
+
+def read_config_block(readme_path: str) -> Optional[str]:
+    """Read a README file and return its config block"""
+    with open(readme_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None
+            if mapped is not None:
+                with mapped:
+                    return extract_config_block_bytes(mapped)
+        return scan_config_block(f)
+
+def parse_text(content: str, fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, str]]:
+    """Parse the config block of README text, or return None if there is no block"""
+    config_block = extract_config_block(content)
+    return parse_config_block(config_block, fields) if config_block is not None else None
+
+def parse_bytes(data: bytes, fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, str]]:
+    """Parse the config block of raw README bytes, or return None if there is no block"""
+    config_block = extract_config_block_bytes(data)
+    return parse_config_block(config_block, fields) if config_block is not None else None
+
+def format_config_block(config: Dict[str, str]) -> str:
+    """Render a config dict as a complete AUTOMANIC-CONFIG block"""
+    lines = [CONFIG_START]
+    lines.extend(f"{key}: {value}" for key, value in config.items())
+    lines.append(CONFIG_END)
+    return '\n'.join(lines) + '\n'
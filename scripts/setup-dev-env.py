@@ -5,20 +5,30 @@ Development Environment Setup
 Sets up the development environment with necessary tools and configurations.
 """
 
-import os
-import subprocess
-import sys
+import json
+import argparse
 from pathlib import Path
+from typing import Dict
 
-class DevEnvironmentSetup:
+from generation_plan import FlushStats, GenerationPlan
+from plan_cache import PlanGenerator
+from template_registry import register, render
+
+class DevEnvironmentSetup(PlanGenerator):
     """Sets up development environment"""
     
-    def __init__(self):
-        self.base_path = Path.cwd()
-        
-    def setup_environment(self):
+    STAGE = 'dev-env'
+    # The dev environment files do not depend on any config field, so every config shares one plan
+    OUTPUT_FIELDS: Dict[str, tuple] = {}
+    
+    def setup_environment(self, dry_run: bool = False) -> FlushStats:
         """Setup the complete development environment"""
         print("🔧 Setting up development environment...")
+        return self.write_plan(dry_run, "✅ Development environment setup complete!")
+        
+    def build_plan(self) -> GenerationPlan:
+        """Build the generation plan without touching the filesystem"""
+        self.plan = GenerationPlan()
         
         # Setup pre-commit hooks
         self._setup_precommit_hooks()
@@ -32,12 +42,129 @@ class DevEnvironmentSetup:
         # Setup development scripts
         self._setup_dev_scripts()
         
-        print("✅ Development environment setup complete!")
+        return self.plan
         
     def _setup_precommit_hooks(self):
         """Setup pre-commit hooks for code quality"""
         
-        precommit_config = '''repos:
+        self.plan.write('.pre-commit-config.yaml', render('dev-env/.pre-commit-config.yaml'))
+        
+        # Create bandit configuration
+        self.plan.write('.bandit', render('dev-env/.bandit'))
+        
+        print("🪝 Created pre-commit hooks configuration")
+        
+    def _setup_dev_dependencies(self):
+        """Setup development dependencies"""
+        
+        self.plan.write('requirements-dev.txt', render('dev-env/requirements-dev.txt'))
+        
+        # Create tox configuration
+        self.plan.write('tox.ini', render('dev-env/tox.ini'))
+        
+        print("📦 Created development dependencies configuration")
+        
+    def _setup_ide_config(self):
+        """Setup IDE configurations"""
+        
+        # VS Code configuration
+        vscode_dir = Path('.vscode')
+        self.plan.mkdir(vscode_dir)
+        
+        # VS Code settings
+        vscode_settings = {
+            "python.defaultInterpreterPath": "./venv/bin/python",
+            "python.formatting.provider": "black",
+            "python.linting.enabled": True,
+            "python.linting.flake8Enabled": True,
+            "python.linting.mypyEnabled": True,
+            "python.linting.banditEnabled": True,
+            "python.testing.pytestEnabled": True,
+            "python.testing.unittestEnabled": False,
+            "editor.formatOnSave": True,
+            "editor.codeActionsOnSave": {
+                "source.organizeImports": True
+            },
+            "files.exclude": {
+                "**/__pycache__": True,
+                "**/*.pyc": True,
+                ".pytest_cache": True,
+                ".coverage": True,
+                "htmlcov": True,
+                ".tox": True,
+                ".mypy_cache": True,
+                "*.egg-info": True
+            }
+        }
+        
+        self.plan.write(vscode_dir / 'settings.json', json.dumps(vscode_settings, indent=2))
+        
+        # VS Code extensions recommendations
+        extensions = {
+            "recommendations": [
+                "ms-python.python",
+                "ms-python.flake8",
+                "ms-python.mypy-type-checker",
+                "ms-python.black-formatter",
+                "ms-python.isort",
+                "streetsidesoftware.code-spell-checker",
+                "eamodio.gitlens",
+                "github.vscode-pull-request-github",
+                "ms-vscode.vscode-yaml"
+            ]
+        }
+        
+        self.plan.write(vscode_dir / 'extensions.json', json.dumps(extensions, indent=2))
+        
+        # VS Code launch configuration for debugging
+        launch_config = {
+            "version": "0.2.0",
+            "configurations": [
+                {
+                    "name": "Python: Current File",
+                    "type": "python",
+                    "request": "launch",
+                    "program": "${file}",
+                    "console": "integratedTerminal"
+                },
+                {
+                    "name": "Python: Main Module",
+                    "type": "python",
+                    "request": "launch",
+                    "program": "src/main.py",
+                    "console": "integratedTerminal"
+                },
+                {
+                    "name": "Python: Pytest",
+                    "type": "python",
+                    "request": "launch",
+                    "module": "pytest",
+                    "console": "integratedTerminal"
+                }
+            ]
+        }
+        
+        self.plan.write(vscode_dir / 'launch.json', json.dumps(launch_config, indent=2))
+        
+        print("🖥️  Created IDE configurations")
+        
+    def _setup_dev_scripts(self):
+        """Setup development scripts"""
+        
+        scripts_dir = Path('scripts')
+        self.plan.mkdir(scripts_dir)
+        
+        # Development script
+        self.plan.write(scripts_dir / 'dev.sh', render('dev-env/scripts/dev.sh'), mode=0o755)
+        
+        # Makefile for common tasks
+        self.plan.write('Makefile', render('dev-env/Makefile'))
+        
+        print("📜 Created development scripts")
+
+# File templates rendered by DevEnvironmentSetup
+
+register('dev-env/.pre-commit-config.yaml', '''repos:
   - repo: https://github.com/pre-commit/pre-commit-hooks
     rev: v4.5.0
     hooks:
@@ -86,26 +213,14 @@ class DevEnvironmentSetup:
     hooks:
       - id: pydocstyle
         exclude: ^tests/
-'''
-        
-        with open('.pre-commit-config.yaml', 'w') as f:
-            f.write(precommit_config)
-            
-        # Create bandit configuration
-        bandit_config = '''[bandit]
+''')
+
+register('dev-env/.bandit', '''[bandit]
 exclude_dirs = ["tests", "venv", ".venv"]
 skips = ["B101", "B601"]
-'''
-        
-        with open('.bandit', 'w') as f:
-            f.write(bandit_config)
-            
-        print("🪝 Created pre-commit hooks configuration")
-        
-    def _setup_dev_dependencies(self):
-        """Setup development dependencies"""
-        
-        dev_requirements = '''# Development dependencies
+''')
+
+register('dev-env/requirements-dev.txt', '''# Development dependencies
 pre-commit>=3.6.0
 black>=23.12.0
 flake8>=7.0.0
@@ -134,13 +249,9 @@ setuptools>=69.0.0
 # Type stubs
 types-requests>=2.31.0
 types-PyYAML>=6.0.0
-'''
-        
-        with open('requirements-dev.txt', 'w') as f:
-            f.write(dev_requirements)
-            
-        # Create tox configuration
-        tox_ini = '''[tox]
+''')
+
+register('dev-env/tox.ini', '''[tox]
 envlist = py38,py39,py310,py311,flake8,mypy,bandit,coverage
 isolated_build = true
 
@@ -175,109 +286,9 @@ deps =
     sphinx
     sphinx-rtd-theme
 commands = sphinx-build -b html docs docs/_build/html
-'''
-        
-        with open('tox.ini', 'w') as f:
-            f.write(tox_ini)
-            
-        print("📦 Created development dependencies configuration")
-        
-    def _setup_ide_config(self):
-        """Setup IDE configurations"""
-        
-        # VS Code configuration
-        vscode_dir = Path('.vscode')
-        vscode_dir.mkdir(exist_ok=True)
-        
-        # VS Code settings
-        vscode_settings = {
-            "python.defaultInterpreterPath": "./venv/bin/python",
-            "python.formatting.provider": "black",
-            "python.linting.enabled": True,
-            "python.linting.flake8Enabled": True,
-            "python.linting.mypyEnabled": True,
-            "python.linting.banditEnabled": True,
-            "python.testing.pytestEnabled": True,
-            "python.testing.unittestEnabled": False,
-            "editor.formatOnSave": True,
-            "editor.codeActionsOnSave": {
-                "source.organizeImports": True
-            },
-            "files.exclude": {
-                "**/__pycache__": True,
-                "**/*.pyc": True,
-                ".pytest_cache": True,
-                ".coverage": True,
-                "htmlcov": True,
-                ".tox": True,
-                ".mypy_cache": True,
-                "*.egg-info": True
-            }
-        }
-        
-        import json
-        with open(vscode_dir / 'settings.json', 'w') as f:
-            json.dump(vscode_settings, f, indent=2)
-            
-        # VS Code extensions recommendations
-        extensions = {
-            "recommendations": [
-                "ms-python.python",
-                "ms-python.flake8",
-                "ms-python.mypy-type-checker",
-                "ms-python.black-formatter",
-                "ms-python.isort",
-                "streetsidesoftware.code-spell-checker",
-                "eamodio.gitlens",
-                "github.vscode-pull-request-github",
-                "ms-vscode.vscode-yaml"
-            ]
-        }
-        
-        with open(vscode_dir / 'extensions.json', 'w') as f:
-            json.dump(extensions, f, indent=2)
-            
-        # VS Code launch configuration for debugging
-        launch_config = {
-            "version": "0.2.0",
-            "configurations": [
-                {
-                    "name": "Python: Current File",
-                    "type": "python",
-                    "request": "launch",
-                    "program": "${file}",
-                    "console": "integratedTerminal"
-                },
-                {
-                    "name": "Python: Main Module",
-                    "type": "python",
-                    "request": "launch",
-                    "program": "src/main.py",
-                    "console": "integratedTerminal"
-                },
-                {
-                    "name": "Python: Pytest",
-                    "type": "python",
-                    "request": "launch",
-                    "module": "pytest",
-                    "console": "integratedTerminal"
-                }
-            ]
-        }
-        
-        with open(vscode_dir / 'launch.json', 'w') as f:
-            json.dump(launch_config, f, indent=2)
-            
-        print("🖥️  Created IDE configurations")
-        
-    def _setup_dev_scripts(self):
-        """Setup development scripts"""
-        
-        scripts_dir = Path('scripts')
-        scripts_dir.mkdir(exist_ok=True)
-        
-        # Development script
-        dev_script = '''#!/bin/bash
+''')
+
+register('dev-env/scripts/dev.sh', '''#!/bin/bash
 # Development helper script
 
 set -e
@@ -355,15 +366,9 @@ case $COMMAND in
     exit 1
     ;;
 esac
-'''
-        
-        with open(scripts_dir / 'dev.sh', 'w') as f:
-            f.write(dev_script)
-            
-        os.chmod(scripts_dir / 'dev.sh', 0o755)
-        
-        # Makefile for common tasks
-        makefile = '''# Makefile for development tasks
+''')
+
+register('dev-env/Makefile', '''# Makefile for development tasks
 
 .PHONY: help setup test coverage lint format clean docs install build release
 
@@ -418,16 +423,16 @@ build:
 
 release: build
 	python -m twine upload dist/*
-'''
-        
-        with open('Makefile', 'w') as f:
-            f.write(makefile)
-            
-        print("📜 Created development scripts")
+''')
 
 def main():
-    setup = DevEnvironmentSetup()
-    setup.setup_environment()
+    parser = argparse.ArgumentParser(description='Set up development environment configuration')
+    parser.add_argument('--output-root', default=None, help='Directory to generate into (default: current directory)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the planned files and directories without writing them')
+    args = parser.parse_args()
+    
+    setup = DevEnvironmentSetup(output_root=args.output_root)
+    setup.setup_environment(dry_run=args.dry_run)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
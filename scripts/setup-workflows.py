@@ -5,16 +5,30 @@ GitHub Workflows Setup Script
 Creates GitHub Actions workflows based on project configuration.
 """
 
-import os
-import json
+import argparse
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Union
 
-class WorkflowGenerator:
+from generation_plan import FlushStats, GenerationPlan
+from plan_cache import PlanGenerator
+from profiler import Profiler
+
+class WorkflowGenerator(PlanGenerator):
     """Generates GitHub Actions workflows based on configuration"""
     
-    def __init__(self, config_file: str = 'README.md'):
-        self.config = self._parse_config(config_file)
+    STAGE = 'workflows'
+    # Config fields each output depends on; plans are cached per distinct combination
+    OUTPUT_FIELDS = {
+        'ci.yml': ('LANGUAGE', 'TESTING'),
+        'cd.yml': ('DEPLOYMENT',),
+        'security.yml': ('LANGUAGE',),
+        'dependabot.yml': ('LANGUAGE',),
+    }
+    
+    def __init__(self, config_file: str = 'README.md', config: Optional[Dict[str, str]] = None,
+                 output_root: Optional[Union[str, Path]] = None,
+                 profiler: Optional[Profiler] = None):
+        super().__init__(config if config is not None else self._parse_config(config_file), output_root, profiler)
         
     def _parse_config(self, config_file: str) -> Dict[str, str]:
         """Parse configuration from README.md"""
@@ -29,10 +43,14 @@ class WorkflowGenerator:
             'DEPLOYMENT': 'docker'
         }
         
-    def generate_workflows(self):
+    def generate_workflows(self, dry_run: bool = False) -> FlushStats:
         """Generate all necessary workflows"""
-        workflows_dir = Path('.github/workflows')
-        workflows_dir.mkdir(parents=True, exist_ok=True)
+        return self.write_plan(dry_run, "✅ GitHub Actions workflows generated!")
+        
+    def build_plan(self) -> GenerationPlan:
+        """Build the generation plan without touching the filesystem"""
+        self.plan = GenerationPlan()
+        self.plan.mkdir('.github/workflows')
         
         # Generate CI workflow
         self._generate_ci_workflow()
@@ -46,7 +64,7 @@ class WorkflowGenerator:
         # Generate dependency update workflow
         self._generate_dependabot_workflow()
         
-        print("✅ GitHub Actions workflows generated!")
+        return self.plan
         
     def _generate_ci_workflow(self):
         """Generate Continuous Integration workflow"""
@@ -339,25 +357,26 @@ class WorkflowGenerator:
             ]
         }
         
+        import yaml
         dependabot_dir = Path('.github')
-        dependabot_dir.mkdir(exist_ok=True)
+        self.plan.write(dependabot_dir / 'dependabot.yml', yaml.dump(dependabot_config, default_flow_style=False))
         
-        with open(dependabot_dir / 'dependabot.yml', 'w') as f:
-            import yaml
-            yaml.dump(dependabot_config, f, default_flow_style=False)
-            
     def _write_workflow(self, filename: str, workflow: dict):
         """Write workflow to YAML file"""
         import yaml
         
         workflows_dir = Path('.github/workflows')
-        with open(workflows_dir / filename, 'w') as f:
-            yaml.dump(workflow, f, default_flow_style=False, sort_keys=False)
+        self.plan.write(workflows_dir / filename, yaml.dump(workflow, default_flow_style=False, sort_keys=False))
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate GitHub Actions workflows')
+    parser.add_argument('--output-root', default=None, help='Directory to generate into (default: current directory)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the planned files and directories without writing them')
+    args = parser.parse_args()
+    
     try:
-        generator = WorkflowGenerator()
-        generator.generate_workflows()
+        generator = WorkflowGenerator(output_root=args.output_root)
+        generator.generate_workflows(dry_run=args.dry_run)
         print("✅ All workflows generated successfully!")
     except Exception as e:
         print(f"❌ Error generating workflows: {e}")
@@ -1,8 +1,8 @@
-```python
 import os
-import re
 import json
 
+import readme_config
+
 # Constants for folder structure
 FOLDER_STRUCTURE = {
     "web-app": ["src", "public", "docs", ".github/workflows"],
@@ -15,21 +15,24 @@ FOLDER_STRUCTURE = {
     "documentation": ["docs", ".github/workflows"]
 }
 
+# Fields the setup wizard needs from the README.md configuration block
+SETUP_FIELDS = ["PROJECT_TYPE", "LANGUAGE", "FRAMEWORK", "BUILD_SYSTEM", "DATABASE"]
+
 # Function to parse the README.md file for configuration
 def parse_readme(readme_path):
+    config_block = readme_config.read_config_block(readme_path)
+    options = readme_config.parse_config_options(config_block or "", SETUP_FIELDS)
+    if any(field not in options for field in SETUP_FIELDS):
+        print("Error: One or more required fields are missing in the README.md.")
+        exit(1)
+
     config = {}
-    with open(readme_path, 'r') as file:
-        content = file.read()
-        # Use regex to extract configuration details
-        try:
-            config["project_type"] = re.search(r"PROJECT_TYPE:\s*\[([^\]]+)\]", content).group(1).split("|")
-            config["language"] = re.search(r"LANGUAGE:\s*\[([^\]]+)\]", content).group(1).split("|")
-            config["framework"] = re.search(r"FRAMEWORK:\s*\[([^\]]+)\]", content).group(1).split("|")
-            config["build_system"] = re.search(r"BUILD_SYSTEM:\s*\[([^\]]+)\]", content).group(1).split("|")
-            config["database"] = re.search(r"DATABASE:\s*\[([^\]]+)\]", content).group(1).split("|")
-        except AttributeError:
-            print("Error: One or more required fields are missing in the README.md.")
+    for field in SETUP_FIELDS:
+        invalid = [value for value in options[field] if value not in readme_config.VALID_VALUE_SETS[field]]
+        if invalid:
+            print(f"Error: Invalid value(s) {', '.join(invalid)} for {field} in the README.md.")
             exit(1)
+        config[field.lower()] = list(options[field])
     return config
 
 # Function to generate folder structure based on project type
@@ -20,17 +20,14 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
-echo "📋 Parsing README.md configuration..."
-python3 scripts/generate-structure.py --config-file README.md
-
-echo "🏗️  Setting up GitHub workflows..."
-python3 scripts/setup-workflows.py
-
-echo "📁 Creating project structure..."
-python3 scripts/create-structure.py
-
-echo "🔧 Configuring development environment..."
-python3 scripts/setup-dev-env.py
+python3 scripts/automanic.py setup --config-file README.md "$@"
+
+# A dry run only printed the plan, so there is nothing to review or commit
+for arg in "$@"; do
+    if [ "$arg" = "--dry-run" ]; then
+        exit 0
+    fi
+done
 
 echo "✅ Setup complete! Your repository is now configured."
 echo ""
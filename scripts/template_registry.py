@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Template Registry
+
+Compiled file templates shared by the generators. Static templates are encoded
+once at import; dynamic templates declare the config fields they read, and
+their rendered bytes are kept in an LRU cache keyed by those field values.
+
+Binary assets (favicons, fonts, sample datasets, ...) live as plain files in
+templates/assets/<PROJECT_TYPE>/, laid out as they appear in the output, and
+are copied rather than rendered.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_CACHE_SIZE = 512
+ASSETS_DIR = Path(__file__).resolve().parent.parent / 'templates' / 'assets'
+
+class FileTemplate:
+    """A named template: pre-encoded bytes or a render function over declared fields"""
+    
+    __slots__ = ('name', 'fields', 'data', 'render_fn')
+    
+    def __init__(self, name: str, fields: Tuple[str, ...] = (), data: Optional[bytes] = None,
+                 render_fn: Optional[Callable[[Dict[str, str]], Union[str, bytes]]] = None):
+        self.name = name
+        self.fields = fields
+        self.data = data
+        self.render_fn = render_fn
+        
+    @property
+    def is_static(self) -> bool:
+        return self.render_fn is None
+
+class TemplateRegistry:
+    """Registry of file templates with an LRU cache of rendered output"""
+    
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.templates: Dict[str, FileTemplate] = {}
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[Tuple[str, ...], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def register(self, name: str, source: Union[str, bytes], fields: Iterable[str] = ()) -> FileTemplate:
+        """Register a static template; its text is encoded once here"""
+        data = source.encode('utf-8') if isinstance(source, str) else bytes(source)
+        return self._add(FileTemplate(name, tuple(fields), data=data))
+        
+    def template(self, name: str, fields: Iterable[str] = ()):
+        """Decorator registering a render function that receives only the declared fields"""
+        def decorator(render_fn):
+            self._add(FileTemplate(name, tuple(fields), render_fn=render_fn))
+            return render_fn
+        return decorator
+        
+    def _add(self, template: FileTemplate) -> FileTemplate:
+        with self._lock:
+            self.templates[template.name] = template
+            for key in [key for key in self._cache if key[0] == template.name]:
+                del self._cache[key]
+        return template
+        
+    def has_template(self, name: str) -> bool:
+        return name in self.templates
+        
+    def render(self, name: str, config: Optional[Dict[str, str]] = None) -> bytes:
+        """Render a template to bytes, reusing cached output for identical field values"""
+        template = self.templates.get(name)
+        if template is None:
+            raise Exception(f"Unknown template: {name}")
+        if template.is_static:
+            return template.data
+            
+        config = config or {}
+        values = {field: config.get(field) for field in template.fields}
+        key = (name,) + tuple(values[field] or '' for field in template.fields)
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+            
+        rendered = template.render_fn(values)
+        data = rendered.encode('utf-8') if isinstance(rendered, str) else bytes(rendered)
+        with self._lock:
+            self._cache[key] = data
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+        
+    def cache_info(self) -> Dict[str, int]:
+        """Hit, miss and size counters of the render cache"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'maxsize': self.cache_size}
+            
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+def asset_files(name: str, assets_dir: Path = ASSETS_DIR) -> List[Tuple[str, Path, Optional[int]]]:
+    """(output path, source file, mode) of every asset under assets_dir/name in sorted order; mode is set for executables"""
+    # Only a plain directory name selects assets, so an unvalidated value cannot point elsewhere
+    if not name or name in ('.', '..') or '/' in name or '\\' in name:
+        return []
+    root = assets_dir / name
+    assets = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            source = Path(directory) / filename
+            mode = 0o755 if os.access(source, os.X_OK) else None
+            assets.append((source.relative_to(root).as_posix(), source, mode))
+    return assets
+
+registry = TemplateRegistry()
+register = registry.register
+template = registry.template
+render = registry.render
+has_template = registry.has_template
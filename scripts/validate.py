@@ -2,55 +2,207 @@
 """
 Automanic Validation Script
 
-Tests and validates the complete Automanic setup.
+Tests and validates the complete Automanic setup. Independent checks run on
+a thread pool, and results can be reported as text, JSON or JUnit XML with
+per-check timings.
 """
 
+import argparse
+import json
 import os
 import sys
-import subprocess
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from validation_cache import ValidationCache, changed_since
+
+try:
+    import yaml
+    # The libyaml-backed loader is several times faster than the pure Python one
+    YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    yaml = None
+    YAML_LOADER = None
+
+OUTPUT_FORMATS = ('text', 'json', 'junit')
+
+# Cached results are only reused by the same compiler and YAML parser
+SYNTAX_CHECK = f"python-syntax-{sys.version_info[0]}.{sys.version_info[1]}"
+YAML_CHECK = f"yaml-{getattr(yaml, '__version__', 'none')}-{YAML_LOADER.__name__ if YAML_LOADER else 'none'}"
+
+EXPECTED_CONFIG = {
+    'PROJECT_TYPE': 'web-app',
+    'LANGUAGE': 'python',
+    'FRAMEWORK': 'fastapi',
+    'BUILD_SYSTEM': 'pip',
+    'DATABASE': 'postgresql',
+    'DEPLOYMENT': 'docker',
+    'CI_CD': 'github-actions',
+    'TESTING': 'pytest',
+    'LICENSE_TYPE': 'mit',
+    'VISIBILITY': 'public',
+}
+
+def _test_readme(overrides: Optional[Dict[str, Optional[str]]] = None, separator: str = ': ') -> str:
+    """README text with a config block; an override of None drops the field"""
+    config = dict(EXPECTED_CONFIG, **(overrides or {}))
+    lines = [f"{key}{separator}{value}" for key, value in config.items() if value is not None]
+    return ("# Test Project\n\n<!-- AUTOMANIC-CONFIG-START -->\n" + "\n".join(lines)
+            + "\n<!-- AUTOMANIC-CONFIG-END -->\n\nTest project description.\n")
+
+# Entry points expected to be executable; every other scripts/*.py module is only syntax checked
+EXECUTABLE_SCRIPTS = [
+    "scripts/generate-structure.py",
+    "scripts/setup-workflows.py",
+    "scripts/create-structure.py",
+    "scripts/setup-dev-env.py",
+]
+
+def python_sources(base_path: Path) -> List[str]:
+    """Every Python module under scripts/, relative to base_path"""
+    return sorted(path.relative_to(base_path).as_posix() for path in (base_path / 'scripts').glob('*.py'))
+
+# (name, README text or bytes, expected error substring or None for a valid config)
+CONFIG_PARSING_CASES = [
+    ('valid config', _test_readme(), None),
+    ('valid config with CRLF line endings', _test_readme().replace('\n', '\r\n').encode('utf-8'), None),
+    ('valid config with extra whitespace', _test_readme(separator=' :   '), None),
+    ('missing config block', "# Test Project\n\nNo configuration here.\n", 'configuration block not found'),
+    ('missing required field', _test_readme({'VISIBILITY': None}), 'Missing required fields: VISIBILITY'),
+    ('invalid value', _test_readme({'LANGUAGE': 'cobol'}), "Invalid value 'cobol' for field 'LANGUAGE'"),
+    ('incompatible combination', _test_readme({'LANGUAGE': 'go'}), 'Incompatible configuration'),
+]
+
+class CheckResult:
+    """Outcome and timing of one validation check"""
+    
+    __slots__ = ('section', 'name', 'passed', 'errors', 'warnings', 'duration')
+    
+    def __init__(self, section: str, name: str):
+        self.section = section
+        self.name = name
+        self.passed: Optional[str] = None
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.duration = 0.0
+        
+    @property
+    def status(self) -> str:
+        if self.errors:
+            return 'error'
+        if self.warnings:
+            return 'warning'
+        return 'passed'
+        
+    def to_dict(self) -> Dict:
+        return {
+            'section': self.section,
+            'name': self.name,
+            'status': self.status,
+            'duration_ms': round(self.duration * 1000, 3),
+            'errors': self.errors,
+            'warnings': self.warnings,
+        }
+
+# A check records its outcome on the result it is given
+Check = Callable[[CheckResult], None]
 
 class AutomanicValidator:
     """Validates Automanic installation and functionality"""
     
-    def __init__(self):
+    def __init__(self, jobs: Optional[int] = None, verbose: bool = True,
+                 cache: Optional[ValidationCache] = None, only: Optional[Set[str]] = None):
         self.base_path = Path.cwd()
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self.verbose = verbose
+        self.cache = cache
+        # When set, content checks only cover these paths (relative to base_path)
+        self.only = only
         self.errors = []
         self.warnings = []
+        self.results: List[CheckResult] = []
+        self.duration = 0.0
+        
+    def _sections(self) -> List[Tuple[str, str, List[Tuple[str, Check]]]]:
+        """Every check grouped by section, in report order"""
+        return [
+            ('structure', "📁 Checking directory structure...", self._check_structure()),
+            ('python-scripts', "\n🐍 Validating Python scripts...", self._validate_scripts()),
+            ('shell-scripts', "\n🔧 Validating shell scripts...", self._validate_shell_scripts()),
+            ('templates', "\n📄 Checking templates...", self._check_templates()),
+            ('workflows', "\n⚙️  Checking GitHub workflows...", self._check_workflows()),
+            ('config-parsing', "\n🧪 Testing configuration parsing...", self._test_config_parsing()),
+        ]
         
     def validate_installation(self) -> bool:
         """Validate the complete installation"""
-        print("🔍 Validating Automanic Installation")
-        print("=" * 50)
-        
-        # Check required files and directories
-        self._check_structure()
-        
-        # Validate scripts
-        self._validate_scripts()
-        
-        # Check templates
-        self._check_templates()
-        
-        # Validate workflows
-        self._check_workflows()
-        
-        # Test configuration parsing
-        self._test_config_parsing()
+        self._print("🔍 Validating Automanic Installation")
+        self._print("=" * 50)
         
+        start = time.perf_counter()
+        sections = self._sections()
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [
+                (header, [executor.submit(self._run_check, section, name, check) for name, check in checks])
+                for section, header, checks in sections
+            ]
+            # Results are reported in check order, whatever order they finish in
+            for header, section_futures in futures:
+                self._print(header)
+                for future in section_futures:
+                    self._report(future.result())
+        self.duration = time.perf_counter() - start
+        if self.cache is not None:
+            self.cache.save()
+            
         # Summary
         self._print_summary()
         
         return len(self.errors) == 0
         
-    def _check_structure(self):
-        """Check required directory structure"""
-        print("📁 Checking directory structure...")
+    def _run_check(self, section: str, name: str, check: Check) -> CheckResult:
+        """Run one check, timing it and turning unexpected exceptions into errors"""
+        result = CheckResult(section, name)
+        start = time.perf_counter()
+        try:
+            check(result)
+        except Exception as e:
+            result.errors.append(f"{name}: {e}")
+        result.duration = time.perf_counter() - start
+        return result
+        
+    def _report(self, result: CheckResult):
+        self.results.append(result)
+        self.errors.extend(result.errors)
+        for warning in result.warnings:
+            if warning not in self.warnings:
+                self.warnings.append(warning)
+        if result.passed:
+            self._print(result.passed)
+            
+    def _selected(self, paths: Iterable[str]) -> List[str]:
+        """Paths whose content should be checked in this run"""
+        return [path for path in paths if self.only is None or path in self.only]
         
+    def _content_errors(self, kind: str, full_path: Path, run: Callable[[bytes], List[str]]) -> List[str]:
+        """Errors of a content check, answered from the cache for content checked before"""
+        if self.cache is not None:
+            return self.cache.check(kind, full_path, run)
+        with open(full_path, 'rb') as f:
+            return run(f.read())
+            
+    def _print(self, message: str):
+        if self.verbose:
+            print(message)
+            
+    def _check_structure(self) -> List[Tuple[str, Check]]:
+        """Check required directory structure"""
         required_dirs = [
             ".github/workflows",
-            ".github/ISSUE_TEMPLATE", 
+            ".github/ISSUE_TEMPLATE",
             "scripts",
             "docs",
             "templates/python",
@@ -59,16 +211,9 @@ class AutomanicValidator:
             "config"
         ]
         
-        for dir_path in required_dirs:
-            full_path = self.base_path / dir_path
-            if not full_path.exists():
-                self.errors.append(f"Missing directory: {dir_path}")
-            else:
-                print(f"✅ {dir_path}")
-                
         required_files = [
             "README.md",
-            "CONTRIBUTING.md", 
+            "CONTRIBUTING.md",
             "CHANGELOG.md",
             "SECURITY.md",
             "LICENSE",
@@ -87,189 +232,265 @@ class AutomanicValidator:
             ".github/dependabot.yml"
         ]
         
-        for file_path in required_files:
-            full_path = self.base_path / file_path
-            if not full_path.exists():
-                self.errors.append(f"Missing file: {file_path}")
-            else:
-                print(f"✅ {file_path}")
+        def exists(path: str, kind: str) -> Check:
+            def check(result: CheckResult):
+                if not (self.base_path / path).exists():
+                    result.errors.append(f"Missing {kind}: {path}")
+                else:
+                    result.passed = f"✅ {path}"
+            return check
+            
+        return ([(dir_path, exists(dir_path, 'directory')) for dir_path in required_dirs]
+                + [(file_path, exists(file_path, 'file')) for file_path in required_files])
                 
-    def _validate_scripts(self):
-        """Validate script files"""
-        print("\n🐍 Validating Python scripts...")
-        
-        python_scripts = [
-            "scripts/generate-structure.py",
-            "scripts/setup-workflows.py", 
-            "scripts/create-structure.py",
-            "scripts/setup-dev-env.py"
-        ]
+    def _validate_scripts(self) -> List[Tuple[str, Check]]:
+        """Validate Python script files"""
+        python_scripts = python_sources(self.base_path)
         
-        for script_path in python_scripts:
-            full_path = self.base_path / script_path
-            if full_path.exists():
+        def compiles(script_path: str) -> Check:
+            def check(result: CheckResult):
+                full_path = self.base_path / script_path
+                if not full_path.exists():
+                    return
                 # Check if script is executable
-                if not os.access(full_path, os.X_OK):
-                    self.warnings.append(f"Script not executable: {script_path}")
+                if script_path in EXECUTABLE_SCRIPTS and not os.access(full_path, os.X_OK):
+                    result.warnings.append(f"Script not executable: {script_path}")
                     
                 # Try to compile the script
-                try:
-                    with open(full_path, 'r') as f:
-                        compile(f.read(), script_path, 'exec')
-                    print(f"✅ {script_path} - syntax OK")
-                except SyntaxError as e:
-                    self.errors.append(f"Syntax error in {script_path}: {e}")
+                def syntax_errors(data: bytes) -> List[str]:
+                    try:
+                        compile(data, script_path, 'exec')
+                    except SyntaxError as e:
+                        return [f"Syntax error in {script_path}: {e}"]
+                    return []
                     
-        print("\n🔧 Validating shell scripts...")
+                result.errors.extend(self._content_errors(SYNTAX_CHECK, full_path, syntax_errors))
+                if not result.errors:
+                    result.passed = f"✅ {script_path} - syntax OK"
+            return check
+            
+        return [(script_path, compiles(script_path)) for script_path in self._selected(python_scripts)]
         
+    def _validate_shell_scripts(self) -> List[Tuple[str, Check]]:
+        """Validate that shell scripts are executable"""
         shell_scripts = [
             "scripts/setup.sh",
             "scripts/interactive-setup.sh"
         ]
         
-        for script_path in shell_scripts:
-            full_path = self.base_path / script_path
-            if full_path.exists():
+        def executable(script_path: str) -> Check:
+            def check(result: CheckResult):
+                full_path = self.base_path / script_path
+                if not full_path.exists():
+                    return
                 if not os.access(full_path, os.X_OK):
-                    self.errors.append(f"Script not executable: {script_path}")
+                    result.errors.append(f"Script not executable: {script_path}")
                 else:
-                    print(f"✅ {script_path} - executable")
-                    
-    def _check_templates(self):
-        """Check template files"""
-        print("\n📄 Checking templates...")
+                    result.passed = f"✅ {script_path} - executable"
+            return check
+            
+        return [(script_path, executable(script_path)) for script_path in shell_scripts]
         
+    def _check_templates(self) -> List[Tuple[str, Check]]:
+        """Check template files"""
         template_files = [
             "templates/python/fastapi-web-app.md",
             "templates/javascript/cli-tool.md",
             "templates/go/api-service.md"
         ]
         
-        for template_path in template_files:
-            full_path = self.base_path / template_path
-            if full_path.exists():
+        def has_config_block(template_path: str) -> Check:
+            def check(result: CheckResult):
+                full_path = self.base_path / template_path
+                if not full_path.exists():
+                    result.warnings.append(f"Template file not found: {template_path}")
+                    return
                 # Check if template has config block
                 with open(full_path, 'r') as f:
                     content = f.read()
-                    if "AUTOMANIC-CONFIG-START" in content and "AUTOMANIC-CONFIG-END" in content:
-                        print(f"✅ {template_path} - config block found")
-                    else:
-                        self.warnings.append(f"Template missing config block: {template_path}")
-            else:
-                self.warnings.append(f"Template file not found: {template_path}")
-                
-    def _check_workflows(self):
-        """Check GitHub Actions workflows"""
-        print("\n⚙️  Checking GitHub workflows...")
+                if "AUTOMANIC-CONFIG-START" in content and "AUTOMANIC-CONFIG-END" in content:
+                    result.passed = f"✅ {template_path} - config block found"
+                else:
+                    result.warnings.append(f"Template missing config block: {template_path}")
+            return check
+            
+        return [(template_path, has_config_block(template_path)) for template_path in self._selected(template_files)]
         
+    def _check_workflows(self) -> List[Tuple[str, Check]]:
+        """Check GitHub Actions workflows"""
         workflow_files = [
             ".github/workflows/ci.yml",
-            ".github/workflows/auto-management.yml", 
+            ".github/workflows/auto-management.yml",
             ".github/workflows/auto-release.yml"
         ]
         
-        for workflow_path in workflow_files:
-            full_path = self.base_path / workflow_path
-            if full_path.exists():
-                try:
-                    import yaml
-                    with open(full_path, 'r') as f:
-                        yaml.safe_load(f)
-                    print(f"✅ {workflow_path} - valid YAML")
-                except yaml.YAMLError as e:
-                    self.errors.append(f"Invalid YAML in {workflow_path}: {e}")
-                except ImportError:
-                    self.warnings.append("PyYAML not available for workflow validation")
-                    print(f"⚠️  {workflow_path} - unable to validate (missing PyYAML)")
+        def valid_yaml(workflow_path: str) -> Check:
+            def check(result: CheckResult):
+                full_path = self.base_path / workflow_path
+                if not full_path.exists():
+                    return
+                if yaml is None:
+                    result.warnings.append("PyYAML not available for workflow validation")
+                    result.passed = f"⚠️  {workflow_path} - unable to validate (missing PyYAML)"
+                    return
                     
-    def _test_config_parsing(self):
-        """Test configuration parsing"""
-        print("\n🧪 Testing configuration parsing...")
-        
-        # Create a test README with config
-        test_readme = '''# Test Project
-
-<!-- AUTOMANIC-CONFIG-START -->
-PROJECT_TYPE: web-app
-LANGUAGE: python
-FRAMEWORK: fastapi
-BUILD_SYSTEM: pip
-DATABASE: postgresql
-DEPLOYMENT: docker
-CI_CD: github-actions
-TESTING: pytest
-LICENSE_TYPE: mit
-VISIBILITY: public
-<!-- AUTOMANIC-CONFIG-END -->
-
-Test project description.
-'''
+                def yaml_errors(data: bytes) -> List[str]:
+                    try:
+                        yaml.load(data, Loader=YAML_LOADER)
+                    except yaml.YAMLError as e:
+                        return [f"Invalid YAML in {workflow_path}: {e}"]
+                    return []
+                    
+                result.errors.extend(self._content_errors(YAML_CHECK, full_path, yaml_errors))
+                if not result.errors:
+                    result.passed = f"✅ {workflow_path} - valid YAML"
+            return check
+            
+        return [(workflow_path, valid_yaml(workflow_path)) for workflow_path in self._selected(workflow_files)]
         
-        test_file = self.base_path / "test_readme.md"
-        try:
-            with open(test_file, 'w') as f:
-                f.write(test_readme)
-                
-            # Import and test the configuration parser
-            sys.path.insert(0, str(self.base_path / "scripts"))
+    def _test_config_parsing(self) -> List[Tuple[str, Check]]:
+        """Run the config parser in memory over known-good and known-bad README blocks"""
+        # The parser and everything it imports live in scripts/, so any module there may change its result
+        sources = python_sources(self.base_path)
+        if not self._selected(sources):
+            return []
             
+        def parsing_errors(data: Union[str, bytes], expected_error: Optional[str]) -> List[str]:
+            # Loaded here so a broken parser is reported as a failed check
+            from pipeline import load_script
+            config_parser = load_script('generate-structure.py').AutomanicConfig()
             try:
-                from generate_structure import AutomanicConfig
-                
-                config_parser = AutomanicConfig()
-                config = config_parser.parse_readme(str(test_file))
-                
-                if len(config) == 10:  # All required fields
-                    print("✅ Configuration parsing - OK")
+                if isinstance(data, bytes):
+                    config = config_parser.parse_bytes(data)
                 else:
-                    self.errors.append(f"Configuration parsing failed - only got {len(config)} fields")
-                    
-            except ImportError as e:
-                self.warnings.append(f"Could not test config parsing (import error): {e}")
-                print("⚠️  Configuration parsing - skipped (import error)")
+                    config = config_parser.parse_text(data)
             except Exception as e:
-                self.errors.append(f"Configuration parsing error: {e}")
-                
-        finally:
-            # Clean up test file
-            if test_file.exists():
-                test_file.unlink()
+                if expected_error is None:
+                    return [f"Configuration parsing error: {e}"]
+                if expected_error not in str(e):
+                    return [f"Configuration parsing rejected with the wrong error: {e}"]
+                return []
                 
+            if expected_error is not None:
+                return [f"Configuration parsing accepted a config it should reject ({expected_error})"]
+            if config != EXPECTED_CONFIG:
+                return [f"Configuration parsing failed - got {config}"]
+            return []
+            
+        def parses(name: str, data: Union[str, bytes], expected_error: Optional[str]) -> Check:
+            def check(result: CheckResult):
+                run = lambda: parsing_errors(data, expected_error)
+                if self.cache is not None:
+                    # Reused until any module under scripts/ changes
+                    result.errors.extend(self.cache.check_sources(f"config-parsing-{name}",
+                                                                  [self.base_path / path for path in sources], run))
+                else:
+                    result.errors.extend(run())
+                if not result.errors:
+                    result.passed = f"✅ Configuration parsing - {name} {'rejected' if expected_error else 'OK'}"
+            return check
+            
+        return [(name, parses(name, data, expected_error)) for name, data, expected_error in CONFIG_PARSING_CASES]
+        
     def _print_summary(self):
         """Print validation summary"""
-        print("\n" + "=" * 50)
-        print("📊 VALIDATION SUMMARY")
-        print("=" * 50)
+        self._print("\n" + "=" * 50)
+        self._print("📊 VALIDATION SUMMARY")
+        self._print("=" * 50)
         
         if not self.errors and not self.warnings:
-            print("🎉 Perfect! All validations passed.")
+            self._print("🎉 Perfect! All validations passed.")
         else:
             if self.errors:
-                print(f"❌ {len(self.errors)} Error(s):")
+                self._print(f"❌ {len(self.errors)} Error(s):")
                 for error in self.errors:
-                    print(f"   • {error}")
+                    self._print(f"   • {error}")
                     
             if self.warnings:
-                print(f"⚠️  {len(self.warnings)} Warning(s):")
+                self._print(f"⚠️  {len(self.warnings)} Warning(s):")
                 for warning in self.warnings:
-                    print(f"   • {warning}")
+                    self._print(f"   • {warning}")
                     
-        print("\n🔗 Next Steps:")
+        cached = f", {self.cache.hits} cached" if self.cache is not None else ""
+        self._print(f"\n⏱️  {len(self.results)} checks in {self.duration * 1000:.1f} ms ({self.jobs} threads{cached})")
+        
+        self._print("\n🔗 Next Steps:")
         if not self.errors:
-            print("✅ Installation is valid!")
-            print("   • Try running: ./scripts/interactive-setup.sh")
-            print("   • Or use a template from templates/ directory")
-            print("   • Read docs/setup.md for detailed instructions")
+            self._print("✅ Installation is valid!")
+            self._print("   • Try running: ./scripts/interactive-setup.sh")
+            self._print("   • Or use a template from templates/ directory")
+            self._print("   • Read docs/setup.md for detailed instructions")
         else:
-            print("❌ Please fix the errors above before proceeding")
-            print("   • Check file permissions with: chmod +x scripts/*.sh")
-            print("   • Ensure all required files are present")
-            print("   • Review the setup documentation")
+            self._print("❌ Please fix the errors above before proceeding")
+            self._print("   • Check file permissions with: chmod +x scripts/*.sh")
+            self._print("   • Ensure all required files are present")
+            self._print("   • Review the setup documentation")
+            
+    def to_json(self) -> str:
+        """Validation results with per-check timings as JSON"""
+        return json.dumps({
+            'success': not self.errors,
+            'duration_ms': round(self.duration * 1000, 3),
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'checks': [result.to_dict() for result in self.results],
+        }, indent=2)
+        
+    def to_junit(self) -> str:
+        """Validation results as JUnit XML, one test case per check"""
+        failures = sum(1 for result in self.results if result.errors)
+        suites = ElementTree.Element('testsuites')
+        suite = ElementTree.SubElement(suites, 'testsuite', {
+            'name': 'automanic-validation',
+            'tests': str(len(self.results)),
+            'failures': str(failures),
+            'errors': '0',
+            'time': f"{self.duration:.6f}",
+        })
+        for result in self.results:
+            case = ElementTree.SubElement(suite, 'testcase', {
+                'classname': result.section,
+                'name': result.name,
+                'time': f"{result.duration:.6f}",
+            })
+            for error in result.errors:
+                failure = ElementTree.SubElement(case, 'failure', {'message': error})
+                failure.text = error
+            if result.warnings:
+                ElementTree.SubElement(case, 'system-out').text = '\n'.join(f"warning: {warning}" for warning in result.warnings)
+        return ElementTree.tostring(suites, encoding='unicode')
 
 def main():
-    validator = AutomanicValidator()
+    parser = argparse.ArgumentParser(description='Validate the Automanic installation')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text', help='Report format (default: text)')
+    parser.add_argument('--output', help='Write the JSON or JUnit report to this file instead of stdout')
+    parser.add_argument('--jobs', type=int, default=None, help='Checks to run in parallel')
+    parser.add_argument('--since', metavar='REV', help='Only check the content of files changed since this git revision')
+    parser.add_argument('--no-cache', action='store_true', help='Re-check every file instead of reusing cached results')
+    args = parser.parse_args()
+    
+    base_path = Path.cwd()
+    cache = None if args.no_cache else ValidationCache.load(base_path)
+    try:
+        only = changed_since(base_path, args.since) if args.since else None
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(2)
+        
+    # Machine-readable reports on stdout are not mixed with progress output
+    verbose = args.format == 'text' or bool(args.output)
+    validator = AutomanicValidator(jobs=args.jobs, verbose=verbose, cache=cache, only=only)
     success = validator.validate_installation()
+    
+    if args.format != 'text':
+        report = validator.to_json() if args.format == 'json' else validator.to_junit()
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+        else:
+            print(report)
+            
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Validation Result Cache
+
+Remembers the outcome of syntax and YAML checks by file content hash in
+.automanic/validate-cache, so unchanged files are not compiled or parsed
+again, and of checks over a whole set of source files by the hash of all of
+them. A stat signature per path lets unchanged files skip hashing too.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+
+CACHE_PATH = '.automanic/validate-cache'
+CACHE_VERSION = 1
+# Files modified this close to the moment they were cached are hashed again
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+class ValidationCache:
+    """Check results keyed by check kind and file content hash"""
+    
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.path = self.root / CACHE_PATH
+        self.files: Dict[str, Dict[str, Union[str, int]]] = {}
+        self.results: Dict[str, List[str]] = {}
+        # Combined content hash of the source files each source-set check last ran against
+        self.groups: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._lock = threading.Lock()
+        
+    @classmethod
+    def load(cls, root: Union[str, Path]) -> 'ValidationCache':
+        """Load the cache of a tree; a missing or unreadable cache is empty"""
+        cache = cls(root)
+        try:
+            with open(cache.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                cache.files = data.get('files', {})
+                cache.results = data.get('results', {})
+                cache.groups = data.get('groups', {})
+        except (OSError, ValueError):
+            pass
+        return cache
+        
+    def _known_digest(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Content hash recorded for a file whose stat signature is unchanged"""
+        entry = self.files.get(path)
+        if (entry is None or entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns
+                or st.st_mtime_ns >= entry['cached_ns'] - RACY_WINDOW_NS):
+            return None
+        return entry['sha256']
+        
+    def check(self, kind: str, path: Union[str, Path], run: Callable[[bytes], List[str]]) -> List[str]:
+        """Errors of a check over a file's content, running it only for content not seen before"""
+        path = str(path)
+        st = os.stat(path)
+        with self._lock:
+            digest = self._known_digest(path, st)
+            if digest is not None and f"{kind}:{digest}" in self.results:
+                self.hits += 1
+                return self.results[f"{kind}:{digest}"]
+                
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        key = f"{kind}:{digest}"
+        with self._lock:
+            self.files[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                                'cached_ns': time.time_ns(), 'sha256': digest}
+            self.dirty = True
+            if key in self.results:
+                self.hits += 1
+                return self.results[key]
+            self.misses += 1
+            
+        errors = run(data)
+        with self._lock:
+            self.results[key] = errors
+        return errors
+        
+    def _file_digest(self, path: str) -> str:
+        """Content hash of a file, hashing it only when its stat signature changed"""
+        st = os.stat(path)
+        with self._lock:
+            digest = self._known_digest(path, st)
+        if digest is not None:
+            return digest
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        with self._lock:
+            self.files[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                                'cached_ns': time.time_ns(), 'sha256': digest.hexdigest()}
+            self.dirty = True
+        return digest.hexdigest()
+        
+    def check_sources(self, kind: str, paths: Iterable[Union[str, Path]], run: Callable[[], List[str]]) -> List[str]:
+        """Errors of a check depending on a set of files, running it only when any of their content changed"""
+        combined = hashlib.sha256()
+        for path in sorted(str(path) for path in paths):
+            combined.update(f"{path}\0{self._file_digest(path)}\n".encode('utf-8'))
+        digest = combined.hexdigest()
+        key = f"{kind}:{digest}"
+        with self._lock:
+            if self.groups.get(kind) != digest:
+                self.groups[kind] = digest
+                self.dirty = True
+            if key in self.results:
+                self.hits += 1
+                return self.results[key]
+            self.misses += 1
+            
+        errors = run()
+        with self._lock:
+            self.results[key] = errors
+            self.dirty = True
+        return errors
+        
+    def save(self):
+        """Atomically write the cache, keeping only results of files still tracked"""
+        if not self.dirty:
+            return
+        live = {entry['sha256'] for entry in self.files.values()} | set(self.groups.values())
+        results = {key: errors for key, errors in self.results.items() if key.rsplit(':', 1)[1] in live}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.files, 'groups': self.groups, 'results': results}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+def changed_since(root: Union[str, Path], revision: str) -> Set[str]:
+    """Paths (relative to root) changed since a git revision, including uncommitted and untracked files"""
+    def git(*args: str) -> List[str]:
+        result = subprocess.run(['git', *args], cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise Exception(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return [line for line in result.stdout.splitlines() if line]
+        
+    # Both commands report paths relative to root when it is a subdirectory of the repository
+    return set(git('diff', '--name-only', '--relative', revision, '--')
+               + git('ls-files', '--others', '--exclude-standard'))
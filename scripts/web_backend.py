@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Automanic Web Backend
+
+Asyncio HTTP service behind the React setup form (src/SetupForm.tsx). A
+project is created with POST /api/projects; its setup stages are planned in
+memory on a bounded worker pool, progress is streamed over server-sent events,
+and the finished project is streamed back as a tar.gz or zip archive without
+touching the disk. The service binds to localhost.
+
+    POST /api/projects                 config JSON -> {"id", "events", "archive"}
+    GET  /api/projects/<id>/events     text/event-stream of progress events
+    GET  /api/projects/<id>/archive    the generated project as tar.gz (?format=zip for zip)
+    GET  /api/options                  valid values and defaults for the form
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import archive_stream
+import readme_config
+from daemon import LineSink, ThreadLocalStdout
+from generation_plan import GenerationPlan
+from pipeline import SetupPipeline, load_script
+from profiler import FILE, ProfileEvent, Profiler
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BODY = 64 * 1024
+# Finished projects are kept this long for their archive to be downloaded
+JOB_TTL = 600
+ARCHIVE_CHUNK = 64 * 1024
+# How often an archive producer blocked on a slow client checks whether the response was abandoned
+PRODUCER_POLL = 0.1
+HEADER_TIMEOUT = 10
+
+# Fields the form does not ask for
+DEFAULT_CONFIG = {
+    'DATABASE': 'none',
+    'DEPLOYMENT': 'none',
+    'CI_CD': 'github-actions',
+    'TESTING': 'none',
+    'LICENSE_TYPE': 'mit',
+    'VISIBILITY': 'public',
+}
+
+# Browser origins allowed to call the backend: the React dev server and other local pages
+LOCAL_ORIGIN_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+STATUS_TEXT = {200: 'OK', 202: 'Accepted', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+
+class ProjectJob:
+    """One project generation and the progress events it has published"""
+    
+    def __init__(self, job_id: str, config: Dict[str, str]):
+        self.id = job_id
+        self.config = config
+        self.plan: Optional[GenerationPlan] = None
+        self.events: List[Tuple[str, Dict]] = []
+        self.finished = False
+        self.failed = False
+        self.changed = asyncio.Condition()
+        
+    async def publish(self, event: str, data: Dict):
+        async with self.changed:
+            self.events.append((event, data))
+            if event in ('done', 'error'):
+                self.finished = True
+                self.failed = event == 'error'
+            self.changed.notify_all()
+
+def normalize_config(data: Dict) -> Dict[str, str]:
+    """Form answers as a complete config: keys upper-cased and unanswered fields defaulted"""
+    config = dict(DEFAULT_CONFIG)
+    for key, value in data.items():
+        if value not in (None, ''):
+            config[str(key).strip().upper()] = str(value).strip()
+    return {field: config[field] for field in readme_config.REQUIRED_FIELDS if field in config}
+
+def _allowed_origin(origin: str) -> Optional[str]:
+    """The Origin header echoed back for CORS, if it is a local page"""
+    try:
+        host = urlsplit(origin).hostname
+    except ValueError:
+        return None
+    return origin if host in LOCAL_ORIGIN_HOSTS else None
+
+# Origin of the request being served by the current connection task
+_request_origin: contextvars.ContextVar = contextvars.ContextVar('request_origin', default=None)
+
+class WebBackend:
+    """HTTP routes, job registry and worker pool"""
+    
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = self.workers * 8
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='automanic-web')
+        self.jobs: Dict[str, ProjectJob] = {}
+        self.pending = 0
+        self.stdout = ThreadLocalStdout(sys.stdout)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.address: Optional[Tuple[str, int]] = None
+        self._serve_task: Optional[asyncio.Task] = None
+        
+    # Generation
+    
+    def _run_job(self, job: ProjectJob):
+        """Plan every setup stage for a job inside a worker thread"""
+        def publish(event: str, data: Dict):
+            asyncio.run_coroutine_threadsafe(job.publish(event, data), self.loop).result()
+            
+        def on_profile_event(event: ProfileEvent):
+            if event.kind != FILE:
+                publish('progress', {'kind': event.kind, 'name': event.name,
+                                     'duration_ms': round(event.duration * 1000, 3),
+                                     'files': event.files, 'bytes': event.bytes})
+                                     
+        self.stdout.local.sink = LineSink(lambda line: publish('log', {'line': line}))
+        try:
+            plan = SetupPipeline(profiler=Profiler(on_profile_event)).build_plan(job.config)
+            plan.write('README.md', f"# {job.config['PROJECT_TYPE']} project\n\n{readme_config.format_config_block(job.config)}")
+            job.plan = plan
+            self.stdout.local.sink.flush()
+            publish('done', {'files': len(plan.files()), 'bytes': plan.total_bytes()})
+        except Exception as e:
+            publish('error', {'message': str(e)})
+        finally:
+            self.stdout.local.sink = None
+            
+    async def _generate(self, job: ProjectJob):
+        """Run a job the request handler has already counted as pending"""
+        try:
+            await job.publish('queued', {'id': job.id})
+            await self.loop.run_in_executor(self.executor, self._run_job, job)
+        finally:
+            self.pending -= 1
+            self.loop.call_later(JOB_TTL, self._expire, job.id)
+            
+    def _expire(self, job_id: str):
+        self.jobs.pop(job_id, None)
+        
+    # HTTP plumbing
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one request per connection"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                return
+            method, target = parts[0], parts[1]
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            _request_origin.set(_allowed_origin(headers.get('origin', '')))
+            length = int(headers.get('content-length') or 0)
+            if length > MAX_BODY:
+                await self._send_json(writer, 413, {'error': 'Request body too large'})
+                return
+            body = await reader.readexactly(length) if length else b''
+            url = urlsplit(target)
+            await self.route(method, url.path, parse_qs(url.query), body, writer)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Shutting down: drop the connection instead of waiting for the client to read what is buffered
+            writer.transport.abort()
+            raise
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+                
+    def _head(self, status: int, content_type: Optional[str], extra: Optional[Dict[str, str]] = None,
+              length: Optional[int] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", 'Connection: close']
+        origin = _request_origin.get()
+        if origin:
+            # The form is served by the React dev server on another localhost port
+            lines += [f"Access-Control-Allow-Origin: {origin}", 'Vary: Origin',
+                      'Access-Control-Allow-Methods: GET, POST, OPTIONS',
+                      'Access-Control-Allow-Headers: Content-Type']
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        for name, value in (extra or {}).items():
+            lines.append(f"{name}: {value}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, data: Dict):
+        body = json.dumps(data).encode('utf-8')
+        writer.write(self._head(status, 'application/json', length=len(body)) + body)
+        await writer.drain()
+        
+    async def route(self, method: str, path: str, query: Dict[str, List[str]], body: bytes, writer: asyncio.StreamWriter):
+        if method == 'OPTIONS':
+            writer.write(self._head(204, None, length=0))
+            await writer.drain()
+            return
+        parts = [part for part in path.split('/') if part]
+        if parts == ['api', 'options'] and method == 'GET':
+            await self._send_json(writer, 200, {'fields': readme_config.REQUIRED_FIELDS,
+                                                'values': readme_config.VALID_VALUES, 'defaults': DEFAULT_CONFIG})
+        elif parts == ['api', 'projects'] and method == 'POST':
+            await self.create_project(body, writer)
+        elif len(parts) == 4 and parts[:2] == ['api', 'projects'] and method == 'GET':
+            job = self.jobs.get(parts[2])
+            if job is None:
+                await self._send_json(writer, 404, {'error': 'Unknown project'})
+            elif parts[3] == 'events':
+                await self.stream_events(job, writer)
+            elif parts[3] == 'archive':
+                await self.stream_archive(job, query.get('format', [archive_stream.TAR_GZ])[0], writer)
+            else:
+                await self._send_json(writer, 404, {'error': 'Not found'})
+        else:
+            await self._send_json(writer, 404, {'error': 'Not found'})
+            
+    # Routes
+    
+    async def create_project(self, body: bytes, writer: asyncio.StreamWriter):
+        """Validate a config and queue its generation"""
+        try:
+            data = json.loads(body or b'{}')
+            if not isinstance(data, dict):
+                raise ValueError('expected a JSON object')
+        except ValueError as e:
+            await self._send_json(writer, 400, {'error': f"Invalid JSON: {e}"})
+            return
+        config = normalize_config(data['config'] if isinstance(data.get('config'), dict) else data)
+        try:
+            load_script('generate-structure.py').AutomanicConfig()._validate_config(config)
+        except Exception as e:
+            await self._send_json(writer, 400, {'error': str(e)})
+            return
+        if self.pending >= self.max_pending:
+            await self._send_json(writer, 503, {'error': 'Too many projects are being generated, retry shortly'})
+            return
+            
+        job_id = uuid.uuid4().hex
+        job = ProjectJob(job_id, config)
+        self.jobs[job_id] = job
+        # Counted before the task is scheduled, so a burst of requests cannot all pass the check above
+        self.pending += 1
+        asyncio.ensure_future(self._generate(job))
+        await self._send_json(writer, 202, {
+            'id': job_id,
+            'config': config,
+            'events': f"/api/projects/{job_id}/events",
+            'archive': f"/api/projects/{job_id}/archive",
+        })
+        
+    async def stream_events(self, job: ProjectJob, writer: asyncio.StreamWriter):
+        """Replay and follow a job's progress as server-sent events"""
+        writer.write(self._head(200, 'text/event-stream', {'Cache-Control': 'no-cache'}))
+        sent = 0
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.events) > sent)
+                events = job.events[sent:]
+                finished = job.finished
+            for event, data in events:
+                writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+            sent += len(events)
+            await writer.drain()
+            if finished and sent == len(job.events):
+                return
+                
+    async def stream_archive(self, job: ProjectJob, archive_format: str, writer: asyncio.StreamWriter):
+        """Stream the finished project's plan as an archive without building it in memory or on disk"""
+        if archive_format not in archive_stream.ARCHIVE_FORMATS:
+            await self._send_json(writer, 400, {'error': f"Unknown archive format '{archive_format}'"})
+            return
+        async with job.changed:
+            await job.changed.wait_for(lambda: job.finished)
+        if job.failed:
+            await self._send_json(writer, 409, {'error': job.events[-1][1]['message']})
+            return
+            
+        name = f"automanic-{job.config['PROJECT_TYPE']}"
+        writer.write(self._head(200, archive_stream.CONTENT_TYPES[archive_format], {
+            'Content-Disposition': f'attachment; filename="{name}.{archive_format}"'}))
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=8)
+        loop = self.loop
+        abandoned = threading.Event()
+        
+        def put(chunk: Optional[bytes]):
+            """Hand a chunk to the event loop, giving up once the response is abandoned"""
+            if abandoned.is_set():
+                raise ConnectionAbortedError('archive response abandoned')
+            future = asyncio.run_coroutine_threadsafe(chunks.put(chunk), loop)
+            while True:
+                try:
+                    return future.result(PRODUCER_POLL)
+                except concurrent.futures.TimeoutError:
+                    if abandoned.is_set():
+                        future.cancel()
+                        raise ConnectionAbortedError('archive response abandoned')
+                        
+        class _QueueWriter:
+            """File object handing compressed chunks to the event loop, blocking while the client is slow"""
+            def __init__(self):
+                self.buffer = bytearray()
+                
+            def write(self, data: bytes) -> int:
+                self.buffer += data
+                if len(self.buffer) >= ARCHIVE_CHUNK:
+                    self.flush()
+                return len(data)
+                
+            def flush(self):
+                if self.buffer:
+                    put(bytes(self.buffer))
+                    self.buffer.clear()
+                    
+        def write_archive():
+            output = _QueueWriter()
+            try:
+                archive_stream.write_archive(job.plan, output, archive_format)
+                output.flush()
+            except ConnectionAbortedError:
+                return
+            finally:
+                with contextlib.suppress(ConnectionAbortedError):
+                    put(None)
+                    
+        producer = loop.run_in_executor(None, write_archive)
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # However the response ends (finished, client gone, cancelled at shutdown), the producer thread is released
+            abandoned.set()
+        await producer
+        
+    # Server
+    
+    async def serve(self, host: str, port: int):
+        self.loop = asyncio.get_running_loop()
+        self._serve_task = asyncio.current_task()
+        server = await asyncio.start_server(self.handle, host, port)
+        # Port 0 binds an ephemeral port; the one actually bound is kept here
+        self.address = server.sockets[0].getsockname()[:2]
+        print(f"🌐 Automanic web backend on http://{host}:{self.address[1]} ({self.workers} workers)")
+        sys.stdout = self.stdout
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sys.stdout = self.stdout.default
+            self.executor.shutdown(wait=False)
+            self.jobs.clear()
+            
+    def stop(self):
+        """Stop serving; may be called from any thread"""
+        self.loop.call_soon_threadsafe(self._serve_task.cancel)
+
+def run(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None):
+    """Run the web backend until interrupted"""
+    if host not in ('127.0.0.1', 'localhost', '::1'):
+        raise Exception(f"The web backend only binds to localhost, not {host}")
+    backend = WebBackend(workers=workers)
+    try:
+        asyncio.run(backend.serve(host, port))
+    except KeyboardInterrupt:
+        print("👋 Automanic web backend stopped")
@@ -5,41 +5,90 @@ import { Button, TextField, Typography, Box, LinearProgress } from '@mui/materia
 const questions = [
     {
         question: "What is your project's type?",
+        field: "PROJECT_TYPE",
         options: ["web-app", "cli-tool", "library", "api", "mobile-app", "desktop-app", "data-science", "documentation"],
         type: "select"
     },
     {
         question: "What programming language will you use?",
+        field: "LANGUAGE",
         options: ["python", "javascript", "typescript", "go", "rust", "java", "cpp", "c", "php", "ruby", "swift", "kotlin", "scala", "r"],
         type: "select"
     },
     {
         question: "What framework do you plan to use?",
+        field: "FRAMEWORK",
         options: ["react", "vue", "angular", "express", "fastapi", "django", "spring", "gin", "actix", "electron", "flutter", "pytorch", "tensorflow", "none"],
         type: "select"
     },
     {
         question: "What build system will you use?",
+        field: "BUILD_SYSTEM",
         options: ["npm", "yarn", "pip", "cargo", "maven", "gradle", "make", "cmake", "none"],
         type: "select"
     },
     {
         question: "What database will you use?",
+        field: "DATABASE",
         options: ["postgresql", "mysql", "mongodb", "redis", "sqlite", "none"],
         type: "select"
     },
 ];
 
+// Backend started with `python3 scripts/automanic.py web`
+const API_URL = process.env.REACT_APP_AUTOMANIC_API || 'http://127.0.0.1:8765';
+
 const SetupForm: React.FC = () => {
     const [currentStep, setCurrentStep] = useState(0);
     const [answers, setAnswers] = useState<string[]>(Array(questions.length).fill(''));
+    const [log, setLog] = useState<string[]>([]);
+    const [archiveUrl, setArchiveUrl] = useState<string | null>(null);
+    const [error, setError] = useState<string | null>(null);
+    const [submitting, setSubmitting] = useState(false);
     
+    const handleSubmit = async () => {
+        setSubmitting(true);
+        setError(null);
+        setLog([]);
+        setArchiveUrl(null);
+        const config = Object.fromEntries(questions.map((q, index) => [q.field, answers[index]]));
+        try {
+            const response = await fetch(`${API_URL}/api/projects`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(config),
+            });
+            const project = await response.json();
+            if (!response.ok) {
+                throw new Error(project.error);
+            }
+            const events = new EventSource(`${API_URL}${project.events}`);
+            events.addEventListener('log', (e) => {
+                const { line } = JSON.parse((e as MessageEvent).data);
+                setLog((lines) => [...lines, line]);
+            });
+            events.addEventListener('done', () => {
+                events.close();
+                setArchiveUrl(`${API_URL}${project.archive}`);
+                setSubmitting(false);
+            });
+            events.addEventListener('error', (e) => {
+                events.close();
+                const data = (e as MessageEvent).data;
+                setError(data ? JSON.parse(data).message : 'Lost connection to the Automanic backend');
+                setSubmitting(false);
+            });
+        } catch (e) {
+            setError((e as Error).message);
+            setSubmitting(false);
+        }
+    };
+
     const handleNext = () => {
         if (currentStep < questions.length - 1) {
             setCurrentStep(currentStep + 1);
         } else {
-            console.log("Final Answers:", answers);
-            // Here you would handle form submission
+            handleSubmit();
         }
     };
 
@@ -82,9 +131,24 @@ const SetupForm: React.FC = () => {
                     ))}
                 </TextField>
             )}
-            <Button variant="contained" onClick={handleNext} disabled={!answers[currentStep]}>
+            <Button variant="contained" onClick={handleNext} disabled={!answers[currentStep] || submitting}>
                 {currentStep < questions.length - 1 ? "Next" : "Finish"}
             </Button>
+            {error && (
+                <Typography variant="body1" color="error" sx={{ marginTop: 2 }}>
+                    {error}
+                </Typography>
+            )}
+            {log.length > 0 && (
+                <Box component="pre" sx={{ marginTop: 2, maxHeight: 300, overflow: 'auto' }}>
+                    {log.join('\n')}
+                </Box>
+            )}
+            {archiveUrl && (
+                <Button variant="outlined" href={archiveUrl} sx={{ marginTop: 2 }}>
+                    Download project
+                </Button>
+            )}
         </Box>
     );
 };
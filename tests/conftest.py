@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The scripts are run as plain modules from their own directory, not installed as a package
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+sys.path.insert(0, str(SCRIPTS_DIR))
@@ -0,0 +1,69 @@
+"""Committing generation plans into a local bare repository"""
+
+import subprocess
+
+from generation_plan import GenerationPlan
+from git_import import BareRepository
+from pipeline import load_script
+
+CONFIG = {
+    'PROJECT_TYPE': 'web-app',
+    'LANGUAGE': 'python',
+    'FRAMEWORK': 'fastapi',
+    'BUILD_SYSTEM': 'pip',
+    'DATABASE': 'postgresql',
+    'DEPLOYMENT': 'docker',
+    'CI_CD': 'github-actions',
+    'TESTING': 'pytest',
+    'LICENSE_TYPE': 'mit',
+    'VISIBILITY': 'public',
+}
+
+def _git(git_dir, *args):
+    return subprocess.run(['git', '--git-dir', str(git_dir), *args], capture_output=True, text=True, check=True).stdout
+
+def _plan():
+    return load_script('generate-structure.py').StructureGenerator(CONFIG).build_plan()
+
+def test_commit_then_rerun_is_a_no_op(tmp_path, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    git_dir = tmp_path / 'project.git'
+    subprocess.run(['git', 'init', '--bare', '--quiet', str(git_dir)], check=True)
+    
+    plan = _plan()
+    stats = BareRepository(git_dir, 'main').commit(plan)
+    assert stats.written == len(plan.files())
+    assert stats.skipped == 0
+    head = _git(git_dir, 'rev-parse', 'refs/heads/main').strip()
+    assert _git(git_dir, 'rev-list', '--count', head).strip() == '1'
+    committed = set(_git(git_dir, 'ls-tree', '-r', '--name-only', head).split())
+    assert committed == set(plan.files())
+    assert _git(git_dir, 'show', f"{head}:requirements.txt").encode('utf-8') == plan.files()['requirements.txt'].data
+    
+    # The same config again: every blob matches, so no commit is made
+    stats = BareRepository(git_dir, 'main').commit(_plan())
+    assert stats.written == 0
+    assert stats.skipped == len(plan.files())
+    assert _git(git_dir, 'rev-parse', 'refs/heads/main').strip() == head
+    
+    _git(git_dir, 'fsck', '--strict', '--no-dangling')
+
+def test_changed_file_is_committed_on_top(tmp_path):
+    git_dir = tmp_path / 'project.git'
+    repository = BareRepository(git_dir, 'main')
+    plan = _plan()
+    repository.commit(plan)
+    first = repository.head()
+    
+    changed = GenerationPlan()
+    changed.extend(plan)
+    changed.write('README.md', '# Project\n')
+    changed.write('scripts/run.sh', '#!/bin/sh\n', mode=0o755)
+    stats = repository.commit(changed)
+    assert (stats.written, stats.changed) == (2, 0)
+    
+    second = repository.head()
+    assert _git(git_dir, 'rev-parse', f"{second}^").strip() == first
+    assert _git(git_dir, 'diff-tree', '--no-commit-id', '--name-only', '-r', second).split() == ['README.md', 'scripts/run.sh']
+    assert _git(git_dir, 'ls-tree', second, 'scripts/run.sh').startswith('100755 ')
+    _git(git_dir, 'fsck', '--strict', '--no-dangling')
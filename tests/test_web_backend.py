@@ -0,0 +1,125 @@
+"""Web backend served on an ephemeral localhost port"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import tarfile
+import threading
+import time
+import urllib.request
+import zipfile
+
+import pytest
+
+from web_backend import WebBackend
+
+CONFIG = {
+    'project_type': 'web-app',
+    'language': 'python',
+    'framework': 'fastapi',
+    'build_system': 'pip',
+}
+
+@pytest.fixture
+def backend():
+    backend = WebBackend(workers=2)
+    stdout = sys.stdout
+    
+    def serve():
+        with contextlib.suppress(asyncio.CancelledError):
+            asyncio.run(backend.serve('127.0.0.1', 0))
+            
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while backend.address is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backend.address is not None, 'backend did not start'
+    backend.thread = thread
+    yield backend
+    if thread.is_alive():
+        backend.stop()
+        thread.join(10)
+    sys.stdout = stdout
+
+def _url(backend, path):
+    return f"http://127.0.0.1:{backend.address[1]}{path}"
+
+def _create_project(backend):
+    request = urllib.request.Request(_url(backend, '/api/projects'), data=json.dumps(CONFIG).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        assert response.status == 202
+        return json.load(response)
+
+def _events(backend, job):
+    """Every server-sent event of a job, read until the stream ends"""
+    events = []
+    with urllib.request.urlopen(_url(backend, job['events']), timeout=30) as response:
+        assert response.headers['Content-Type'] == 'text/event-stream'
+        event = None
+        for line in response:
+            line = line.decode('utf-8').rstrip('\n')
+            if line.startswith('event: '):
+                event = line[len('event: '):]
+            elif line.startswith('data: '):
+                events.append((event, json.loads(line[len('data: '):])))
+    return events
+
+def test_project_is_generated_and_downloaded(backend):
+    job = _create_project(backend)
+    assert job['config']['PROJECT_TYPE'] == 'web-app'
+    # Unanswered fields get the form defaults
+    assert job['config']['LICENSE_TYPE'] == 'mit'
+    
+    events = _events(backend, job)
+    names = [event for event, _ in events]
+    assert names[0] == 'queued'
+    assert 'progress' in names
+    assert names[-1] == 'done'
+    done = events[-1][1]
+    assert done['files'] > 0
+    
+    with urllib.request.urlopen(_url(backend, job['archive']), timeout=30) as response:
+        assert response.headers['Content-Type'] == 'application/gzip'
+        data = response.read()
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as archive:
+        tar_files = {member.name for member in archive.getmembers() if member.isfile()}
+    assert len(tar_files) == done['files']
+    assert {'README.md', 'requirements.txt', '.github/workflows/ci.yml'} <= tar_files
+    
+    with urllib.request.urlopen(_url(backend, job['archive'] + '?format=zip'), timeout=30) as response:
+        assert response.headers['Content-Type'] == 'application/zip'
+        data = response.read()
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        zip_files = {name for name in archive.namelist() if not name.endswith('/')}
+        assert archive.testzip() is None
+    assert zip_files == tar_files
+
+def test_invalid_config_is_rejected(backend):
+    request = urllib.request.Request(_url(backend, '/api/projects'),
+                                     data=json.dumps(dict(CONFIG, language='cobol')).encode('utf-8'))
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request, timeout=10)
+    assert error.value.code == 400
+
+def test_shutdown_releases_a_stalled_archive_download(backend):
+    job = _create_project(backend)
+    assert _events(backend, job)[-1][0] == 'done'
+    # Incompressible content larger than the socket buffers, so the producer blocks on the unread response
+    backend.jobs[job['id']].plan.write('large.bin', os.urandom(32 * 1024 * 1024))
+    
+    client = socket.create_connection(backend.address, timeout=10)
+    client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    client.sendall(f"GET {job['archive']} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('ascii'))
+    assert client.recv(64).startswith(b'HTTP/1.1 200')
+    time.sleep(0.5)
+    
+    backend.stop()
+    backend.thread.join(10)
+    client.close()
+    assert not backend.thread.is_alive()